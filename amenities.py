@@ -0,0 +1,104 @@
+"""
+Amenity dictionary and bitmask encoding.
+
+Rooms store amenities as a free-text comma string ("WiFi, AC, Food"). For
+filtering, each known amenity maps to one bit of ``rooms.amenity_mask``, so
+"has WiFi and AC and Laundry" is a single ``mask & required = required``
+test instead of one substring scan per amenity (which also matched "AC"
+inside "Balcony").
+
+Bit positions are part of the stored data: only ever append to AMENITIES.
+"""
+
+import re
+
+# Canonical amenity names; the index is the bit number.
+AMENITIES = (
+    "WiFi",
+    "AC",
+    "Laundry",
+    "Security",
+    "Meals",
+    "Power Backup",
+    "Cleaning",
+    "TV",
+    "Gym",
+    "Parking",
+    "Hot Water",
+    "Attached Bathroom",
+    "Fridge",
+    "Study Table",
+    "Lift",
+    "CCTV",
+)
+
+# Spellings seen in listings and imports -> canonical name.
+ALIASES = {
+    "wi fi": "WiFi",
+    "internet": "WiFi",
+    "air conditioning": "AC",
+    "air conditioner": "AC",
+    "washing machine": "Laundry",
+    "food": "Meals",
+    "mess": "Meals",
+    "meal": "Meals",
+    "power back up": "Power Backup",
+    "housekeeping": "Cleaning",
+    "geyser": "Hot Water",
+    "attached bath": "Attached Bathroom",
+    "refrigerator": "Fridge",
+    "study desk": "Study Table",
+    "elevator": "Lift",
+}
+
+AMENITY_BITS = {name: 1 << bit for bit, name in enumerate(AMENITIES)}
+
+_LOOKUP = {re.sub(r"[^a-z0-9]+", " ", name.lower()).strip(): name for name in AMENITIES}
+_LOOKUP.update(ALIASES)
+
+
+def normalize_amenity(name):
+    """Canonical name for an amenity spelling, or None if it is not in the dictionary."""
+    key = re.sub(r"[^a-z0-9]+", " ", (name or "").lower()).strip()
+    return _LOOKUP.get(key)
+
+
+def split_amenities(value):
+    """Amenity names from a comma string or a list."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [part.strip() for part in value if part and part.strip()]
+
+
+def amenity_mask(value):
+    """Bitmask of the known amenities in `value`; unknown ones are ignored."""
+    mask = 0
+    for name in split_amenities(value):
+        canonical = normalize_amenity(name)
+        if canonical:
+            mask |= AMENITY_BITS[canonical]
+    return mask
+
+
+def required_amenities(value):
+    """(mask, unknown names) for an amenity filter.
+
+    Names outside the dictionary cannot be answered from the mask, so they
+    are returned for a substring fallback.
+    """
+    mask = 0
+    unknown = []
+    for name in split_amenities(value):
+        canonical = normalize_amenity(name)
+        if canonical:
+            mask |= AMENITY_BITS[canonical]
+        else:
+            unknown.append(name)
+    return mask, unknown
+
+
+def amenity_names(mask):
+    """Canonical names of the bits set in mask, in dictionary order."""
+    return [name for name in AMENITIES if mask & AMENITY_BITS[name]]
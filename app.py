@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import math
 import os
+import time
+from collections import OrderedDict
 from dotenv import load_dotenv
 
 load_dotenv()  # Load environment variables from .env file
@@ -18,6 +22,7 @@ from email.mime.application import MIMEApplication
 from flask import (
     Flask,
     flash,
+    g,
     has_request_context,
     jsonify,
     redirect,
@@ -25,6 +30,7 @@ from flask import (
     request,
     url_for,
     send_file,
+    Response,
 )
 import io
 import pandas as pd
@@ -39,11 +45,24 @@ from flask_login import (
     logout_user,
 )
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import event, func, inspect, or_, text
+from sqlalchemy import case, event, func, inspect, or_, text
 from sqlalchemy.engine import Engine
-from sqlalchemy.exc import SQLAlchemyError
-from functools import wraps
-from search_engine import SearchTrie
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from functools import lru_cache, wraps
+from amenities import AMENITY_BITS, amenity_mask, required_amenities
+from compression import choose_encoding, compress, install_compression
+from count_cache import CountCache
+from json_provider import install_json_provider
+from keyset import decode_cursor, encode_cursor, keyset_condition, keyset_order, parse_datetime
+from geo import MAX_RADIUS_KM, geohash_cover, geohash_encode, geohash_prefix_range, haversine_km, valid_coordinates
+from map_clusters import MapClusterIndex
+from marker_feed import encode_columns, encode_rows, to_base64, to_binary
+from room_catalog import HAS_NUMPY, PRICE_BUCKETS, UNKNOWN_DISTANCE_M, RoomCatalog, facet_payload
+from search_engine import BM25Index, create_search_index, rank_score
+from search_snapshot import SharedSearchIndex
+from services.gazetteer import load_colleges
+from services.geocoding_service import configure_geocoding_service
+from text_search import LikeTextSearch, SubstringFilter, detect_substring_filter, install_text_search
 # from agents.chatbot import chatbot  <-- Disabled for Render if missing
 try:
     from agents.chatbot import chatbot
@@ -100,8 +119,30 @@ if database_url and database_url.startswith("postgres://"):
 app.config["SQLALCHEMY_DATABASE_URI"] = database_url
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
-# Initialize Search Trie
-search_trie = SearchTrie()
+# JSON responses: orjson when installed ("auto"), else the stdlib. Both
+# write datetimes as ISO 8601, so to_dict() methods return them as is.
+JSON_PROVIDER = os.environ.get("JSON_PROVIDER", getattr(config, "JSON_PROVIDER", "auto")).lower()
+install_json_provider(app, JSON_PROVIDER)
+
+# Response compression: brotli (if installed) or gzip for dynamic responses
+# over COMPRESSION_MIN_SIZE bytes; static files are sent from the .br/.gz
+# siblings written by `python compression.py`.
+RESPONSE_COMPRESSION = os.environ.get("RESPONSE_COMPRESSION", getattr(config, "RESPONSE_COMPRESSION", "auto")).lower()
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", getattr(config, "COMPRESSION_MIN_SIZE", 1024)))
+COMPRESSION_ENCODINGS = install_compression(app, RESPONSE_COMPRESSION, COMPRESSION_MIN_SIZE)
+
+# Initialize Search Index: "trie", the memory-lean "compact" mode, or
+# "shared" (one mmap'd snapshot shared by all gunicorn workers)
+_process_started_at = time.time()
+SEARCH_INDEX_MODE = os.environ.get("SEARCH_INDEX_MODE", getattr(config, "SEARCH_INDEX_MODE", "trie")).lower()
+if SEARCH_INDEX_MODE == "shared":
+    search_trie = SharedSearchIndex(
+        os.environ.get("SEARCH_INDEX_DIR")
+        or getattr(config, "SEARCH_INDEX_DIR", None)
+        or os.path.join(app.instance_path, "search_index")
+    )
+else:
+    search_trie = create_search_index(SEARCH_INDEX_MODE)
 
 # Admin configuration
 ADMIN_EMAIL = getattr(config, "ADMIN_EMAIL", "admin@roomies.in")
@@ -281,8 +322,93 @@ class Owner(TimestampMixin, PasswordMixin, UserMixin, db.Model):
         return 25.0  # Default 25%
 
 
+# Static folders a room image name is looked up in, in order.
+STATIC_IMAGE_DIRS = ("", "images", "uploads")
+# How often (seconds) the folders' mtimes are compared to spot files added by
+# other processes; files saved by this one call forget_static_images().
+STATIC_IMAGE_RECHECK_SECONDS = 5.0
+_static_image_paths: Dict[str, Optional[str]] = {}  # `images` value -> static path of its first image
+_static_image_state = {"mtimes": None, "next_check": 0.0}
+
+
+def forget_static_images() -> None:
+    """Drop resolved room image paths; call after adding files under static/."""
+    _static_image_paths.clear()
+    _static_image_state["next_check"] = 0.0
+
+
+def _static_folder_mtimes():
+    mtimes = []
+    for folder in STATIC_IMAGE_DIRS:
+        try:
+            mtimes.append(os.stat(os.path.join(app.static_folder, folder)).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _static_image_path(candidate: str) -> Optional[str]:
+    """Path under static/ of an image name, memoized per process.
+
+    Misses are remembered too, until one of STATIC_IMAGE_DIRS changes, so
+    serializing rooms does no filesystem I/O between checks.
+    """
+    now = time.monotonic()
+    if now >= _static_image_state["next_check"]:
+        _static_image_state["next_check"] = now + STATIC_IMAGE_RECHECK_SECONDS
+        mtimes = _static_folder_mtimes()
+        if mtimes != _static_image_state["mtimes"]:
+            _static_image_state["mtimes"] = mtimes
+            _static_image_paths.clear()
+    try:
+        return _static_image_paths[candidate]
+    except KeyError:
+        pass
+    path = None
+    for folder in STATIC_IMAGE_DIRS:
+        variant = f"{folder}/{candidate}" if folder else candidate
+        if os.path.exists(os.path.join(app.static_folder, variant)):
+            path = variant
+            break
+    _static_image_paths[candidate] = path
+    return path
+
+
+ROOM_IMAGE_PLACEHOLDER = "https://placehold.co/600x400?text=Roomies"
+
+
+def split_amenities(amenities: Optional[str]) -> list:
+    """A room's comma-separated amenities as a list."""
+    if not amenities:
+        return []
+    return [item.strip() for item in amenities.split(",") if item.strip()]
+
+
+def room_image_url(images: Optional[str]) -> Optional[str]:
+    """URL of the first image in a room's comma-separated `images`, if it resolves."""
+    if not images:
+        return None
+    parts = [part.strip() for part in images.split(",") if part.strip()]
+    if not parts:
+        return None
+    candidate = parts[0].lstrip("/")
+    if candidate.startswith(("http://", "https://")):
+        return candidate
+    variant = _static_image_path(candidate)
+    if variant is None:
+        return None
+    if has_request_context():
+        return url_for("static", filename=variant, _external=True)
+    return f"/static/{variant}".replace("//", "/")
+
+
 class Room(TimestampMixin, db.Model):
     __tablename__ = "rooms"
+    __table_args__ = (
+        # Keyset pagination (see keyset.py) walks these in (sort value, id) order.
+        db.Index("ix_rooms_price_id", "price", "id"),
+        db.Index("ix_rooms_created_at_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -290,12 +416,18 @@ class Room(TimestampMixin, db.Model):
     location = db.Column(db.String(255), nullable=False)
     college_nearby = db.Column(db.String(255), nullable=False)
     amenities = db.Column(db.String(255))
+    # Bits of the known amenities in `amenities` (see amenities.py); kept in
+    # sync on write by _sync_room_amenity_mask.
+    amenity_mask = db.Column(db.Integer, nullable=False, default=0, server_default="0", index=True)
     images = db.Column(db.String(255))
     property_type = db.Column(db.String(50), default="shared", nullable=False)
     capacity_total = db.Column(db.Integer, nullable=False, default=1)
     capacity_occupied = db.Column(db.Integer, nullable=False, default=0)
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
+    # Geohash of (latitude, longitude) for radius search (see geo.py); kept
+    # in sync on write by _sync_room_geohash.
+    geohash = db.Column(db.String(12), index=True)
     owner_id = db.Column(
         db.Integer,
         db.ForeignKey("owners.id", ondelete="SET NULL"),
@@ -322,30 +454,8 @@ class Room(TimestampMixin, db.Model):
         return max((self.capacity_total or 0) - (self.capacity_occupied or 0), 0)
 
     def to_dict(self) -> dict:
-        image_url: Optional[str] = None
-        if self.images:
-            parts = [part.strip() for part in self.images.split(",") if part.strip()]
-            if parts:
-                candidate = parts[0].lstrip("/")
-                if candidate.startswith(("http://", "https://")):
-                    image_url = candidate
-                else:
-                    static_variants = [
-                        candidate,
-                        f"images/{candidate}",
-                        f"uploads/{candidate}",
-                    ]
-                    for variant in static_variants:
-                        static_path = os.path.join(app.static_folder, variant)
-                        if os.path.exists(static_path):
-                            if has_request_context():
-                                image_url = url_for("static", filename=variant, _external=True)
-                            else:
-                                image_url = f"/static/{variant}".replace("//", "/")
-                            break
-        amenities_list = []
-        if self.amenities:
-            amenities_list = [item.strip() for item in self.amenities.split(",") if item.strip()]
+        image_url = room_image_url(self.images)
+        amenities_list = split_amenities(self.amenities)
         return {
             "id": self.id,
             "title": self.title,
@@ -354,7 +464,7 @@ class Room(TimestampMixin, db.Model):
             "college": self.college_nearby,
             "property_type": self.property_type,
             "amenities": amenities_list,
-            "image_url": image_url or "https://placehold.co/600x400?text=Roomies",
+            "image_url": image_url or ROOM_IMAGE_PLACEHOLDER,
             "verified": bool(self.verified),
             "owner": {
                 "id": self.owner.id,
@@ -367,11 +477,147 @@ class Room(TimestampMixin, db.Model):
             "available_slots": self.available_slots,
             "latitude": self.latitude,
             "longitude": self.longitude,
-            "created_at": self.created_at.isoformat() if getattr(self, "created_at", None) else None,
-            "updated_at": self.updated_at.isoformat() if getattr(self, "updated_at", None) else None,
+            "created_at": getattr(self, "created_at", None),
+            "updated_at": getattr(self, "updated_at", None),
+        }
+
+
+class RoomChange(db.Model):
+    """Append-only feed of Room writes, replayed by each process's RoomCatalog."""
+    __tablename__ = "room_changes"
+
+    id = db.Column(db.Integer, primary_key=True)
+    room_id = db.Column(db.Integer, nullable=False)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+class TableVersion(db.Model):
+    """Write counter per table, bumped in the writing transaction; the
+    ETags of conditional_get() endpoints are derived from it."""
+    __tablename__ = "table_versions"
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False)
+
+
+class College(TimestampMixin, db.Model):
+    """Colleges with coordinates, seeded from data/ by seed_colleges()."""
+    __tablename__ = "colleges"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(255), unique=True, nullable=False)
+    city = db.Column(db.String(100))
+    area = db.Column(db.String(100))
+    college_type = db.Column(db.String(50))
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "city": self.city,
+            "area": self.area,
+            "type": self.college_type,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
         }
 
 
+class RoomCollegeDistance(db.Model):
+    """Precomputed room -> college distance in metres, for rooms with coordinates.
+
+    Kept in sync with room writes by _sync_room_college_distances.
+    """
+    __tablename__ = "room_college_distances"
+
+    college_id = db.Column(db.Integer, db.ForeignKey("colleges.id", ondelete="CASCADE"), primary_key=True)
+    room_id = db.Column(db.Integer, db.ForeignKey("rooms.id", ondelete="CASCADE"), primary_key=True, index=True)
+    distance_m = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_room_college_distances_college_distance", "college_id", "distance_m"),
+    )
+
+
+def college_distance_rows(room_id, lat, lon, colleges):
+    """RoomCollegeDistance rows for one room; colleges are (id, lat, lon)."""
+    if not valid_coordinates(lat, lon):
+        return []
+    return [
+        {"college_id": college_id, "room_id": room_id, "distance_m": round(haversine_km(lat, lon, college_lat, college_lon) * 1000)}
+        for college_id, college_lat, college_lon in colleges
+        if college_lat is not None and college_lon is not None
+    ]
+
+
+@event.listens_for(Room, "after_insert")
+@event.listens_for(Room, "after_update")
+def _sync_room_college_distances(mapper, connection, target):
+    state = inspect(target)
+    if not (state.attrs.latitude.history.has_changes() or state.attrs.longitude.history.has_changes()):
+        return
+    table = RoomCollegeDistance.__table__
+    connection.execute(table.delete().where(table.c.room_id == target.id))
+    colleges = connection.execute(db.select(College.id, College.latitude, College.longitude)).all()
+    rows = college_distance_rows(target.id, target.latitude, target.longitude, colleges)
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+@event.listens_for(Room, "after_delete")
+def _delete_room_college_distances(mapper, connection, target):
+    table = RoomCollegeDistance.__table__
+    connection.execute(table.delete().where(table.c.room_id == target.id))
+
+
+@event.listens_for(Room, "after_insert")
+@event.listens_for(Room, "after_update")
+@event.listens_for(Room, "after_delete")
+def _record_room_change(mapper, connection, target):
+    # Same connection, so the feed entry commits or rolls back with the write.
+    connection.execute(RoomChange.__table__.insert().values(room_id=target.id, changed_at=datetime.utcnow()))
+
+
+@event.listens_for(Room, "before_insert")
+@event.listens_for(Room, "before_update")
+def _sync_room_amenity_mask(mapper, connection, target):
+    target.amenity_mask = amenity_mask(target.amenities)
+
+
+@event.listens_for(Room, "before_insert")
+@event.listens_for(Room, "before_update")
+def _sync_room_geohash(mapper, connection, target):
+    target.geohash = geohash_encode(target.latitude, target.longitude)
+
+
+def filter_by_amenities(query, value):
+    """Rooms having every amenity in `value` (comma string).
+
+    Known amenities become one bitwise-AND test on amenity_mask; names not
+    in the dictionary fall back to a substring match.
+    """
+    mask, unknown = required_amenities(value)
+    return _filter_amenity_bits(query, mask, unknown)
+
+
+def _filter_amenity_bits(query, mask, unknown=()):
+    if mask:
+        query = query.filter(Room.amenity_mask.op("&")(mask) == mask)
+    for name in unknown:
+        query = query.filter(Room.amenities.ilike(f"%{name}%"))
+    return query
+
+
+# Text search for the `q` parameter of the room listing APIs. Starts as the
+# ILIKE scan; init_database() swaps in FTS5 / tsvector once the index exists.
+TEXT_SEARCH_BACKEND = os.environ.get("TEXT_SEARCH_BACKEND", getattr(config, "TEXT_SEARCH_BACKEND", "auto")).lower()
+room_text_search = LikeTextSearch(Room.__table__)
+# college / city / location substring filters; trigram-indexed once
+# migrations/add_trigram_indexes.py has run.
+room_substring_filter = SubstringFilter(Room.__table__)
+
+
 class ContactMessage(TimestampMixin, db.Model):
     __tablename__ = "contact_messages"
 
@@ -421,8 +667,8 @@ class Verification(TimestampMixin, db.Model):
             "user_id": self.user_id,
             "status": self.status,
             "rejection_reason": self.rejection_reason,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "reviewed_at": self.reviewed_at.isoformat() if self.reviewed_at else None,
+            "created_at": self.created_at,
+            "reviewed_at": self.reviewed_at,
         }
 
 
@@ -451,7 +697,7 @@ class FlashDeal(TimestampMixin, db.Model):
             "original_price": self.original_price,
             "deal_price": self.deal_price,
             "discount_percent": round((1 - self.deal_price / self.original_price) * 100, 1),
-            "expires_at": self.expires_at.isoformat(),
+            "expires_at": self.expires_at,
             "is_active": self.is_active and not self.is_expired,
             "time_remaining_hours": max(0, (self.expires_at - datetime.utcnow()).total_seconds() / 3600),
         }
@@ -498,7 +744,7 @@ class Subscription(TimestampMixin, db.Model):
             "status": self.status,
             "plan_price": self.plan_price,
             "is_active": self.is_active,
-            "current_period_end": self.current_period_end.isoformat() if self.current_period_end else None,
+            "current_period_end": self.current_period_end,
         }
 
 
@@ -635,13 +881,13 @@ class Booking(db.Model):
             "platform_fee": self.platform_fee,
             "total_paid": self.total_paid,
             "total_due": self.calculate_total_due(),
-            "contract_start_date": self.contract_start_date.isoformat() if self.contract_start_date else None,
-            "contract_end_date": self.contract_end_date.isoformat() if self.contract_end_date else None,
+            "contract_start_date": self.contract_start_date,
+            "contract_end_date": self.contract_end_date,
             "contract_signed": self.contract_signed,
             "owner_approved": self.owner_approved,
-            "move_in_date": self.move_in_date.isoformat() if self.move_in_date else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "confirmed_at": self.confirmed_at.isoformat() if self.confirmed_at else None,
+            "move_in_date": self.move_in_date,
+            "created_at": self.created_at,
+            "confirmed_at": self.confirmed_at,
         }
 
 class Wallet(db.Model):
@@ -765,8 +1011,8 @@ class UserSubscription(TimestampMixin, db.Model):
             "status": self.status,
             "billing_cycle": self.billing_cycle,
             "amount_paid": self.amount_paid,
-            "start_date": self.start_date.isoformat(),
-            "end_date": self.end_date.isoformat(),
+            "start_date": self.start_date,
+            "end_date": self.end_date,
             "is_active": self.is_active,
             "auto_renew": self.auto_renew,
         }
@@ -892,7 +1138,7 @@ class ServicePurchase(TimestampMixin, db.Model):
             "amount": self.amount,
             "payment_status": self.payment_status,
             "service_status": self.service_status,
-            "scheduled_date": self.scheduled_date.isoformat() if self.scheduled_date else None,
+            "scheduled_date": self.scheduled_date,
         }
 
 
@@ -976,27 +1222,507 @@ def get_current_student():
 # ---------------------------------------------------------------------------
 # Search Index Initialization (Must be after Models)
 # ---------------------------------------------------------------------------
-def rebuild_search_index():
-    """Populate the Trie with current database data."""
+def _search_index_rows(since=None, now=None):
+    """(feed position, rows, removed room IDs) for the search index, read
+    fresh from the database.
+
+    Rows are (room_id, texts, score) for every room, or given a room_changes
+    feed position `since`, for the rooms changed after it; changed rooms that
+    no longer exist are returned as removed. Recency is scored as of `now`:
+    by default the current time for every room, else the index's last full
+    build (see _search_rank_time).
+    """
+    if now is None and since is not None:
+        now = _search_rank_time()
     with app.app_context():
-        try:
-            # Check if tables exist before querying
-            inspector = inspect(db.engine)
-            if not inspector.has_table("rooms"):
-                return
-
-            rooms = Room.query.all()
-            for room in rooms:
-                # Index title, location, and college
-                search_trie.insert(room.title, room.id)
-                search_trie.insert(room.location, room.id)
-                search_trie.insert(room.college_nearby, room.id)
-            app.logger.info(f"Search index rebuilt with {len(rooms)} rooms.")
-        except Exception as e:
-            app.logger.error(f"Failed to rebuild search index: {e}")
+        # Check if tables exist before querying
+        inspector = inspect(db.engine)
+        if not inspector.has_table("rooms"):
+            return 0, [], ()
+
+        # Read the feed position first: changes racing the load are replayed.
+        position = db.session.query(func.max(RoomChange.id)).scalar() or 0
+        rooms = Room.query
+        popularity = db.session.query(Booking.room_id, func.count(Booking.id))
+        room_ids = None
+        if since is not None:
+            room_ids = {
+                room_id for (room_id,) in db.session.query(RoomChange.room_id).filter(or_(
+                    RoomChange.id > since,
+                    RoomChange.changed_at >= datetime.utcnow() - ROOM_CHANGE_FEED_OVERLAP,
+                ))
+            }
+            rooms = rooms.filter(Room.id.in_(room_ids))
+            popularity = popularity.filter(Booking.room_id.in_(room_ids))
+        rooms = rooms.all()
+        popularity = dict(popularity.group_by(Booking.room_id).all())
+        rows = [
+            (room.id, _room_search_texts(room), _room_rank_score(room, popularity.get(room.id, 0), now))
+            for room in rooms
+        ]
+        removed = room_ids.difference(room.id for room in rooms) if room_ids else ()
+        return position, rows, removed
+
+
+def rebuild_search_index(requested_at=None):
+    """Rebuild the search index from scratch and swap it in.
+
+    In shared mode this publishes a new snapshot generation for every
+    worker; a build is skipped if another worker already published one that
+    started after `requested_at`.
+    """
+    global search_trie, _search_index_built_at
+    try:
+        if isinstance(search_trie, SharedSearchIndex):
+            if search_trie.publish(_search_index_rows, requested_at=requested_at):
+                app.logger.info(f"Search snapshot published with {len(search_trie.snapshot.room_scores)} rooms.")
+            return
+        built_at = datetime.utcnow()
+        _, rows, _ = _search_index_rows(now=built_at)
+        fresh = create_search_index(SEARCH_INDEX_MODE)
+        for room_id, texts, score in rows:
+            fresh.insert_room(room_id, texts, score)
+        search_trie, _search_index_built_at = fresh, built_at
+        app.logger.info(f"Search index rebuilt with {len(rows)} rooms.")
+    except Exception as e:
+        app.logger.error(f"Failed to rebuild search index: {e}")
+
+
+def _room_search_texts(room):
+    """Fields of a room that are indexed for autocomplete."""
+    return (room.title, room.location, room.college_nearby)
+
+
+def _room_rank_score(room, popularity=0, now=None):
+    """Autocomplete ranking score (verified, open slots, recency, bookings),
+    by default as of the search index's last full build."""
+    return rank_score(room.verified, room.available_slots, room.created_at, popularity,
+                      now=now or _search_rank_time())
+
+
+# When the in-process search index was last built from scratch (trie and
+# compact modes; shared snapshots record it in their header).
+_search_index_built_at = None
+
+
+def _search_rank_time():
+    """Reference time for the recency bonus of rank scores written between
+    full builds, so they stay comparable with the rooms scored at the build."""
+    if isinstance(search_trie, SharedSearchIndex):
+        snapshot = search_trie.snapshot
+        return datetime(1970, 1, 1) + timedelta(seconds=snapshot.rebuilt_at) if snapshot else None
+    return _search_index_built_at
+
+
+def _room_relevance_fields(room):
+    """Fields scored by the sort=relevance BM25 index."""
+    return {
+        "title": room.title,
+        "college": room.college_nearby,
+        "location": room.location,
+        "amenities": room.amenities,
+    }
+
+
+def _room_relevance_row(room):
+    """A room (a Room or a row of _ROOM_RELEVANCE_COLUMNS) as a BM25Index row."""
+    return {"id": room.id, **_room_relevance_fields(room)}
+
+
+_ROOM_RELEVANCE_COLUMNS = (Room.id, Room.title, Room.college_nearby, Room.location, Room.amenities)
+
+
+def _room_catalog_row(room):
+    """Columns of a room (a Room or a row of _ROOM_CATALOG_COLUMNS) kept in the RoomCatalog."""
+    return {
+        "id": room.id,
+        "price": room.price,
+        "property_type": room.property_type,
+        "college_nearby": room.college_nearby,
+        "location": room.location,
+        "availability_status": room.availability_status,
+        "verified": room.verified,
+        "capacity_total": room.capacity_total,
+        "capacity_occupied": room.capacity_occupied,
+        "created_at": room.created_at.timestamp() if room.created_at else None,
+        "latitude": room.latitude,
+        "longitude": room.longitude,
+        "amenity_mask": room.amenity_mask,
+    }
+
+
+_ROOM_CATALOG_COLUMNS = (
+    Room.id, Room.price, Room.property_type, Room.college_nearby, Room.location,
+    Room.availability_status, Room.verified, Room.capacity_total, Room.capacity_occupied,
+    Room.created_at, Room.latitude, Room.longitude, Room.amenity_mask,
+)
+
+
+# Columnar catalog behind /api/rooms and /api/rooms/facets. Built on first
+# use, then kept current by replaying the room_changes feed, so writes made
+# by other workers arrive without a rebuild.
+ROOM_CATALOG_ENABLED = HAS_NUMPY and str(
+    os.environ.get("ROOM_CATALOG", getattr(config, "ROOM_CATALOG", "auto"))
+).lower() not in {"0", "off", "false", "no"}
+ROOM_CATALOG_POLL_INTERVAL = 1.0  # seconds between change feed reads
+# Feed IDs can commit out of order on Postgres, so each read also replays
+# the last few seconds of changes (upserts are idempotent).
+ROOM_CHANGE_FEED_OVERLAP = timedelta(seconds=10)
+# Full rebuild as a safety net; must stay below ROOM_CHANGE_RETENTION (as
+# must search_snapshot.FULL_REBUILD_AGE for the shared search index).
+ROOM_CATALOG_MAX_AGE = 3600
+ROOM_CHANGE_RETENTION = timedelta(days=1)
+# Each process trims the feed this often (seconds) while following it.
+ROOM_CHANGE_PRUNE_INTERVAL = 3600
+_room_changes_state = {"next_prune": time.time() + ROOM_CHANGE_PRUNE_INTERVAL}
+room_catalog = None
+_room_catalog_state = {"feed_id": 0, "built_at": 0.0, "next_poll": 0.0}
+# Marker clusters behind /api/rooms/map, maintained the same way.
+room_clusters = None
+_room_clusters_state = {"feed_id": 0, "built_at": 0.0, "next_poll": 0.0}
+# BM25 index behind sort=relevance, maintained the same way, so other
+# workers' writes are applied per room rather than by a rebuild.
+room_relevance = None
+_room_relevance_state = {"feed_id": 0, "built_at": 0.0, "next_poll": 0.0}
+
+
+def _follow_room_changes(index, state, build, columns=_ROOM_CATALOG_COLUMNS, to_row=_room_catalog_row):
+    """Build `index` with build(rows) if missing or stale, else replay the
+    change feed into it; returns the index to use. Rows are to_row() of
+    the Room columns selected."""
+    now = time.time()
+    if index is None or now - state["built_at"] > ROOM_CATALOG_MAX_AGE:
+        # Read the feed position first: changes racing the load are replayed.
+        feed_id = db.session.query(func.max(RoomChange.id)).scalar() or 0
+        rows = db.session.query(*columns)
+        index = build(to_row(row) for row in rows)
+        state.update(feed_id=feed_id, built_at=now, next_poll=now + ROOM_CATALOG_POLL_INTERVAL)
+    elif now >= state["next_poll"]:
+        state["next_poll"] = now + ROOM_CATALOG_POLL_INTERVAL
+        _replay_room_changes(index, state, columns, to_row)
+        if now >= _room_changes_state["next_prune"]:
+            _room_changes_state["next_prune"] = now + ROOM_CHANGE_PRUNE_INTERVAL
+            try:
+                prune_room_changes()
+            except SQLAlchemyError as e:
+                app.logger.warning(f"Could not prune room_changes: {e}")
+    return index
+
+
+def _build_room_catalog(rows):
+    colleges = db.session.query(College.id, College.latitude, College.longitude).all()
+    return RoomCatalog.from_rows(rows, colleges=colleges)
+
+
+def get_room_catalog():
+    global room_catalog
+    room_catalog = _follow_room_changes(room_catalog, _room_catalog_state, _build_room_catalog)
+    return room_catalog
+
+
+def get_room_clusters():
+    global room_clusters
+    room_clusters = _follow_room_changes(room_clusters, _room_clusters_state, MapClusterIndex.from_rows)
+    return room_clusters
+
+
+def get_relevance_index():
+    global room_relevance
+    room_relevance = _follow_room_changes(
+        room_relevance, _room_relevance_state, BM25Index.from_rows,
+        columns=_ROOM_RELEVANCE_COLUMNS, to_row=_room_relevance_row,
+    )
+    return room_relevance
+
+
+def _replay_room_changes(catalog, state, columns=_ROOM_CATALOG_COLUMNS, to_row=_room_catalog_row):
+    changes = (
+        db.session.query(RoomChange.id, RoomChange.room_id)
+        .filter(or_(
+            RoomChange.id > state["feed_id"],
+            RoomChange.changed_at >= datetime.utcnow() - ROOM_CHANGE_FEED_OVERLAP,
+        ))
+        .all()
+    )
+    if not changes:
+        return
+    room_ids = {room_id for _, room_id in changes}
+    rooms = {row.id: row for row in db.session.query(*columns).filter(Room.id.in_(room_ids))}
+    for room_id in room_ids:
+        if room_id in rooms:
+            catalog.upsert(to_row(rooms[room_id]))
+        else:
+            catalog.remove(room_id)
+    state["feed_id"] = max(state["feed_id"], max(change_id for change_id, _ in changes))
+
+
+def prune_room_changes():
+    """Drop change feed entries no live catalog can still need. Runs in its
+    own transaction, so it never commits a request's pending changes."""
+    table = RoomChange.__table__
+    with db.engine.begin() as connection:
+        connection.execute(table.delete().where(table.c.changed_at < datetime.utcnow() - ROOM_CHANGE_RETENTION))
+
+
+def load_rooms_in_order(room_ids):
+    """Room objects for room_ids, in that order; missing IDs are skipped."""
+    if not room_ids:
+        return []
+    by_id = {room.id: room for room in Room.query.filter(Room.id.in_(room_ids)).all()}
+    return [by_id[room_id] for room_id in room_ids if room_id in by_id]
+
+
+def paginate_by_relevance(query, search, offset, limit):
+    """(total, room IDs) for one page of `query` ordered by BM25 relevance to search."""
+    room_ids = [room_id for (room_id,) in query.with_entities(Room.id)]
+    return len(room_ids), get_relevance_index().rank(search, room_ids, limit=offset + limit)[offset:]
+
+
+# Sparse fieldsets for the room list endpoints (fields=...). Each Room.to_dict()
+# key maps to the columns it is built from and a function of their values
+# (None: the single value as is). "owner" is the only one needing a join.
+ROOM_FIELDS = {
+    "id": ((Room.id,), None),
+    "title": ((Room.title,), None),
+    "price": ((Room.price,), None),
+    "location": ((Room.location,), None),
+    "college": ((Room.college_nearby,), None),
+    "property_type": ((Room.property_type,), None),
+    "amenities": ((Room.amenities,), split_amenities),
+    "image_url": ((Room.images,), lambda images: room_image_url(images) or ROOM_IMAGE_PLACEHOLDER),
+    "verified": ((Room.verified,), bool),
+    "owner": ((Owner.id, Owner.name), lambda owner_id, name: None if owner_id is None else {"id": owner_id, "name": name}),
+    "capacity_total": ((Room.capacity_total,), None),
+    "capacity_occupied": ((Room.capacity_occupied,), None),
+    "available_slots": ((Room.capacity_total, Room.capacity_occupied), lambda total, occupied: max((total or 0) - (occupied or 0), 0)),
+    "latitude": ((Room.latitude,), None),
+    "longitude": ((Room.longitude,), None),
+    "created_at": ((Room.created_at,), None),
+    "updated_at": ((Room.updated_at,), None),
+}
+# fields=card: what a listing card shows.
+ROOM_CARD_FIELDS = ("id", "title", "price", "location", "college", "property_type", "image_url", "verified", "available_slots")
+
+
+def parse_room_fields(args):
+    """Field names from fields= ("card" or a comma-separated list; id is
+    always included), or None for the full Room.to_dict(). Raises
+    ValueError naming any unknown field."""
+    value = (args.get("fields") or "").strip()
+    if not value:
+        return None
+    if value.lower() == "card":
+        return ROOM_CARD_FIELDS
+    names = ["id"]
+    for name in (part.strip().lower() for part in value.split(",")):
+        if name and name not in names:
+            names.append(name)
+    unknown = [name for name in names if name not in ROOM_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Use card or any of: {', '.join(ROOM_FIELDS)}.")
+    return tuple(names)
+
+
+@lru_cache(maxsize=64)
+def _room_projection(fields):
+    """(columns to select, whether Owner is joined, [(name, position(s), convert)], position of Room.id)."""
+    columns, positions, plan = [], {}, []
+    for name in ("id",) + tuple(fields):
+        field_columns, convert = ROOM_FIELDS[name]
+        for column in field_columns:
+            key = (column.class_, column.key)
+            if key not in positions:
+                positions[key] = len(columns)
+                columns.append(column)
+        indexes = tuple(positions[(column.class_, column.key)] for column in field_columns)
+        if name in fields:
+            plan.append((name, indexes[0] if len(indexes) == 1 else indexes, convert))
+    return tuple(columns), "owner" in fields, tuple(plan), positions[(Room, "id")]
+
+
+def _projected_payloads(query, fields):
+    """(room ID, payload) for each row of a Room query, reading only the
+    columns behind `fields`; Owner is joined only for "owner"."""
+    columns, join_owner, plan, id_position = _room_projection(fields)
+    query = query.with_entities(*columns)
+    if join_owner:
+        query = query.outerjoin(Owner, Room.owner_id == Owner.id)
+    for row in query:
+        payload = {}
+        for name, index, convert in plan:
+            if convert is None:
+                payload[name] = row[index]
+            elif type(index) is tuple:
+                payload[name] = convert(*(row[i] for i in index))
+            else:
+                payload[name] = convert(row[index])
+        yield row[id_position], payload
+
+
+def room_payloads(room_ids, fields=None):
+    """Dicts for room_ids, in that order: Room.to_dict(), or only `fields`
+    (from parse_room_fields) read straight from the selected columns, with
+    no ORM objects and no owner join unless "owner" is asked for."""
+    if fields is None:
+        return [room.to_dict() for room in load_rooms_in_order(room_ids)]
+    if not room_ids:
+        return []
+    by_id = dict(_projected_payloads(Room.query.filter(Room.id.in_(room_ids)), fields))
+    return [by_id[room_id] for room_id in room_ids if room_id in by_id]
+
+
+def room_query_payloads(query, fields=None):
+    """room_payloads() for every row of a Room query without LIMIT/OFFSET, in its order."""
+    if fields is None:
+        return [room.to_dict() for room in query]
+    return [payload for _, payload in _projected_payloads(query, fields)]
+
+
+# Keep the trie in sync with Room writes. Changes are queued per session during
+# flush and only applied once the transaction commits, so a rollback never
+# leaves phantom IDs in the index.
+def _queue_room_index_upsert(target, popularity=0):
+    pending = inspect(target).session.info.setdefault("search_index_pending", {})
+    pending[target.id] = (
+        _room_search_texts(target),
+        _room_rank_score(target, popularity),
+        _room_relevance_fields(target),
+        _room_catalog_row(target),
+    )
+
+
+@event.listens_for(Room, "after_insert")
+def _queue_room_index_insert(mapper, connection, target):
+    _queue_room_index_upsert(target)
+
+
+@event.listens_for(Room, "after_update")
+def _queue_room_index_update(mapper, connection, target):
+    popularity = connection.scalar(
+        db.select(func.count(Booking.id)).where(Booking.room_id == target.id)
+    )
+    _queue_room_index_upsert(target, popularity or 0)
+
+
+@event.listens_for(Room, "after_delete")
+def _queue_room_index_delete(mapper, connection, target):
+    pending = inspect(target).session.info.setdefault("search_index_pending", {})
+    pending[target.id] = None
+
+
+@event.listens_for(db.session, "after_commit")
+def _apply_room_index_changes(session):
+    pending = session.info.pop("search_index_pending", None)
+    if not pending:
+        return
+    for room_id, entry in pending.items():
+        if entry is None:
+            search_trie.remove_room(room_id)
+            if room_relevance is not None:
+                room_relevance.remove_room(room_id)
+            if room_catalog is not None:
+                room_catalog.remove(room_id)
+            if room_clusters is not None:
+                room_clusters.remove(room_id)
+        else:
+            texts, score, fields, catalog_row = entry
+            search_trie.replace_room(room_id, texts, score)
+            if room_relevance is not None:
+                room_relevance.replace_room(room_id, fields)
+            if room_catalog is not None:
+                room_catalog.upsert(catalog_row)
+            if room_clusters is not None:
+                room_clusters.upsert(catalog_row)
+    if isinstance(search_trie, SharedSearchIndex):
+        # Other workers only see this change once a new snapshot is published;
+        # it re-reads just the rooms changed since the current one.
+        search_trie.schedule_publish(_search_index_rows)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_room_index_changes(session):
+    session.info.pop("search_index_pending", None)
+
+
+# Tables whose writes change the responses of conditional_get() endpoints.
+# Each flush bumps their TableVersion rows on the flush connection, so a
+# version commits or rolls back with the write. Core writes skip the
+# session hooks; call bump_table_versions() after them.
+VERSIONED_TABLES = ("rooms", "owners", "colleges", "flash_deals", "subscription_plans", "value_added_services")
+TABLE_VERSION_POLL_INTERVAL = 1.0  # seconds between reads of other processes' writes
+_table_versions_state = {"versions": {}, "next_poll": 0.0}
+
+
+def _initial_table_version():
+    # Start from the clock so a recreated database never reuses an old ETag.
+    return int(time.time() * 1000)
+
+
+def bump_table_versions(connection, tables):
+    table = TableVersion.__table__
+    for name in sorted(tables):  # one lock order for concurrent writers
+        result = connection.execute(
+            table.update().where(table.c.table_name == name).values(version=table.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(table_name=name, version=_initial_table_version()))
+
+
+def ensure_table_versions():
+    """Create the missing TableVersion rows, so writes only ever update."""
+    existing = {name for (name,) in db.session.query(TableVersion.table_name)}
+    for name in VERSIONED_TABLES:
+        if name not in existing:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(TableVersion(table_name=name, version=_initial_table_version()))
+            except IntegrityError:
+                pass  # another worker booting on the same database created it first
+    db.session.commit()
+
+
+@event.listens_for(db.session, "after_flush")
+def _bump_written_table_versions(session, flush_context):
+    written = {inspect(obj).mapper.local_table.name for obj in session.new}
+    written.update(inspect(obj).mapper.local_table.name for obj in session.deleted)
+    written.update(
+        inspect(obj).mapper.local_table.name for obj in session.dirty if session.is_modified(obj)
+    )
+    written.intersection_update(VERSIONED_TABLES)
+    if written:
+        bump_table_versions(session.connection(), written)
+        session.info["table_versions_bumped"] = True
+
+
+@event.listens_for(db.session, "after_commit")
+def _expire_table_versions(session):
+    if session.info.pop("table_versions_bumped", False):
+        _table_versions_state["next_poll"] = 0.0  # this process reads its own writes at once
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_table_version_bumps(session):
+    session.info.pop("table_versions_bumped", None)
+
 
-# Rebuild index on startup
-rebuild_search_index()
+def table_versions():
+    """{table name: version}, re-read at most every TABLE_VERSION_POLL_INTERVAL seconds."""
+    state = _table_versions_state
+    now = time.monotonic()
+    if now >= state["next_poll"]:
+        versions = dict(db.session.query(TableVersion.table_name, TableVersion.version).all())
+        if versions.get("rooms") != state["versions"].get("rooms"):
+            # Replay the change feed on next use, so responses cached under
+            # the new version are never built from a catalog that lags it.
+            _room_catalog_state["next_poll"] = 0.0
+            _room_clusters_state["next_poll"] = 0.0
+        state.update(versions=versions, next_poll=now + TABLE_VERSION_POLL_INTERVAL)
+    return state["versions"]
+
+
+# Rebuild index on startup. In shared mode only the first worker to boot
+# scans the rooms table; the others map the snapshot it publishes.
+rebuild_search_index(requested_at=_process_started_at)
 
 # ---------------------------------------------------------------------------
 # Routes
@@ -1473,63 +2199,305 @@ def settings():
 # ---------------------------------------------------------------------------
 # Routes - APIs
 # ---------------------------------------------------------------------------
+# ETags of conditional_get() responses by (path, query, table versions).
+CONDITIONAL_ETAG_CACHE_SIZE = 4096
+_conditional_etags = OrderedDict()
+# Changes with every deploy, so new code never answers 304 for an old body.
+ETAG_RELEASE = os.environ.get("RELEASE") or str(int(os.path.getmtime(__file__)))
+
+
+def _not_modified(etag):
+    response = app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def conditional_get(*tables):
+    """Strong ETags and 304 Not Modified for a GET endpoint whose response
+    depends only on its query string and the rows of `tables`.
+
+    A repeat request whose If-None-Match matches is answered from a dict
+    before the view (or any query) runs. Views whose output also changes
+    with time set g.valid_until (epoch seconds) to when it next does.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = table_versions()
+            key = (
+                request.path,
+                tuple(sorted(request.args.items(multi=True))),
+                tuple(versions.get(table, 0) for table in tables),
+            )
+            cached = _conditional_etags.get(key)
+            if cached is not None and time.time() < cached[1] and request.if_none_match.contains_weak(cached[0]):
+                return _not_modified(cached[0])
+
+            g.valid_until = math.inf
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            etag = hashlib.sha1(repr((ETAG_RELEASE, key, g.valid_until)).encode()).hexdigest()
+            _conditional_etags[key] = (etag, g.valid_until)
+            _conditional_etags.move_to_end(key)
+            while len(_conditional_etags) > CONDITIONAL_ETAG_CACHE_SIZE:
+                _conditional_etags.popitem(last=False)
+            if request.if_none_match.contains_weak(etag):  # compressed responses carry W/ ETags
+                return _not_modified(etag)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "no-cache"  # revalidate every time
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def parse_room_filters(args):
+    """Filters shared by /api/rooms and /api/rooms/facets."""
+    mask, unknown_amenities = required_amenities(args.get("amenities"))
+    return {
+        "include_unverified": args.get("include_unverified", "0").lower() in {"1", "true", "yes"},
+        "college": (args.get("college") or "").strip(),
+        "city": (args.get("city") or "").strip(),
+        "search": (args.get("q") or "").strip(),
+        "property_type": (args.get("property_type") or "").strip().lower(),
+        "max_rent": args.get("max_rent", type=int),
+        "min_available": args.get("min_available", type=int),
+        "amenity_mask": mask,
+        "unknown_amenities": unknown_amenities,
+        # Reference college for sort=distance, within_km and distance_km.
+        "college_id": args.get("college_id", type=int),
+        "within_km": args.get("within_km", type=float),
+    }
+
+
+def _room_text_condition(search):
+    return room_text_search.condition(search, ("title", "location", "college_nearby"))
+
+
+def apply_room_filters(query, filters):
+    if not filters["include_unverified"]:
+        query = query.filter(Room.verified.is_(True))
+    if filters["college"]:
+        query = query.filter(room_substring_filter.condition("college_nearby", filters["college"]))
+    if filters["city"]:
+        query = query.filter(room_substring_filter.condition("location", filters["city"]))
+    if filters["search"]:
+        query = query.filter(_room_text_condition(filters["search"]))
+    if filters["property_type"]:
+        query = query.filter(func.lower(Room.property_type) == filters["property_type"])
+    if filters["max_rent"] is not None:
+        query = query.filter(Room.price <= filters["max_rent"])
+    if filters["min_available"] is not None:
+        query = query.filter((Room.capacity_total - Room.capacity_occupied) >= filters["min_available"])
+    if filters["within_km"] is not None and filters["college_id"] is not None:
+        query = query.filter(Room.id.in_(
+            db.select(RoomCollegeDistance.room_id).where(
+                RoomCollegeDistance.college_id == filters["college_id"],
+                RoomCollegeDistance.distance_m <= filters["within_km"] * 1000,
+            )
+        ))
+    return _filter_amenity_bits(query, filters["amenity_mask"], filters["unknown_amenities"])
+
+
+def catalog_supports(filters):
+    """Whether the in-memory catalog can answer these filters exactly."""
+    return ROOM_CATALOG_ENABLED and not filters["unknown_amenities"]
+
+
+def catalog_selection(catalog, filters):
+    """Catalog row mask for filters; `q` is resolved through the text index."""
+    text_ids = None
+    if filters["search"]:
+        text_ids = [room_id for (room_id,) in db.session.query(Room.id).filter(_room_text_condition(filters["search"]))]
+    return catalog.select(filters, text_ids)
+
+
+# Sorts of /api/rooms: sort key -> (SQL sort column, descending), ties by
+# ascending ID. "relevance" (needs q) and "distance" (needs college_id) are
+# ordered separately. Cursor values are JSON; newest's is an ISO datetime.
+ROOM_SORTS = {
+    "price_asc": (Room.price, False),
+    "price_desc": (Room.price, True),
+    "newest": (Room.created_at, True),
+    "slots_desc": (Room.capacity_total - Room.capacity_occupied, True),
+}
+ROOM_CURSOR_PARSERS = {"newest": parse_datetime}
+
+
+def room_filter_key(filters):
+    """Filters normalized for the count cache: the text filters match
+    case-insensitively, and college_id only counts with within_km."""
+    key = dict(filters, unknown_amenities=tuple(sorted(filters["unknown_amenities"])))
+    for name in ("college", "city", "search"):
+        key[name] = key[name].lower()
+    if key["within_km"] is None:
+        key["college_id"] = None
+    return tuple(sorted(key.items()))
+
+
+def _count_rooms(filters):
+    return apply_room_filters(Room.query, filters).count()
+
+
+def _room_count_version():
+    versions = table_versions()
+    return versions.get("rooms", 0), versions.get("colleges", 0)  # within_km reads room_college_distances
+
+
+# Totals for the SQL path of /api/rooms (the catalog counts for free).
+# Entries are keyed by room_filter_key() and recounted in the background
+# when rooms or colleges change; see count_cache.py.
+ROOM_COUNT_CACHE_ENABLED = str(
+    os.environ.get("ROOM_COUNT_CACHE", getattr(config, "ROOM_COUNT_CACHE", "on"))
+).lower() not in {"0", "off", "false", "no"}
+room_counts = CountCache(_count_rooms, _room_count_version, context=app.app_context)
+
+
+def _catalog_sort_value(sort_key, value):
+    """A cursor's sort value as RoomCatalog.sort_value() would give it."""
+    if sort_key == "newest":
+        return -value.timestamp()  # the catalog's epoch, as in _room_catalog_row
+    if sort_key == "distance":
+        return UNKNOWN_DISTANCE_M if value is None else value
+    return -value if sort_key in {"price_desc", "slots_desc"} else value
+
+
+def _cursor_sort_value(sort_key, value):
+    """The inverse of _catalog_sort_value."""
+    if sort_key == "newest":
+        return datetime.fromtimestamp(-value)
+    if sort_key == "distance":
+        return None if value == UNKNOWN_DISTANCE_M else int(value)
+    return int(-value if sort_key in {"price_desc", "slots_desc"} else value)
+
+
 @app.route("/api/rooms")
+@conditional_get("rooms", "owners", "colleges")
 def api_rooms():
+    """One page of rooms matching the filters.
+
+    Pages continue from meta.next_cursor (cursor=..., same filters and
+    sort): a keyset on (sort value, ID), so a deep page costs the same as
+    the first. offset= still works but reads every row before the page.
+
+    meta.total may be counted on the first page. Cursor pages never count
+    it unless total=1 is passed, and total=0 skips the count on the first
+    page too. A total that costs nothing is always returned: from the
+    catalog, or from the count cache. meta.total_source is "exact" for a
+    total of the current table version (counted now or cached) and
+    "stale" for an older count that is being refreshed. It is null when
+    the total is skipped.
+    """
+    try:
+        fields = parse_room_fields(request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
     try:
-        include_unverified = request.args.get("include_unverified", "0").lower() in {"1", "true", "yes"}
-        college = (request.args.get("college") or "").strip()
-        city = (request.args.get("city") or "").strip()
-        search = (request.args.get("q") or "").strip()
-        property_type = (request.args.get("property_type") or "").strip().lower()
-        max_rent = request.args.get("max_rent", type=int)
-        min_available = request.args.get("min_available", type=int)
+        filters = parse_room_filters(request.args)
+        search = filters["search"]
         limit = request.args.get("limit", type=int) or 50
         offset = request.args.get("offset", type=int) or 0
+        cursor = request.args.get("cursor")
+        with_total = request.args.get("total", "0" if cursor else "1").lower() in {"1", "true", "yes"}
         sort_key = (request.args.get("sort") or "price_asc").lower()
-
-        query = Room.query
-        if not include_unverified:
-            query = query.filter(Room.verified.is_(True))
-        if college:
-            query = query.filter(Room.college_nearby.ilike(f"%{college}%"))
-        if city:
-            query = query.filter(Room.location.ilike(f"%{city}%"))
-        if search:
-            like = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Room.title.ilike(like),
-                    Room.location.ilike(like),
-                    Room.college_nearby.ilike(like),
+        college_id = filters["college_id"]
+        if not (
+            sort_key in ROOM_SORTS
+            or (sort_key == "relevance" and search)
+            or (sort_key == "distance" and college_id is not None)
+        ):
+            sort_key = "price_asc"
+
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, sort_key, ROOM_CURSOR_PARSERS.get(sort_key, int))
+            except ValueError as error:
+                return jsonify({"error": str(error)}), 400
+            # Relevance is ranked in memory; its cursor holds the next position.
+            offset = max(after[0], 0) if sort_key == "relevance" else 0
+
+        query = apply_room_filters(Room.query, filters)
+
+        # Each branch fetches one row past the page to know if there is a next one.
+        next_cursor = None
+        total, total_source = None, "exact"
+        if sort_key == "relevance":
+            total, page_ids = paginate_by_relevance(query, search, offset, limit + 1)
+            if len(page_ids) > limit > 0:
+                next_cursor = encode_cursor(sort_key, offset + limit, page_ids[limit - 1])
+        elif catalog_supports(filters) and offset >= 0 and limit > 0:
+            # Filter and sort in memory; only the final page touches the database.
+            catalog = get_room_catalog()
+            total, page_ids = catalog.page(
+                catalog_selection(catalog, filters), sort_key, offset, limit + 1, college_id=college_id,
+                after=None if after is None else (_catalog_sort_value(sort_key, after[0]), after[1]),
+            )
+            if len(page_ids) > limit:
+                last_id = page_ids[limit - 1]
+                value = catalog.sort_value(sort_key, last_id, college_id=college_id)
+                next_cursor = encode_cursor(sort_key, _cursor_sort_value(sort_key, value), last_id)
+        else:
+            if sort_key == "distance":
+                # Rooms without coordinates have no distance row; they go last.
+                query = query.outerjoin(
+                    RoomCollegeDistance,
+                    (RoomCollegeDistance.room_id == Room.id) & (RoomCollegeDistance.college_id == college_id),
+                )
+                column, descending, nulls_last = RoomCollegeDistance.distance_m, False, True
+            else:
+                (column, descending), nulls_last = ROOM_SORTS[sort_key], False
+
+            if ROOM_COUNT_CACHE_ENABLED:
+                total, total_source = room_counts.get(room_filter_key(filters), filters, count_missing=with_total)
+                if total_source == "cached":
+                    # Same count as a fresh one; the body must not differ under one ETag.
+                    total_source = "exact"
+                elif total_source == "stale":
+                    g.valid_until = time.time()  # no ETag reuse: the recount changes the body
+            elif with_total:
+                total = query.count()
+            if after is not None:
+                query = query.filter(keyset_condition(
+                    column, after[0], Room.id, after[1], descending=descending, nulls_last=nulls_last,
+                ))
+            order = keyset_order(column, Room.id, descending=descending)
+            if nulls_last:
+                order = (column.is_(None),) + order
+            rows = query.with_entities(Room.id, column).order_by(*order).offset(offset).limit(limit + 1).all()
+            page_ids = [room_id for room_id, _ in rows]
+            if len(rows) > limit > 0:
+                last_id, value = rows[limit - 1]
+                next_cursor = encode_cursor(sort_key, value, last_id)
+        page_ids = page_ids[:max(limit, 0)]
+        if total is None:
+            total_source = None
+
+        payloads = room_payloads(page_ids, fields)
+        if college_id is not None and payloads:
+            distance_of = dict(
+                db.session.query(RoomCollegeDistance.room_id, RoomCollegeDistance.distance_m).filter(
+                    RoomCollegeDistance.college_id == college_id,
+                    RoomCollegeDistance.room_id.in_([payload["id"] for payload in payloads]),
                 )
             )
-        if property_type:
-            query = query.filter(func.lower(Room.property_type) == property_type)
-        if max_rent is not None:
-            query = query.filter(Room.price <= max_rent)
-        if min_available is not None:
-            query = query.filter((Room.capacity_total - Room.capacity_occupied) >= min_available)
-
-        sort_map = {
-            "price_desc": Room.price.desc(),
-            "price_asc": Room.price.asc(),
-            "newest": Room.created_at.desc(),
-            "slots_desc": (Room.capacity_total - Room.capacity_occupied).desc(),
-        }
-        order_clause = sort_map.get(sort_key, sort_map["price_asc"])
-        query = query.order_by(order_clause, Room.id.asc())
-
-        total = query.count()
-        rooms = query.offset(offset).limit(limit).all()
+            for payload in payloads:
+                metres = distance_of.get(payload["id"])
+                payload["distance_km"] = round(metres / 1000, 3) if metres is not None else None
 
         return jsonify(
             {
-                "rooms": [room.to_dict() for room in rooms],
+                "rooms": payloads,
                 "meta": {
                     "total": total,
-                    "returned": len(rooms),
+                    "total_source": total_source,
+                    "returned": len(payloads),
                     "offset": offset,
                     "limit": limit,
+                    "next_cursor": next_cursor,
                 },
             }
         )
@@ -1537,7 +2505,248 @@ def api_rooms():
         app.logger.exception("Room search failed", extra={"args": request.args})
         return jsonify({"error": "Unable to fetch rooms at this time."}), 500
 
+def _sql_room_facets(filters):
+    """Facet counts with one grouped SQL query (used without the catalog)."""
+    bucket = case(
+        *((Room.price < bound, i) for i, bound in enumerate(PRICE_BUCKETS)),
+        else_=len(PRICE_BUCKETS),
+    )
+    amenity_sums = [
+        func.sum((Room.amenity_mask.op("&")(1 << bit) != 0).cast(db.Integer)) for bit in range(len(AMENITY_BITS))
+    ]
+    query = apply_room_filters(
+        db.session.query(
+            func.lower(Room.property_type), bucket, Room.college_nearby, Room.availability_status,
+            func.count(Room.id), *amenity_sums,
+        ),
+        filters,
+    ).group_by(func.lower(Room.property_type), bucket, Room.college_nearby, Room.availability_status)
+
+    total = 0
+    property_types, colleges, statuses = {}, {}, {}
+    price_counts = [0] * (len(PRICE_BUCKETS) + 1)
+    amenity_counts = [0] * len(AMENITY_BITS)
+    for property_type, bucket_index, college, status, count, *sums in query:
+        total += count
+        property_types[property_type or ""] = property_types.get(property_type or "", 0) + count
+        colleges[college or ""] = colleges.get(college or "", 0) + count
+        statuses[status or ""] = statuses.get(status or "", 0) + count
+        price_counts[bucket_index] += count
+        for bit, n in enumerate(sums):
+            amenity_counts[bit] += n or 0
+    return facet_payload(total, property_types, price_counts, colleges, statuses, amenity_counts)
+
+
+@app.route("/api/rooms/facets")
+def api_room_facets():
+    """Counts per property type, price bucket, top colleges, availability
+    status and amenity for the rooms matching the /api/rooms filters."""
+    try:
+        filters = parse_room_filters(request.args)
+        if not catalog_supports(filters):
+            return jsonify(_sql_room_facets(filters))
+
+        catalog = get_room_catalog()
+        return jsonify(catalog.facets(catalog_selection(catalog, filters)))
+    except SQLAlchemyError:
+        app.logger.exception("Room facets failed", extra={"args": request.args})
+        return jsonify({"error": "Unable to fetch room facets at this time."}), 500
+
+
+def _sql_rooms_nearby(filters, lat, lon, radius_km, offset, limit):
+    """(total, room IDs, distances) for a radius query without the catalog.
+
+    The geohash B-tree index narrows the scan to the cells covering the circle;
+    exact distances are computed for those candidates only.
+    """
+    query = apply_room_filters(db.session.query(Room.id, Room.latitude, Room.longitude), filters)
+    cells = geohash_cover(lat, lon, radius_km)
+    query = query.filter(or_(*(Room.geohash.between(*geohash_prefix_range(cell)) for cell in cells)))
+    matches = []
+    for room_id, room_lat, room_lon in query:
+        distance = haversine_km(lat, lon, room_lat, room_lon)
+        if distance <= radius_km:
+            matches.append((distance, room_id))
+    matches.sort()
+    page = matches[offset:offset + limit]
+    return len(matches), [room_id for _, room_id in page], [distance for distance, _ in page]
+
+
+@app.route("/api/rooms/nearby")
+def api_rooms_nearby():
+    """Rooms within radius_km of (lat, lon), nearest first, with the
+    /api/rooms filters. Each room carries its distance_km."""
+    lat = request.args.get("lat", type=float)
+    lon = request.args.get("lon", type=float)
+    radius_km = request.args.get("radius_km", default=2.0, type=float)
+    if not valid_coordinates(lat, lon):
+        return jsonify({"error": "lat and lon must be valid coordinates."}), 400
+    if radius_km is None or not 0 < radius_km <= MAX_RADIUS_KM:
+        return jsonify({"error": f"radius_km must be between 0 and {MAX_RADIUS_KM:g}."}), 400
+    try:
+        fields = parse_room_fields(request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+    try:
+        filters = parse_room_filters(request.args)
+        limit = request.args.get("limit", type=int) or 50
+        offset = max(request.args.get("offset", type=int) or 0, 0)
+
+        if catalog_supports(filters) and limit > 0:
+            catalog = get_room_catalog()
+            total, room_ids, distances = catalog.nearby(
+                catalog_selection(catalog, filters), lat, lon, radius_km, offset, limit
+            )
+        else:
+            total, room_ids, distances = _sql_rooms_nearby(filters, lat, lon, radius_km, offset, limit)
+
+        distance_of = dict(zip(room_ids, distances))
+        rooms = room_payloads(room_ids, fields)
+        for payload in rooms:
+            payload["distance_km"] = round(distance_of[payload["id"]], 3)
+        return jsonify(
+            {
+                "rooms": rooms,
+                "meta": {
+                    "total": total,
+                    "returned": len(rooms),
+                    "offset": offset,
+                    "limit": limit,
+                    "center": {"lat": lat, "lon": lon},
+                    "radius_km": radius_km,
+                },
+            }
+        )
+    except SQLAlchemyError:
+        app.logger.exception("Nearby room search failed", extra={"args": request.args})
+        return jsonify({"error": "Unable to fetch nearby rooms at this time."}), 500
+
+
+def parse_bbox(value):
+    """(west, south, east, north) from "west,south,east,north", clamped to
+    the globe; raises ValueError if malformed or inverted."""
+    west, south, east, north = (float(part) for part in (value or "").split(","))
+    west, east = max(west, -180.0), min(east, 180.0)
+    south, north = max(south, -90.0), min(north, 90.0)
+    if not (west <= east and south <= north):
+        raise ValueError(value)
+    return west, south, east, north
+
+
+@app.route("/api/rooms/map")
+def api_rooms_map():
+    """Map markers for a viewport: bbox=west,south,east,north and zoom.
+
+    Returns precomputed grid clusters (count, centroid, min price) and,
+    where a cell holds one room or the map is zoomed in past
+    MAX_CLUSTER_ZOOM, individual rooms. Covers verified rooms only.
+    """
+    try:
+        west, south, east, north = parse_bbox(request.args.get("bbox"))
+    except ValueError:
+        return jsonify({"error": "bbox must be west,south,east,north."}), 400
+    zoom = request.args.get("zoom", type=int)
+    if zoom is None or not 0 <= zoom <= 22:
+        return jsonify({"error": "zoom must be an integer between 0 and 22."}), 400
+    try:
+        clusters, points = get_room_clusters().query(west, south, east, north, zoom)
+        return jsonify(
+            {
+                "clusters": clusters,
+                "rooms": points,
+                "meta": {
+                    "zoom": zoom,
+                    "total": sum(cluster["count"] for cluster in clusters) + len(points),
+                },
+            }
+        )
+    except SQLAlchemyError:
+        app.logger.exception("Room map failed", extra={"args": request.args})
+        return jsonify({"error": "Unable to fetch map markers at this time."}), 500
+
+
+# Encoded /api/rooms/markers payloads, keyed by catalog build, catalog
+# version and query string; any room write moves the version on.
+MARKER_FEED_CACHE_SIZE = 32
+_marker_feed_cache = OrderedDict()
+
+
+def _marker_feed(filters, bbox):
+    """(header, columns, bodies) of the marker feed for the /api/rooms
+    filters. bodies memoizes the encoded responses of a catalog feed by
+    (format, Content-Encoding); it is None for the SQL fallback."""
+    if catalog_supports(filters):
+        catalog = get_room_catalog()
+        key = (_room_catalog_state["built_at"], catalog.version, tuple(sorted(item for item in request.args.items(multi=True) if item[0] != "format")))
+        feed = _marker_feed_cache.get(key)
+        if feed is None:
+            feed = (*encode_columns(*catalog.markers(catalog_selection(catalog, filters), bbox)), {})
+            _marker_feed_cache[key] = feed
+            while len(_marker_feed_cache) > MARKER_FEED_CACHE_SIZE:
+                _marker_feed_cache.popitem(last=False)
+        else:
+            _marker_feed_cache.move_to_end(key)
+        return feed
+
+    query = apply_room_filters(
+        db.session.query(Room.id, Room.latitude, Room.longitude, Room.price, Room.availability_status),
+        filters,
+    ).filter(Room.latitude.isnot(None), Room.longitude.isnot(None))
+    if bbox is not None:
+        west, south, east, north = bbox
+        query = query.filter(Room.latitude.between(south, north), Room.longitude.between(west, east))
+    return (*encode_rows(query), None)
+
+
+@app.route("/api/rooms/markers")
+def api_room_markers():
+    """Every room matching the /api/rooms filters as a compact marker feed
+    (see marker_feed.py): ID, fixed-point lat/lon, price and status code in
+    delta-encoded int32 columns.
+
+    format=binary returns application/octet-stream; the default is JSON
+    with base64 columns. bbox=west,south,east,north limits the area.
+    """
+    output = (request.args.get("format") or "base64").lower()
+    if output not in {"binary", "base64"}:
+        return jsonify({"error": "format must be binary or base64."}), 400
+    bbox = None
+    if request.args.get("bbox"):
+        try:
+            bbox = parse_bbox(request.args["bbox"])
+        except ValueError:
+            return jsonify({"error": "bbox must be west,south,east,north."}), 400
+    try:
+        header, columns, bodies = _marker_feed(parse_room_filters(request.args), bbox)
+    except SQLAlchemyError:
+        app.logger.exception("Room marker feed failed", extra={"args": request.args})
+        return jsonify({"error": "Unable to fetch map markers at this time."}), 500
+
+    # Encoded here rather than by the compression middleware so a cached
+    # feed is compressed once, not on every request.
+    accepted = choose_encoding(request.headers.get("Accept-Encoding"), COMPRESSION_ENCODINGS)
+    cached = bodies.get((output, accepted)) if bodies is not None else None
+    if cached is not None:
+        body, encoding = cached
+    else:
+        if output == "binary":
+            body = to_binary(header, columns)
+        else:
+            body = app.json.response(to_base64(header, columns)).get_data()
+        encoding = accepted if len(body) >= COMPRESSION_MIN_SIZE else None
+        if encoding is not None:
+            body = compress(body, encoding)
+        if bodies is not None:
+            bodies[(output, accepted)] = (body, encoding)
+    response = Response(body, mimetype="application/octet-stream" if output == "binary" else app.json.mimetype)
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
 @app.route("/api/colleges")
+@conditional_get("rooms")
 def api_colleges():
     """Get list of unique colleges for autocomplete/filter."""
     try:
@@ -1547,6 +2756,17 @@ def api_colleges():
         app.logger.error(f"Failed to fetch colleges: {e}")
         return jsonify([]), 500
 
+@app.route("/api/colleges/locations")
+def api_college_locations():
+    """Colleges with IDs and coordinates, for college_id= on the room APIs."""
+    try:
+        colleges = College.query.order_by(College.name).all()
+        return jsonify([college.to_dict() for college in colleges])
+    except SQLAlchemyError:
+        app.logger.exception("Failed to fetch college locations")
+        return jsonify({"error": "Unable to fetch colleges at this time."}), 500
+
+
 @app.route("/api/owner/listings", methods=["POST"])
 @login_required
 def create_listing():
@@ -1629,25 +2849,32 @@ def create_listing():
 def search_autocomplete():
     """
     DSA-powered Autocomplete Search using Trie.
-    Returns rooms that match the prefix.
+    Returns rooms that match the prefix. Multi-word queries ("powai pg")
+    must match every word, with the last word treated as a prefix.
+    With fuzzy=1, typos within a small edit distance ("somaya") also match,
+    ranked after all exact matches.
     """
     query = request.args.get("q", "").strip()
+    fuzzy = request.args.get("fuzzy", "0").lower() in {"1", "true", "yes"}
+    try:
+        fields = parse_room_fields(request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
     if not query:
         return jsonify({"results": []})
     
-    # 1. Search Trie for matching Room IDs
-    room_ids = search_trie.search(query)
+    # 1. Resolve the query to the top-ranked matching Room IDs
+    room_ids = search_trie.search_query(query, limit=20, fuzzy=fuzzy)
     
     if not room_ids:
         return jsonify({"results": []})
     
-    # 2. Fetch full room details from DB
-    # Optimization: In a real app, cache these or store minimal data in Trie
-    rooms = Room.query.filter(Room.id.in_(room_ids)).limit(20).all()
+    # 2. Fetch room details (all, or fields=) from DB, keeping the trie's ranking
+    results = room_payloads(room_ids, fields)
     
     return jsonify({
-        "results": [room.to_dict() for room in rooms],
-        "count": len(rooms)
+        "results": results,
+        "count": len(results)
     })
 
 
@@ -1894,7 +3121,8 @@ def reject_verification(verification_id):
 @app.route("/admin/listings")
 @admin_required
 def admin_listings():
-    page = request.args.get("page", 1, type=int)
+    """Listings, newest first, paged by keyset: after=/before= hold the
+    cursor of the last/first listing of the neighbouring page."""
     status_filter = request.args.get("status", "all")
     
     query = Room.query
@@ -1904,14 +3132,30 @@ def admin_listings():
         query = query.filter_by(verified=True)
     
     per_page = getattr(config, "ITEMS_PER_PAGE", 50) if config else 50
-    pagination = query.order_by(Room.created_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    cursor = request.args.get("after") or request.args.get("before")
+    try:
+        position = decode_cursor(cursor, "newest", parse_datetime) if cursor else None
+    except ValueError:
+        position = None  # a stale or mangled link: start from the newest
+    backwards = position is not None and not request.args.get("after")
+    if position is not None:
+        query = query.filter(keyset_condition(
+            Room.created_at, position[0], Room.id, position[1], descending=True, backwards=backwards,
+        ))
+    listings = query.order_by(
+        *keyset_order(Room.created_at, Room.id, descending=True, backwards=backwards)
+    ).limit(per_page + 1).all()
+    more = len(listings) > per_page
+    listings = listings[:per_page]
+    if backwards:
+        listings.reverse()
+    has_prev, has_next = (more, True) if backwards else (position is not None, more)
     
     return render_template(
         "admin/listings.html",
-        listings=pagination.items,
-        pagination=pagination,
+        listings=listings,
+        prev_cursor=encode_cursor("newest", listings[0].created_at, listings[0].id) if has_prev and listings else None,
+        next_cursor=encode_cursor("newest", listings[-1].created_at, listings[-1].id) if has_next and listings else None,
         status_filter=status_filter,
     )
 
@@ -2204,8 +3448,6 @@ def admin_import_entity(entity):
                 flash(f"Imported {count} hostels.", "success")
             
             db.session.commit()
-            if entity == 'hostels':
-                rebuild_search_index()
             
     except Exception as e:
         db.session.rollback()
@@ -2218,17 +3460,46 @@ def admin_import_entity(entity):
 # ============= FLASH DEALS API =============
 
 @app.route("/api/flash-deals", methods=["GET"])
+@conditional_get("flash_deals", "rooms")
 def get_flash_deals():
-    """Get all active flash deals (not expired)."""
+    """Get all active flash deals (not expired), each with the room data the
+    map needs, in one query."""
     try:
         now = datetime.utcnow()
-        deals = FlashDeal.query.filter(
-            FlashDeal.is_active == True,
-            FlashDeal.expires_at > now
-        ).all()
-        
+        rows = (
+            db.session.query(FlashDeal, Room.title, Room.latitude, Room.longitude, Room.images)
+            .join(Room, FlashDeal.room_id == Room.id)
+            .filter(
+                FlashDeal.is_active == True,
+                FlashDeal.expires_at > now
+            )
+            .order_by(FlashDeal.expires_at)
+            .all()
+        )
+        if rows:
+            # The list changes when the first deal expires, and each card's
+            # "Nh remaining" (floor of time_remaining_hours) whenever a deal
+            # crosses a whole hour; revalidate at the earliest of those.
+            g.valid_until = min(
+                (deal.expires_at - datetime(1970, 1, 1)).total_seconds()
+                - (deal.expires_at - now).total_seconds() // 3600 * 3600
+                for deal, *_ in rows
+            )
+
+        deals = []
+        for deal, title, latitude, longitude, images in rows:
+            payload = deal.to_dict()
+            payload["room"] = {
+                "id": deal.room_id,
+                "title": title,
+                "latitude": latitude,
+                "longitude": longitude,
+                "image_url": room_image_url(images) or ROOM_IMAGE_PLACEHOLDER,
+            }
+            deals.append(payload)
+
         return jsonify({
-            "deals": [deal.to_dict() for deal in deals],
+            "deals": deals,
             "count": len(deals),
         })
     except SQLAlchemyError:
@@ -2549,6 +3820,7 @@ def wallet_transactions():
 # ============= SUBSCRIPTION & REVENUE SYSTEM =============
 
 @app.route("/api/subscription-plans", methods=["GET"])
+@conditional_get("subscription_plans")
 def get_subscription_plans():
     """Get all active subscription plans."""
     user_type = request.args.get("user_type")  # 'student' or 'owner'
@@ -2809,6 +4081,7 @@ def confirm_listing_fee(fee_id):
 # ============= VALUE-ADDED SERVICES =============
 
 @app.route("/api/services", methods=["GET"])
+@conditional_get("value_added_services")
 def get_services():
     """Get all available services."""
     target_user = request.args.get("target_user")  # 'student', 'owner', 'both'
@@ -3561,6 +4834,7 @@ def add_mess_menu():
             # Save to uploads folder
             filename = f"menu_{room_id}_{datetime.utcnow().timestamp()}.jpg"
             file.save(os.path.join(app.static_folder, "uploads", filename))
+            forget_static_images()
             image_filename = filename
     
     menu = MessMenu(
@@ -3748,17 +5022,26 @@ def roommate_match():
 @app.route("/api/rooms/featured")
 def get_featured_rooms():
     """Get 6-8 featured/trending rooms for home page."""
+    try:
+        fields = parse_room_fields(request.args)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
     try:
         # Get rooms with different availability statuses and randomize
         featured = Room.query.filter(
             Room.verified == True,
             Room.owner_id.isnot(None)
-        ).order_by(func.random()).limit(8).all()
+        ).order_by(func.random()).limit(8)
+        
+        if fields is None:
+            rooms = [room.to_dict() for room in featured]
+        else:
+            rooms = room_payloads([room_id for (room_id,) in featured.with_entities(Room.id)], fields)
         
         return jsonify({
             "status": "success",
-            "count": len(featured),
-            "rooms": [room.to_dict() for room in featured]
+            "count": len(rooms),
+            "rooms": rooms
         })
     except Exception as e:
         app.logger.error(f"Error fetching featured rooms: {str(e)}")
@@ -3767,7 +5050,15 @@ def get_featured_rooms():
 
 @app.route("/api/rooms/search")
 def search_rooms():
-    """Search rooms with filters: price, location, college, amenities, property_type."""
+    """Search rooms with filters: price, location, college, amenities, property_type.
+
+    sort=relevance orders text matches by BM25 score (title > college >
+    location > amenities); otherwise rooms are in ID order.
+
+    page= pages count the total; cursor=<next_cursor> pages continue by
+    keyset and skip the count unless total=1 (total=0 skips it on the
+    first page too).
+    """
     try:
         # Get query parameters
         query = request.args.get("q", "").strip()
@@ -3779,19 +5070,26 @@ def search_rooms():
         amenities = request.args.get("amenities", "").strip()  # comma-separated
         page = request.args.get("page", 1, type=int)
         per_page = request.args.get("per_page", 10, type=int)
+        sort_key = (request.args.get("sort") or "").lower()
+        cursor = request.args.get("cursor")
+        try:
+            fields = parse_room_fields(request.args)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        relevance = sort_key == "relevance" and query
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, "relevance" if relevance else "id")
+            except ValueError as error:
+                return jsonify({"error": str(error)}), 400
         
         # Build query
         base_query = Room.query.filter(Room.verified == True)
         
         # Text search
         if query:
-            base_query = base_query.filter(
-                or_(
-                    Room.title.ilike(f"%{query}%"),
-                    Room.location.ilike(f"%{query}%"),
-                    Room.amenities.ilike(f"%{query}%")
-                )
-            )
+            base_query = base_query.filter(room_text_search.condition(query, ("title", "location", "amenities")))
         
         # Price range filter
         if min_price:
@@ -3801,11 +5099,11 @@ def search_rooms():
         
         # Location filter
         if location:
-            base_query = base_query.filter(Room.location.ilike(f"%{location}%"))
+            base_query = base_query.filter(room_substring_filter.condition("location", location))
         
         # College filter
         if college:
-            base_query = base_query.filter(Room.college_nearby.ilike(f"%{college}%"))
+            base_query = base_query.filter(room_substring_filter.condition("college_nearby", college))
         
         # Property type filter
         if property_type:
@@ -3813,12 +5111,59 @@ def search_rooms():
         
         # Amenities filter (if room contains all specified amenities)
         if amenities:
-            amenity_list = [a.strip() for a in amenities.split(",")]
-            for amenity in amenity_list:
-                base_query = base_query.filter(Room.amenities.ilike(f"%{amenity}%"))
+            base_query = filter_by_amenities(base_query, amenities)
+        
+        # Cursor pages: no COUNT(*) and no rows skipped, however deep
+        with_total = request.args.get("total", "0" if cursor else "1").lower() in {"1", "true", "yes"}
+        if (after is not None or not with_total) and per_page > 0:
+            total = None
+            if relevance:
+                offset = max(after[0], 0) if after is not None else 0
+                count, page_ids = paginate_by_relevance(base_query, query, offset, per_page + 1)
+                total = count if with_total else None
+                next_cursor = encode_cursor("relevance", offset + per_page, page_ids[per_page - 1]) if len(page_ids) > per_page else None
+            else:
+                if with_total:
+                    total = base_query.order_by(None).count()
+                if after is not None:
+                    base_query = base_query.filter(Room.id > after[1])
+                page_ids = [
+                    room_id for (room_id,) in base_query.with_entities(Room.id).order_by(Room.id).limit(per_page + 1)
+                ]
+                next_cursor = encode_cursor("id", page_ids[per_page - 1], page_ids[per_page - 1]) if len(page_ids) > per_page else None
+            return jsonify({
+                "status": "success",
+                "total": total,
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "rooms": room_payloads(page_ids[:per_page], fields)
+            })
+
+        # Relevance ranking
+        if relevance and page > 0 and per_page > 0:
+            offset = (page - 1) * per_page
+            total, page_ids = paginate_by_relevance(base_query, query, offset, per_page)
+            return jsonify({
+                "status": "success",
+                "total": total,
+                "pages": math.ceil(total / per_page),
+                "current_page": page,
+                "per_page": per_page,
+                "next_cursor": encode_cursor("relevance", offset + per_page, page_ids[-1]) if total > offset + per_page else None,
+                "rooms": room_payloads(page_ids, fields)
+            })
         
         # Pagination
-        paginated = base_query.paginate(page=page, per_page=per_page)
+        base_query = base_query.order_by(Room.id)
+        if fields is None:
+            paginated = base_query.paginate(page=page, per_page=per_page)
+            rooms = [room.to_dict() for room in paginated.items]
+            last_id = paginated.items[-1].id if paginated.items else None
+        else:
+            paginated = base_query.with_entities(Room.id).paginate(page=page, per_page=per_page)
+            page_ids = [room_id for (room_id,) in paginated.items]
+            rooms = room_payloads(page_ids, fields)
+            last_id = page_ids[-1] if page_ids else None
         
         return jsonify({
             "status": "success",
@@ -3826,7 +5171,8 @@ def search_rooms():
             "pages": paginated.pages,
             "current_page": page,
             "per_page": per_page,
-            "rooms": [room.to_dict() for room in paginated.items]
+            "next_cursor": encode_cursor("id", last_id, last_id) if paginated.has_next else None,
+            "rooms": rooms
         })
     except Exception as e:
         app.logger.error(f"Error searching rooms: {str(e)}")
@@ -3839,17 +5185,22 @@ def get_rooms_by_status(status):
     try:
         if status not in ['green', 'yellow', 'red']:
             return jsonify({"error": "Invalid status. Use: green, yellow, or red"}), 400
+        try:
+            fields = parse_room_fields(request.args)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
         
-        rooms = Room.query.filter(
+        query = Room.query.filter(
             Room.availability_status == status,
             Room.verified == True
-        ).all()
+        )
+        rooms = room_query_payloads(query, fields)
         
         return jsonify({
             "status": "success",
             "availability_status": status,
             "count": len(rooms),
-            "rooms": [room.to_dict() for room in rooms]
+            "rooms": rooms
         })
     except Exception as e:
         app.logger.error(f"Error fetching rooms by status: {str(e)}")
@@ -4057,6 +5408,48 @@ def get_news():
 # ---------------------------------------------------------------------------
 # Database Initialization (Auto-create tables on startup)
 # ---------------------------------------------------------------------------
+def seed_colleges():
+    """Fill an empty colleges table from data/ (see services.gazetteer.load_colleges),
+    then precompute the distances of existing rooms."""
+    if College.query.first() is not None:
+        return 0
+    colleges = [
+        College(
+            name=college["name"], city=college["city"], area=college["area"], college_type=college["type"],
+            latitude=college["latitude"], longitude=college["longitude"],
+        )
+        for college in load_colleges(os.path.join(app.root_path, "data"))
+    ]
+    if not colleges:
+        return 0
+    db.session.add_all(colleges)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker booting on the same database seeded them (and
+        # backfills the distances) first.
+        db.session.rollback()
+        return 0
+    backfill_college_distances()
+    return len(colleges)
+
+
+def backfill_college_distances(batch_size=5000):
+    """Recompute room_college_distances for every room."""
+    table = RoomCollegeDistance.__table__
+    colleges = db.session.query(College.id, College.latitude, College.longitude).all()
+    db.session.execute(table.delete())
+    batch = []
+    for room_id, lat, lon in db.session.query(Room.id, Room.latitude, Room.longitude):
+        batch.extend(college_distance_rows(room_id, lat, lon, colleges))
+        if len(batch) >= batch_size:
+            db.session.execute(table.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(table.insert(), batch)
+    db.session.commit()
+
+
 def init_database():
     """Create all tables and seed initial data if needed."""
     import json
@@ -4067,6 +5460,22 @@ def init_database():
             # Create all tables
             db.create_all()
             print("[OK] Database tables created successfully!")
+
+            prune_room_changes()
+
+            global room_text_search, room_substring_filter
+            room_text_search = install_text_search(db.engine, Room.__table__, TEXT_SEARCH_BACKEND)
+            room_substring_filter = detect_substring_filter(db.engine, Room.__table__)
+            print(f"[OK] Room text search backend: {room_text_search.name}, filters: {room_substring_filter.name}")
+
+            ensure_table_versions()
+
+            seeded = seed_colleges()
+            if seeded:
+                print(f"[OK] Added {seeded} colleges with coordinates")
+
+            # Geocoding for verification: cached in the database, gazetteer-seeded.
+            configure_geocoding_service(db.engine)
             
             # Create admin if not exists
             admin = Admin.query.filter_by(email="admin@roomies.in").first()
@@ -0,0 +1,84 @@
+"""
+Benchmark: response compression
+===============================
+Creates a scratch SQLite database with synthetic rooms and times pages,
+JSON listings and static files through the test client with no
+Accept-Encoding, with gzip and (if brotli is installed) with br, showing
+the bytes on the wire. Static files are timed twice per encoding: from
+the precompressed sibling and, with the siblings removed, compressed per
+request by the middleware.
+
+Usage:
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --rooms 50000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+URLS = [
+    "/",
+    "/api/rooms?limit=50",
+    "/api/rooms?limit=200",
+    "/api/rooms/markers?format=binary",
+    "/static/js/main.js",
+    "/static/css/main.css",
+]
+
+
+def timed(client, url, headers, repeat):
+    client.get(url, headers=headers)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - start) * 1000 / repeat, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        import app as app_module  # creates and seeds the scratch database
+        from benchmarks.bench_room_catalog import load_rooms
+        from compression import brotli, precompress_static
+
+        load_rooms(app_module, args.rooms)
+        # Precompress a copy of static/ so the checkout is left alone.
+        static_folder = os.path.join(tmpdir, "static")
+        shutil.copytree(app_module.app.static_folder, static_folder)
+        app_module.app.static_folder = static_folder
+        precompress_static(static_folder)
+        client = app_module.app.test_client()
+
+        encodings = ["gzip"] + (["br"] if brotli is not None else [])
+        print(f"{args.rooms:,} rooms\n")
+        print(f"{'request':<34} {'encoding':<14} {'ms':>7} {'KB':>8}")
+        for url in URLS:
+            cases = [("identity", {})] + [(encoding, {"Accept-Encoding": encoding}) for encoding in encodings]
+            for label, headers in cases:
+                elapsed, response = timed(client, url, headers, args.repeat)
+                assert response.headers.get("Content-Encoding", "identity") == label
+                print(f"{url:<34} {label:<14} {elapsed:>7.2f} {len(response.data) / 1024:>8.1f}")
+            if url.startswith("/static/"):
+                path = os.path.join(static_folder, url[len("/static/"):])
+                for encoding, suffix in (("gzip", ".gz"), ("br", ".br")):
+                    if encoding in encodings and os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+                        elapsed, response = timed(client, url, {"Accept-Encoding": encoding}, args.repeat)
+                        print(f"{url:<34} {encoding + ' per-req':<14} {elapsed:>7.2f} {len(response.data) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
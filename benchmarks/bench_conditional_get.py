@@ -0,0 +1,71 @@
+"""
+Benchmark: conditional GET (ETag / 304) on the polled catalog endpoints
+======================================================================
+Creates a scratch SQLite database with synthetic rooms and times each
+endpoint as a full 200 response and as a revalidation that comes back
+304 Not Modified, counting the SQL statements each one runs.
+
+Usage:
+    python benchmarks/bench_conditional_get.py
+    python benchmarks/bench_conditional_get.py --rooms 50000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+URLS = [
+    "/api/rooms?limit=50",
+    "/api/colleges",
+    "/api/subscription-plans",
+    "/api/services",
+    "/api/flash-deals",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        import app as app_module  # creates and seeds the scratch database
+        from benchmarks.bench_room_catalog import load_rooms
+        from sqlalchemy import event
+
+        load_rooms(app_module, args.rooms)
+        statements = [0]
+        with app_module.app.app_context():
+            event.listen(
+                app_module.db.engine, "before_cursor_execute",
+                lambda *_: statements.__setitem__(0, statements[0] + 1),
+            )
+        client = app_module.app.test_client()
+
+        print(f"{args.rooms:,} rooms\n")
+        print(f"{'request':<26} {'200 ms':>8} {'stmts':>6} {'304 ms':>8} {'stmts':>6}")
+        for url in URLS:
+            results = []
+            for revalidate in (False, True):
+                etag = client.get(url).headers["ETag"]
+                headers = {"If-None-Match": etag} if revalidate else {}
+                statements[0] = 0
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    response = client.get(url, headers=headers)
+                elapsed = (time.perf_counter() - start) * 1000 / args.repeat
+                assert response.status_code == (304 if revalidate else 200), response.status_code
+                results.append((elapsed, statements[0] / args.repeat))
+            (full_ms, full_sql), (cached_ms, cached_sql) = results
+            print(f"{url:<26} {full_ms:>8.2f} {full_sql:>6.1f} {cached_ms:>8.2f} {cached_sql:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
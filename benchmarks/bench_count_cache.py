@@ -0,0 +1,77 @@
+"""
+Benchmark: cached /api/rooms totals
+===================================
+Creates a scratch SQLite database with synthetic rooms and times the
+first page of /api/rooms on the SQL path (ROOM_CATALOG off) for a few
+filter sets, with the count cache off (COUNT(*) every request) and on,
+then right after a room write, when the cached totals are stale and the
+background refresher recounts them.
+
+Usage:
+    python benchmarks/bench_count_cache.py
+    python benchmarks/bench_count_cache.py --rooms 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+URLS = [
+    "/api/rooms?limit=20",
+    "/api/rooms?limit=20&city=mumbai&max_rent=12000",
+    "/api/rooms?limit=20&q=room&college=iit",
+    "/api/rooms?limit=20&amenities=wifi,ac&sort=newest",
+]
+
+
+def timed(client, url, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url)
+    assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - start) * 1000 / repeat, response.get_json()["meta"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        os.environ["ROOM_CATALOG"] = "off"
+        import app as app_module  # creates and seeds the scratch database
+        from benchmarks.bench_room_catalog import load_rooms
+
+        load_rooms(app_module, args.rooms)
+        client = app_module.app.test_client()
+
+        print(f"{args.rooms:,} rooms, SQL path\n")
+        print(f"{'request':<50} {'uncached ms':>12} {'cached ms':>10} {'after write':>12} {'source':>7}")
+        for url in URLS:
+            app_module.ROOM_COUNT_CACHE_ENABLED = False
+            uncached_ms, expected = timed(client, url, args.repeat)
+            app_module.ROOM_COUNT_CACHE_ENABLED = True
+            client.get(url)
+            cached_ms, meta = timed(client, url, args.repeat)
+            assert meta["total"] == expected["total"], (meta, expected)
+
+            with app_module.app.app_context():
+                room = app_module.Room.query.first()
+                room.capacity_occupied = (room.capacity_occupied + 1) % max(room.capacity_total, 1)
+                app_module.db.session.commit()
+            start = time.perf_counter()
+            meta = client.get(url).get_json()["meta"]
+            write_ms = (time.perf_counter() - start) * 1000
+            print(f"{url:<50} {uncached_ms:>12.2f} {cached_ms:>10.2f} {write_ms:>12.2f} {meta['total_source']:>7}")
+        print(f"\nCOUNT queries run by the cache: {app_module.room_counts.counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: facet counts from the RoomCatalog vs one grouped SQL query
+=====================================================================
+Times /api/rooms/facets' work (filter + counts per property type, price
+bucket, college, availability status and amenity) over synthetic rooms,
+using the in-memory NumPy catalog and the equivalent single grouped query
+on a scratch SQLite database.
+
+Usage:
+    python benchmarks/bench_facets.py
+    python benchmarks/bench_facets.py --rooms 200000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from amenities import AMENITIES, required_amenities
+from benchmarks.bench_search_index import synthetic_rooms
+from room_catalog import PRICE_BUCKETS, RoomCatalog
+
+PROPERTY_TYPES = ["PG", "Hostel", "Flat", "Shared"]
+STATUSES = ["green", "yellow", "red"]
+
+CASES = [
+    ("all verified", {}),
+    ("property_type=pg", {"property_type": "pg"}),
+    ("college=iit&max_rent=12000", {"college": "iit", "max_rent": 12000}),
+    ("amenities=wifi,ac,laundry", {"amenities": "WiFi,AC,Laundry"}),
+    ("city=powai&min_available=1", {"city": "powai", "min_available": 1}),
+]
+
+
+def synthetic_rows(count):
+    rng = random.Random(11)
+    for room_id, (title, location, college) in synthetic_rooms(count):
+        yield {
+            "id": room_id,
+            "price": rng.randrange(3000, 30000, 500),
+            "property_type": rng.choice(PROPERTY_TYPES),
+            "college_nearby": college,
+            "location": location,
+            "availability_status": rng.choice(STATUSES),
+            "verified": rng.random() < 0.9,
+            "capacity_total": 4,
+            "capacity_occupied": rng.randint(0, 4),
+            "created_at": None,
+            "latitude": None,
+            "longitude": None,
+            "amenity_mask": sum(1 << bit for bit in rng.sample(range(len(AMENITIES)), rng.randint(2, 8))),
+        }
+
+
+def catalog_filters(params):
+    mask, _ = required_amenities(params.get("amenities"))
+    return {**params, "amenity_mask": mask}
+
+
+def sql_facets(conn, params):
+    where, args = ["verified = 1"], []
+    if params.get("property_type"):
+        where.append("lower(property_type) = ?")
+        args.append(params["property_type"])
+    if params.get("college"):
+        where.append("college_nearby LIKE ?")
+        args.append(f"%{params['college']}%")
+    if params.get("city"):
+        where.append("location LIKE ?")
+        args.append(f"%{params['city']}%")
+    if params.get("max_rent") is not None:
+        where.append("price <= ?")
+        args.append(params["max_rent"])
+    if params.get("min_available") is not None:
+        where.append("slots >= ?")
+        args.append(params["min_available"])
+    mask, _ = required_amenities(params.get("amenities"))
+    if mask:
+        where.append("amenity_mask & ? = ?")
+        args += [mask, mask]
+    bucket = "CASE " + " ".join(f"WHEN price < {b} THEN {i}" for i, b in enumerate(PRICE_BUCKETS))
+    bucket += f" ELSE {len(PRICE_BUCKETS)} END"
+    sums = ", ".join(f"SUM(amenity_mask & {1 << bit} != 0)" for bit in range(len(AMENITIES)))
+    sql = (
+        f"SELECT lower(property_type), {bucket}, college_nearby, availability_status, COUNT(*), {sums} "
+        f"FROM rooms WHERE {' AND '.join(where)} GROUP BY 1, 2, 3, 4"
+    )
+    return conn.execute(sql, args).fetchall()
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = list(synthetic_rows(args.rooms))
+    start = time.perf_counter()
+    catalog = RoomCatalog.from_rows(rows)
+    print(f"Catalog of {args.rooms:,} rooms built in {time.perf_counter() - start:.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        conn = sqlite3.connect(os.path.join(tmpdir, "bench.db"))
+        conn.execute(
+            "CREATE TABLE rooms (id INTEGER PRIMARY KEY, price INTEGER, property_type TEXT, college_nearby TEXT, "
+            "location TEXT, availability_status TEXT, verified INTEGER, slots INTEGER, amenity_mask INTEGER)"
+        )
+        conn.executemany(
+            "INSERT INTO rooms VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(r["id"], r["price"], r["property_type"], r["college_nearby"], r["location"],
+              r["availability_status"], r["verified"], r["capacity_total"] - r["capacity_occupied"], r["amenity_mask"]) for r in rows],
+        )
+        conn.commit()
+
+        print(f"\n{'filters':<30} {'matches':>8} {'catalog ms':>11} {'sql ms':>9}")
+        for label, params in CASES:
+            filters = catalog_filters(params)
+            total = catalog.facets(catalog.select(filters))["total"]
+            catalog_ms = timed(lambda: catalog.facets(catalog.select(filters)), args.repeat)
+            sql_ms = timed(lambda: sql_facets(conn, params), max(1, args.repeat // 5))
+            print(f"{label:<30} {total:>8} {catalog_ms:>11.2f} {sql_ms:>9.1f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
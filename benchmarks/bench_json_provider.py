@@ -0,0 +1,99 @@
+"""
+Benchmark: JSON response encoding, stdlib vs orjson
+===================================================
+Creates a scratch SQLite database with synthetic rooms and one student
+with many bookings, then times /api/rooms?limit=200 and /api/bookings/my
+with each JSON provider:
+
+* stdlib  - IsoJSONProvider: json.dumps, datetimes through the default
+            hook (the same isoformat() calls to_dict() used to make)
+* orjson  - OrjsonProvider: datetimes encoded natively
+
+"encode ms" is app.json.response() alone on the route's payload; "request
+ms" is the whole request through the test client.
+
+Usage:
+    python benchmarks/bench_json_provider.py
+    python benchmarks/bench_json_provider.py --rooms 20000 --bookings 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def add_student_bookings(app_module, count):
+    with app_module.app.app_context():
+        student = app_module.Student(email="bench@student.in", name="Bench Student", college="IIT Bombay")
+        student.set_password("bench-password")
+        app_module.db.session.add(student)
+        app_module.db.session.flush()
+        now = datetime.utcnow()
+        for room_id in range(1, count + 1):
+            app_module.db.session.add(app_module.Booking(
+                student_id=student.id, room_id=room_id, monthly_rent=8000.0, security_deposit=16000.0,
+                platform_fee=160.0, contract_start_date=date.today(),
+                contract_end_date=date.today() + timedelta(days=330), move_in_date=date.today(),
+                created_at=now - timedelta(hours=room_id), confirmed_at=now,
+            ))
+        app_module.db.session.commit()
+        return student.get_id()
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=5_000)
+    parser.add_argument("--bookings", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        import app as app_module  # creates and seeds the scratch database
+        from benchmarks.bench_room_catalog import load_rooms
+        from json_provider import IsoJSONProvider, OrjsonProvider, orjson
+
+        load_rooms(app_module, args.rooms)
+        user_id = add_student_bookings(app_module, args.bookings)
+        client = app_module.app.test_client()
+        with client.session_transaction() as session:
+            session["_user_id"] = user_id
+            session["_fresh"] = True
+
+        providers = [IsoJSONProvider] + ([OrjsonProvider] if orjson is not None else [])
+        print(f"{args.rooms:,} rooms, {args.bookings} bookings\n")
+        print(f"{'request':<24} {'provider':<8} {'encode ms':>10} {'request ms':>11} {'KB':>7}")
+        for url in ("/api/rooms?limit=200", "/api/bookings/my"):
+            expected = None
+            for provider_class in providers:
+                app_module.app.json = provider_class(app_module.app)
+                request_ms, response = timed(lambda: client.get(url), args.repeat)
+                assert response.status_code == 200, response.status_code
+                payload = response.get_json()
+                if expected is None:
+                    expected = payload
+                assert payload == expected, f"{provider_class.name} output differs"
+                with app_module.app.app_context():
+                    encode_ms, _ = timed(lambda: app_module.app.json.response(payload), args.repeat)
+                print(
+                    f"{url:<24} {provider_class.name:<8} {encode_ms:>10.2f} {request_ms:>11.2f} "
+                    f"{len(response.data) / 1024:>7.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: offset vs cursor (keyset) pagination
+===============================================
+Creates a scratch SQLite database with synthetic rooms and times pages 1,
+100 and 500 of /api/rooms (SQL path, ROOM_CATALOG=off, and the in-memory
+catalog) and /api/rooms/search, fetched by offset/page with the total
+and by cursor without it.
+
+Usage:
+    python benchmarks/bench_keyset.py
+    python benchmarks/bench_keyset.py --rooms 100000 --limit 50
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAGES = (1, 100, 500)
+
+
+def timed(client, url, repeat):
+    client.get(url)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url)
+    assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - start) * 1000 / repeat, response.get_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        import app as app_module  # creates and seeds the scratch database
+        from benchmarks.bench_room_catalog import load_rooms
+
+        load_rooms(app_module, args.rooms)
+        client = app_module.app.test_client()
+        limit = args.limit
+        cases = [
+            ("/api/rooms sql", False, "/api/rooms?fields=card&include_unverified=1&sort={sort}&limit={limit}",
+             "&offset={offset}", "meta"),
+            ("/api/rooms catalog", True, "/api/rooms?fields=card&include_unverified=1&sort={sort}&limit={limit}",
+             "&offset={offset}", "meta"),
+            ("/api/rooms/search", False, "/api/rooms/search?fields=card&per_page={limit}",
+             "&page={page}", None),
+        ]
+
+        print(f"{args.rooms:,} rooms, {limit} per page\n")
+        print(f"{'endpoint':<20} {'sort':<11} {'page':>5} {'offset ms':>10} {'cursor ms':>10}")
+        for label, catalog, base, paging, meta in cases:
+            app_module.ROOM_CATALOG_ENABLED = catalog and app_module.HAS_NUMPY
+            for sort in (("price_asc", "newest") if meta else ("id",)):
+                for page in PAGES:
+                    url = base.format(sort=sort, limit=limit)
+                    offset_ms, _ = timed(client, url + paging.format(offset=(page - 1) * limit, page=page), args.repeat)
+                    if page == 1:
+                        cursor_ms, _ = timed(client, url + "&total=0", args.repeat)
+                    else:
+                        # The cursor of page N is the next_cursor of page N - 1.
+                        previous = client.get(url + paging.format(offset=(page - 2) * limit, page=page - 1)).get_json()
+                        cursor = (previous[meta] if meta else previous)["next_cursor"]
+                        cursor_ms, _ = timed(client, f"{url}&cursor={cursor}", args.repeat)
+                    print(f"{label:<20} {sort:<11} {page:>5} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
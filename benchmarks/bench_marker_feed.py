@@ -0,0 +1,82 @@
+"""
+Benchmark: map marker payloads
+==============================
+Size and encode time for N map markers (ID, lat/lon, price, status) from a
+RoomCatalog snapshot:
+
+* json     - a JSON list of {"id", "lat", "lon", "price", "status"} dicts,
+             the shape /api/rooms/map returns for individual rooms
+* binary   - /api/rooms/markers?format=binary (marker_feed.to_binary)
+* base64   - /api/rooms/markers, JSON with base64 columns
+
+"gzip" is the same payload compressed at level 6, as a proxy would send it.
+
+Usage:
+    python benchmarks/bench_marker_feed.py
+    python benchmarks/bench_marker_feed.py --rooms 200000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_nearby import synthetic_rows
+from marker_feed import decode_binary, encode_columns, to_base64, to_binary
+from room_catalog import RoomCatalog
+
+STATUSES = ("green", "yellow", "red")
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = list(synthetic_rows(args.rooms))
+    for row in rows:
+        row["availability_status"] = STATUSES[row["id"] % 3]
+    catalog = RoomCatalog.from_rows(rows)
+    mask = catalog.select({})
+
+    def as_json():
+        ids, lats, lons, prices, statuses = catalog.markers(mask)
+        points = [
+            {"id": room_id, "lat": lat, "lon": lon, "price": price, "status": STATUSES[status]}
+            for room_id, lat, lon, price, status in zip(
+                ids.tolist(), lats.tolist(), lons.tolist(), prices.tolist(), statuses.tolist()
+            )
+        ]
+        return json.dumps(points, separators=(",", ":")).encode("utf-8")
+
+    def as_binary():
+        return to_binary(*encode_columns(*catalog.markers(mask)))
+
+    def as_base64():
+        return json.dumps(to_base64(*encode_columns(*catalog.markers(mask))), separators=(",", ":")).encode("utf-8")
+
+    header, values = decode_binary(as_binary())
+    assert header["count"] == args.rooms and sorted(values["id"]) == list(range(1, args.rooms + 1))
+
+    print(f"{args.rooms:,} markers\n")
+    print(f"{'format':<8} {'encode ms':>10} {'KB':>8} {'gzip KB':>8}")
+    for name, fn in (("json", as_json), ("binary", as_binary), ("base64", as_base64)):
+        ms, payload = timed(fn, args.repeat)
+        print(f"{name:<8} {ms:>10.1f} {len(payload) / 1024:>8.0f} {len(gzip.compress(payload, 6)) / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
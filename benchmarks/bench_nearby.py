@@ -0,0 +1,126 @@
+"""
+Benchmark: radius search over room coordinates
+==============================================
+Times /api/rooms/nearby's work (find rooms within r km, exact haversine
+distances, nearest-first page of 50) over synthetic rooms spread across
+greater Mumbai:
+
+* catalog  - RoomCatalog.nearby(): k-d tree candidates + vectorized haversine
+* scan     - vectorized haversine over every row (no spatial index)
+* geohash  - the SQL fallback: geohash prefix ranges on a B-tree index in a
+             scratch SQLite database, haversine in Python
+
+Usage:
+    python benchmarks/bench_nearby.py
+    python benchmarks/bench_nearby.py --rooms 200000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from geo import distances_km, geohash_cover, geohash_encode, geohash_prefix_range, haversine_km
+from room_catalog import RoomCatalog
+
+# (lat, lon) of a few dense areas; rooms cluster around them.
+HUBS = [(19.1176, 72.9060), (19.1363, 72.8277), (19.0330, 73.0297), (19.0178, 72.8478), (19.2183, 72.9781)]
+CENTER = (19.1176, 72.9060)  # Powai
+RADII_KM = [0.5, 2, 5]
+
+
+def synthetic_rows(count):
+    rng = random.Random(13)
+    for room_id in range(1, count + 1):
+        lat, lon = rng.choice(HUBS)
+        yield {
+            "id": room_id,
+            "price": rng.randrange(3000, 30000, 500),
+            "property_type": "PG",
+            "college_nearby": "",
+            "location": "",
+            "availability_status": "yellow",
+            "verified": True,
+            "capacity_total": 2,
+            "capacity_occupied": 0,
+            "created_at": None,
+            "latitude": rng.gauss(lat, 0.04),
+            "longitude": rng.gauss(lon, 0.04),
+            "amenity_mask": 0,
+        }
+
+
+def scan(catalog, mask, lat, lon, radius_km, limit=50):
+    rows = np.flatnonzero(mask)
+    distances = distances_km(lat, lon, catalog.latitude[rows], catalog.longitude[rows])
+    inside = distances <= radius_km
+    rows, distances = rows[inside], distances[inside]
+    order = np.lexsort((catalog.ids[rows], distances))[:limit]
+    return len(rows), catalog.ids[rows[order]].tolist()
+
+
+def geohash_query(conn, lat, lon, radius_km, limit=50):
+    cells = geohash_cover(lat, lon, radius_km)
+    where = " OR ".join("geohash BETWEEN ? AND ?" for _ in cells)
+    args = [bound for cell in cells for bound in geohash_prefix_range(cell)]
+    matches = []
+    for room_id, room_lat, room_lon in conn.execute(f"SELECT id, latitude, longitude FROM rooms WHERE {where}", args):
+        distance = haversine_km(lat, lon, room_lat, room_lon)
+        if distance <= radius_km:
+            matches.append((distance, room_id))
+    matches.sort()
+    return len(matches), [room_id for _, room_id in matches[:limit]]
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = list(synthetic_rows(args.rooms))
+    start = time.perf_counter()
+    catalog = RoomCatalog.from_rows(rows)
+    print(f"Catalog of {args.rooms:,} rooms built in {time.perf_counter() - start:.2f}s")
+    mask = catalog.select({})
+    start = time.perf_counter()
+    catalog.nearby(mask, *CENTER, 1, 0, 1)
+    print(f"k-d tree built in {time.perf_counter() - start:.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        conn = sqlite3.connect(os.path.join(tmpdir, "bench.db"))
+        conn.execute("CREATE TABLE rooms (id INTEGER PRIMARY KEY, latitude REAL, longitude REAL, geohash TEXT)")
+        conn.executemany(
+            "INSERT INTO rooms VALUES (?, ?, ?, ?)",
+            [(r["id"], r["latitude"], r["longitude"], geohash_encode(r["latitude"], r["longitude"])) for r in rows],
+        )
+        conn.execute("CREATE INDEX ix_rooms_geohash ON rooms (geohash)")
+        conn.commit()
+
+        print(f"\n{'radius':<8} {'matches':>8} {'catalog ms':>11} {'scan ms':>8} {'geohash ms':>11}")
+        for radius in RADII_KM:
+            catalog_ms, (total, ids, _) = timed(lambda: catalog.nearby(mask, *CENTER, radius, 0, 50), args.repeat)
+            scan_ms, expected = timed(lambda: scan(catalog, mask, *CENTER, radius), max(1, args.repeat // 4))
+            sql_ms, from_sql = timed(lambda: geohash_query(conn, *CENTER, radius), max(1, args.repeat // 4))
+            same = (total, ids) == expected == from_sql
+            print(f"{radius:<8g} {total:>8} {catalog_ms:>11.2f} {scan_ms:>8.1f} {sql_ms:>11.1f}{'' if same else '  MISMATCH'}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: /api/rooms through the RoomCatalog vs the SQL path
+=============================================================
+Creates a scratch SQLite database, loads synthetic rooms, and times
+/api/rooms requests end to end (filtering, sorting, count, hydration and
+JSON) with the in-memory catalog enabled and disabled.
+
+Usage:
+    python benchmarks/bench_room_catalog.py
+    python benchmarks/bench_room_catalog.py --rooms 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CASES = [
+    "limit=50",
+    "limit=50&sort=newest",
+    "limit=50&sort=price_desc&property_type=pg",
+    "limit=50&max_rent=9000&min_available=2",
+    "limit=50&sort=slots_desc&college=iit",
+    "limit=50&offset=5000&sort=price_asc",
+    "limit=50&sort=distance&college_id=1",
+    "limit=50&college_id=1&within_km=3",
+]
+
+
+def load_rooms(app_module, count):
+    from benchmarks.bench_search_index import synthetic_rooms
+    from amenities import AMENITIES, amenity_mask
+
+    rng = random.Random(5)
+    now = datetime.utcnow()
+    table = app_module.Room.__table__
+    with app_module.app.app_context():
+        with app_module.db.engine.begin() as conn:
+            batch = []
+            for _, (title, location, college) in synthetic_rooms(count):
+                amenities = ",".join(rng.sample(AMENITIES, 4))
+                total = rng.randint(1, 4)
+                created = now - timedelta(minutes=rng.randint(0, 500_000))
+                batch.append({
+                    "title": title, "price": rng.randrange(3000, 30000, 500), "location": location,
+                    "college_nearby": college, "amenities": amenities, "amenity_mask": amenity_mask(amenities),
+                    "property_type": rng.choice(["pg", "hostel", "flat", "shared"]),
+                    "capacity_total": total, "capacity_occupied": rng.randint(0, total),
+                    "verified": rng.random() < 0.9, "availability_status": "yellow",
+                    "latitude": 19.0 + rng.random() / 5, "longitude": 72.8 + rng.random() / 5,
+                    "created_at": created, "updated_at": created,
+                })
+                if len(batch) == 5000:
+                    conn.execute(table.insert(), batch)
+                    batch = []
+            if batch:
+                conn.execute(table.insert(), batch)
+        # Core inserts skip the Room write hooks.
+        app_module.backfill_college_distances()
+
+
+def timed(client, url, repeat):
+    client.get(url)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url)
+    assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - start) * 1000 / repeat, response.get_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        import app as app_module  # creates and seeds the scratch database
+
+        start = time.perf_counter()
+        load_rooms(app_module, args.rooms)
+        print(f"Loaded {args.rooms:,} rooms in {time.perf_counter() - start:.1f}s")
+
+        client = app_module.app.test_client()
+        with app_module.app.app_context():
+            start = time.perf_counter()
+            app_module.get_room_catalog()
+            print(f"Catalog built in {time.perf_counter() - start:.2f}s\n")
+
+        print(f"{'request':<45} {'sql ms':>8} {'catalog ms':>11}")
+        for case in CASES:
+            url = f"/api/rooms?{case}"
+            app_module.ROOM_CATALOG_ENABLED = False
+            sql_ms, expected = timed(client, url, max(1, args.repeat // 4))
+            app_module.ROOM_CATALOG_ENABLED = True
+            catalog_ms, got = timed(client, url, args.repeat)
+            same = [r["id"] for r in got["rooms"]] == [r["id"] for r in expected["rooms"]]
+            print(f"{case:<45} {sql_ms:>8.1f} {catalog_ms:>11.1f}{'' if same else '  MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: full room payloads vs fields=card
+============================================
+Creates a scratch SQLite database with synthetic rooms and times list
+endpoints end to end (query, serialization, JSON) returning the full
+Room.to_dict() and the fields=card projection, with response sizes.
+
+Usage:
+    python benchmarks/bench_room_fields.py
+    python benchmarks/bench_room_fields.py --rooms 50000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CASES = [
+    "/api/rooms?limit=50",
+    "/api/rooms?limit=50&sort=newest",
+    "/api/rooms/search?per_page=50",
+    "/api/rooms/by-status/yellow",
+]
+
+
+def timed(client, url, repeat):
+    client.get(url)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url)
+    assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - start) * 1000 / repeat, response.data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        import app as app_module  # creates and seeds the scratch database
+        from benchmarks.bench_room_catalog import load_rooms
+
+        load_rooms(app_module, args.rooms)
+        client = app_module.app.test_client()
+
+        print(f"{args.rooms:,} rooms\n")
+        print(f"{'request':<34} {'full ms':>8} {'card ms':>8} {'full KB':>8} {'card KB':>8}")
+        for url in CASES:
+            repeat = max(1, args.repeat // 10) if "by-status" in url else args.repeat
+            full_ms, full = timed(client, url, repeat)
+            card_ms, card = timed(client, f"{url}{'&' if '?' in url else '?'}fields=card", repeat)
+            print(f"{url:<34} {full_ms:>8.1f} {card_ms:>8.1f} {len(full) / 1024:>8.1f} {len(card) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: Room.to_dict() with and without the image path memo
+==============================================================
+Serializes a page of in-memory rooms whose images are a mix of files in
+static/images, names that resolve nowhere and absolute URLs, inside a
+request context like /api/rooms does. Compares:
+
+* uncached - every call probes static/, static/images, static/uploads
+             (the old behaviour: up to three os.path.exists per room)
+* memo     - room_image_url() resolves each image name once per process
+
+Usage:
+    python benchmarks/bench_room_to_dict.py
+    python benchmarks/bench_room_to_dict.py --rooms 5000 --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class _NoMemo(dict):
+    """Stand-in for the memo dict that never keeps anything."""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+def make_rooms(app_module, count):
+    now = datetime.utcnow()
+    images = ["hero.jpg", "room_{}.jpg", "https://images.unsplash.com/photo-1555854877-bab0e564b8d5?w=600"]
+    return [
+        app_module.Room(
+            id=room_id, title=f"Room {room_id}", price=8000, location="Powai, Mumbai", college_nearby="IIT Bombay",
+            property_type="pg", amenities="WiFi,AC,Laundry", images=images[room_id % 3].format(room_id % 50),
+            verified=True, capacity_total=2, capacity_occupied=1, latitude=19.1, longitude=72.9,
+            created_at=now, updated_at=now,
+        )
+        for room_id in range(1, count + 1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=50, help="rooms per page")
+    parser.add_argument("--repeat", type=int, default=2000, help="pages serialized")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        import app as app_module
+
+        rooms = make_rooms(app_module, args.rooms)
+        probes = [0]
+        exists = os.path.exists
+
+        def counting_exists(path):
+            probes[0] += 1
+            return exists(path)
+
+        app_module.os.path.exists = counting_exists
+        memo = app_module._static_image_paths
+        results = {}
+        with app_module.app.test_request_context("/api/rooms"):
+            for name, paths in (("uncached", _NoMemo()), ("memo", memo)):
+                app_module._static_image_paths = paths
+                app_module.forget_static_images()
+                payloads = [room.to_dict() for room in rooms]
+                probes[0] = 0
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    payloads = [room.to_dict() for room in rooms]
+                elapsed = time.perf_counter() - start
+                results[name] = payloads
+                print(
+                    f"{name:<9} {args.repeat * args.rooms / elapsed:>10,.0f} rooms/s  "
+                    f"{elapsed * 1000 / args.repeat:>6.2f} ms/page  "
+                    f"{probes[0] / (args.repeat * args.rooms):.2f} os.path.exists/room"
+                )
+        app_module.os.path.exists = exists
+        app_module._static_image_paths = memo
+        assert results["uncached"] == results["memo"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: SearchTrie vs CompactSearchIndex
+===========================================
+Builds each autocomplete index over synthetic rooms and reports build time,
+resident memory, single-prefix latency and multi-word query latency.
+
+Each (index, size) pair runs in a fresh subprocess so RSS numbers are not
+polluted by earlier runs.
+
+Usage:
+    python benchmarks/bench_search_index.py
+    python benchmarks/bench_search_index.py --sizes 10000 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_engine import create_search_index
+
+AREAS = [
+    "Andheri", "Powai", "Vile Parle", "Bandra", "Kurla", "Ghatkopar", "Chembur",
+    "Dadar", "Matunga", "Sion", "Vikhroli", "Mulund", "Thane", "Vashi", "Nerul",
+    "Kharghar", "Borivali", "Malad", "Goregaon", "Juhu", "Santacruz", "Colaba",
+]
+COLLEGES = [
+    "IIT Bombay", "VJTI", "DJ Sanghvi College of Engineering", "KJ Somaiya",
+    "Sardar Patel Institute of Technology", "Thadomal Shahani Engineering College",
+    "Fr. Conceicao Rodrigues College", "NMIMS", "Vidyalankar Institute",
+    "Rizvi College of Engineering", "Atharva College", "Xavier Institute",
+]
+KINDS = ["PG", "Hostel", "Residency", "Apartment", "Rooms", "Stay", "House"]
+SYLLABLES = ["ka", "ri", "sha", "van", "dra", "mo", "lin", "tu", "pa", "nee", "ja", "ksh", "ram", "dev"]
+
+
+def synthetic_rooms(count, seed=42):
+    """Yield (room_id, (title, location, college)) tuples."""
+    rng = random.Random(seed)
+    for room_id in range(1, count + 1):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+        area = rng.choice(AREAS)
+        title = f"{name} {rng.choice(KINDS)} {area}"
+        location = f"{area} {rng.choice(['East', 'West'])}, Mumbai"
+        yield room_id, (title, location, rng.choice(COLLEGES))
+
+
+def rss_kb():
+    """Current resident set size in KiB (Linux /proc, ru_maxrss fallback)."""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_case(mode, size):
+    rooms = list(synthetic_rooms(size))
+    baseline = rss_kb()
+
+    start = time.perf_counter()
+    index = create_search_index(mode)
+    for room_id, texts in rooms:
+        index.insert_room(room_id, texts)
+    build_s = time.perf_counter() - start
+
+    rss_mb = (rss_kb() - baseline) / 1024
+
+    prefixes = ["p", "po", "pow", "san", "sardar", "iit", "ka", "hostel"]
+    start = time.perf_counter()
+    for _ in range(20):
+        for prefix in prefixes:
+            index.search(prefix)
+    query_ms = (time.perf_counter() - start) * 1000 / (20 * len(prefixes))
+
+    phrases = ["sardar pat", "powai east", "andheri west mumbai", "iit bombay p", "kurla pg", "somaiya hostel k"]
+    start = time.perf_counter()
+    for _ in range(20):
+        for phrase in phrases:
+            index.search_query(phrase)
+    multi_ms = (time.perf_counter() - start) * 1000 / (20 * len(phrases))
+
+    return {
+        "mode": mode, "size": size, "build_s": build_s, "rss_mb": rss_mb,
+        "query_ms": query_ms, "multi_ms": multi_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--modes", nargs="+", default=["trie", "compact"])
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(args.child[0], int(args.child[1]))))
+        return
+
+    print(f"{'rooms':>10} {'mode':>8} {'build (s)':>10} {'RSS (MB)':>10} {'query (ms)':>11} {'multi (ms)':>11}")
+    print("-" * 65)
+    for size in args.sizes:
+        for mode in args.modes:
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, str(size)],
+                check=True, capture_output=True, text=True,
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{r['size']:>10,} {r['mode']:>8} {r['build_s']:>10.2f} {r['rss_mb']:>10.1f} {r['query_ms']:>11.3f} {r['multi_ms']:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
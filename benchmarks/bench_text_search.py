@@ -0,0 +1,123 @@
+"""
+Benchmark: ILIKE scan vs indexed text search
+============================================
+Loads synthetic rooms into a scratch database and times the `q` filter of
+/api/rooms (count + first page) with the ILIKE fallback and with the
+database's full-text backend (FTS5 on SQLite, tsvector + GIN on Postgres).
+
+Usage:
+    python benchmarks/bench_text_search.py
+    python benchmarks/bench_text_search.py --rooms 200000
+    python benchmarks/bench_text_search.py --url postgresql://localhost/roomies_bench
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Boolean, Column, Integer, MetaData, String, Table, create_engine, func, select
+
+from benchmarks.bench_search_index import synthetic_rooms
+from text_search import LikeTextSearch, install_text_search
+
+AMENITIES = ["WiFi", "AC", "Laundry", "Security", "Meals", "Gym", "Parking", "Housekeeping"]
+QUERIES = ["powai", "iit bombay", "sardar patel", "kharghar hostel", "andheri west", "zzznomatch"]
+COLUMNS = ("title", "location", "college_nearby")
+
+
+def rooms_table(metadata):
+    return Table(
+        "rooms", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("title", String(255), nullable=False),
+        Column("price", Integer, nullable=False),
+        Column("location", String(255), nullable=False),
+        Column("college_nearby", String(255), nullable=False),
+        Column("amenities", String(255)),
+        Column("verified", Boolean, default=True),
+    )
+
+
+def load_rooms(engine, table, count):
+    rng = random.Random(7)
+    with engine.begin() as conn:
+        batch = []
+        for room_id, (title, location, college) in synthetic_rooms(count):
+            batch.append({
+                "id": room_id,
+                "title": title,
+                "price": rng.randrange(4000, 30000, 500),
+                "location": location,
+                "college_nearby": college,
+                "amenities": ", ".join(rng.sample(AMENITIES, 4)),
+                "verified": True,
+            })
+            if len(batch) == 5000:
+                conn.execute(table.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(table.insert(), batch)
+
+
+def time_query(engine, table, search, q, repeat):
+    condition = search.condition(q, COLUMNS)
+    count_stmt = select(func.count()).select_from(table).where(table.c.verified.is_(True), condition)
+    page_stmt = (
+        select(table).where(table.c.verified.is_(True), condition)
+        .order_by(table.c.price, table.c.id).limit(50)
+    )
+    with engine.connect() as conn:
+        total = conn.execute(count_stmt).scalar()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(count_stmt).scalar()
+            conn.execute(page_stmt).all()
+    return total, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--url", help="database URL (default: scratch SQLite file); its rooms table is dropped")
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    engine = create_engine(url)
+    metadata = MetaData()
+    table = rooms_table(metadata)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    start = time.perf_counter()
+    load_rooms(engine, table, args.rooms)
+    print(f"Loaded {args.rooms:,} rooms in {time.perf_counter() - start:.1f}s ({engine.dialect.name})")
+
+    like = LikeTextSearch(table)
+    start = time.perf_counter()
+    indexed = install_text_search(engine, table)
+    print(f"Built {indexed.name} index in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'query':<18} {'matches':>8} {'like ms':>9} {indexed.name + ' ms':>10} {'speedup':>8}")
+    for q in QUERIES:
+        like_total, like_ms = time_query(engine, table, like, q, args.repeat)
+        total, ms = time_query(engine, table, indexed, q, args.repeat)
+        note = "" if total == like_total else f"  (like: {like_total})"
+        print(f"{q:<18} {total:>8} {like_ms:>9.2f} {ms:>10.2f} {like_ms / ms:>7.1f}x{note}")
+
+    engine.dispose()
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Response compression.
+
+* ``CompressionMiddleware`` gzip/brotli-encodes dynamic responses (JSON,
+  HTML, the binary marker feed) per the client's Accept-Encoding. Bodies
+  of known length are compressed in one go and keep a Content-Length;
+  streamed bodies (no Content-Length) are compressed chunk by chunk with
+  a sync flush after each chunk, so they still arrive incrementally.
+  Responses under ``min_size`` bytes, already-encoded responses and
+  partial content pass through untouched.
+* Static files are served from ``.br`` / ``.gz`` siblings written ahead
+  of time by ``precompress_static()`` (``python compression.py``), so
+  they cost no compression CPU per request. A file without an up-to-date
+  sibling falls back to the middleware.
+
+Brotli needs the ``brotli`` (or ``brotlicffi``) package; without it
+responses are gzip-encoded and only the build step's ``.br`` files are
+skipped. Serving existing ``.br`` siblings needs no package at all.
+
+Usage:
+    python compression.py            # precompress ./static
+    python compression.py --force    # rewrite every sibling
+"""
+
+import argparse
+import gzip
+import logging
+import mimetypes
+import os
+import zlib
+
+from flask import request, send_from_directory
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+from werkzeug.security import safe_join
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:  # gzip only
+        brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Sibling file suffix per Content-Encoding, in order of preference.
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+DEFAULT_MIN_SIZE = 1024
+# Known-length bodies up to this size are compressed whole so the response
+# keeps a Content-Length; larger ones are streamed.
+BUFFER_LIMIT = 1024 * 1024
+# Per-request levels favour speed; the build step can afford the maximum.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Precompressed siblings are only kept if they save at least this much.
+MIN_SAVING = 0.1
+
+COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/octet-stream",  # /api/rooms/markers: delta-coded ints
+    "application/xml",
+    "image/svg+xml",
+    "image/x-icon",
+}
+
+
+def compressible(mimetype):
+    mimetype = (mimetype or "").split(";", 1)[0].strip().lower()
+    return (
+        mimetype.startswith("text/")
+        or mimetype in COMPRESSIBLE_TYPES
+        or mimetype.endswith(("+json", "+xml"))
+    )
+
+
+def available_encodings(mode="auto"):
+    """Content-Encodings for dynamic responses under mode ("auto", "gzip"
+    or "off"), most preferred first."""
+    if mode == "off":
+        return ()
+    if mode == "auto" and brotli is not None:
+        return ("br", "gzip")
+    return ("gzip",)
+
+
+def choose_encoding(accept_encoding, encodings):
+    """The first of encodings with the highest non-zero quality in the
+    Accept-Encoding header, or None for identity."""
+    if not accept_encoding or not encodings:
+        return None
+    qualities = {value.lower(): quality for value, quality in parse_accept_header(accept_encoding)}
+    wildcard = qualities.get("*", 0)
+    best = max(encodings, key=lambda encoding: qualities.get(encoding, wildcard))
+    return best if qualities.get(best, wildcard) > 0 else None
+
+
+def compress(data, encoding, precompress=False):
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if precompress else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if precompress else GZIP_LEVEL, mtime=0)
+
+
+def _compressor(encoding):
+    """(compress chunk and sync-flush, finish) for a streamed body."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+
+def _weaken(headers):
+    # An encoded body is a different byte sequence, so a strong validator
+    # of the identity body no longer applies to it.
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+class CompressionMiddleware:
+    """WSGI middleware compressing responses for clients that accept it."""
+
+    def __init__(self, wsgi_app, encodings=("gzip",), min_size=DEFAULT_MIN_SIZE):
+        self.wsgi_app = wsgi_app
+        self.encodings = tuple(encodings)
+        self.min_size = min_size
+
+    def __call__(self, environ, start_response):
+        encoding = None
+        if environ.get("REQUEST_METHOD") != "HEAD":
+            encoding = choose_encoding(environ.get("HTTP_ACCEPT_ENCODING"), self.encodings)
+        started = []
+        written = []
+
+        def capture(status, headers, exc_info=None):
+            started[:] = [status, headers, exc_info]
+            return written.append
+
+        app_iter = self.wsgi_app(environ, capture)
+        chunks = iter(app_iter)
+        if not started:  # start_response deferred until the first chunk
+            for chunk in chunks:
+                written.append(chunk)
+                if started:
+                    break
+        status, header_list, exc_info = started
+        headers = Headers(header_list)
+        code = int(status.split(" ", 1)[0])
+        body = _chain(written, chunks)
+
+        if code == 304:
+            if encoding is not None:
+                _weaken(headers)
+        elif (
+            compressible(headers.get("Content-Type"))
+            and "Content-Encoding" not in headers
+            and code >= 200
+            and code not in (204, 206)
+            and "no-transform" not in headers.get("Cache-Control", "")
+        ):
+            _add_vary(headers)
+            length = headers.get("Content-Length", type=int)
+            if encoding is not None and (length is None or length >= self.min_size):
+                headers["Content-Encoding"] = encoding
+                _weaken(headers)
+                if length is not None and length <= BUFFER_LIMIT:
+                    data = compress(b"".join(body), encoding)
+                    headers["Content-Length"] = str(len(data))
+                    body = [data]
+                else:
+                    headers.pop("Content-Length", None)
+                    body = _compress_stream(body, encoding)
+
+        start_response(status, headers.to_wsgi_list(), exc_info)
+        close = getattr(app_iter, "close", None)
+        return ClosingIterator(body, [close] if close is not None else None)
+
+
+def _chain(head, rest):
+    yield from head
+    yield from rest
+
+
+def _compress_stream(chunks, encoding):
+    process, finish = _compressor(encoding)
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def _add_vary(headers):
+    vary = [value.strip() for value in headers.get("Vary", "").split(",") if value.strip()]
+    if "accept-encoding" not in {value.lower() for value in vary} and "*" not in vary:
+        headers["Vary"] = ", ".join(vary + ["Accept-Encoding"])
+
+
+def precompressed_static_view(app):
+    """A replacement for Flask's static view that sends a file's .br/.gz
+    sibling when the client accepts it and it was built from the current file."""
+
+    def static(filename):
+        path = safe_join(app.static_folder, filename)
+        encoding = None
+        if path is not None and os.path.isfile(path):
+            accepted = [
+                encoding for encoding, suffix in SUFFIXES.items()
+                if _is_fresh(path + suffix, path)
+            ]
+            encoding = choose_encoding(request.headers.get("Accept-Encoding"), accepted)
+        if encoding is None:
+            return app.send_static_file(filename)
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response = send_from_directory(
+            app.static_folder, filename + SUFFIXES[encoding], mimetype=mimetype,
+            max_age=app.get_send_file_max_age(filename),
+        )
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
+
+    return static
+
+
+def _is_fresh(sibling, path):
+    # Siblings are stamped with their source's mtime, so any later edit of
+    # the source (even within the same clock tick) makes them stale.
+    try:
+        return os.stat(sibling).st_mtime_ns == os.stat(path).st_mtime_ns
+    except OSError:
+        return False
+
+
+def install_compression(app, mode="auto", min_size=DEFAULT_MIN_SIZE):
+    """Compress app's responses under mode ("auto": brotli when installed
+    and gzip, "gzip", or "off") and serve precompressed static files.
+    Returns the dynamic encodings in use."""
+    encodings = available_encodings(mode)
+    if not encodings:
+        return encodings
+    if app.has_static_folder:
+        app.view_functions["static"] = precompressed_static_view(app)
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, encodings, min_size)
+    return encodings
+
+
+def precompress_static(folder, force=False, min_size=DEFAULT_MIN_SIZE):
+    """Write .gz (and, with brotli installed, .br) siblings for the
+    compressible files under folder. Up-to-date siblings are kept unless
+    force; a sibling that would not save MIN_SAVING is removed instead.
+    Returns the number of siblings written."""
+    encodings = [encoding for encoding in SUFFIXES if encoding != "br" or brotli is not None]
+    written = 0
+    for directory, _, names in os.walk(folder):
+        for name in names:
+            if name.endswith(tuple(SUFFIXES.values())) or not compressible(mimetypes.guess_type(name)[0]):
+                continue
+            path = os.path.join(directory, name)
+            if os.path.getsize(path) < min_size:
+                continue
+            data = None
+            for encoding in encodings:
+                sibling = path + SUFFIXES[encoding]
+                if not force and _is_fresh(sibling, path):
+                    continue
+                if data is None:
+                    with open(path, "rb") as source:
+                        data = source.read()
+                compressed = compress(data, encoding, precompress=True)
+                if len(compressed) > len(data) * (1 - MIN_SAVING):
+                    if os.path.exists(sibling):
+                        os.remove(sibling)
+                    continue
+                tmp = f"{sibling}.tmp{os.getpid()}"
+                with open(tmp, "wb") as out:
+                    out.write(compressed)
+                source_stat = os.stat(path)
+                os.utime(tmp, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+                os.replace(tmp, sibling)
+                written += 1
+                logger.info("%s: %d -> %d bytes", sibling, len(data), len(compressed))
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", nargs="?", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "static"))
+    parser.add_argument("--force", action="store_true", help="rewrite up-to-date siblings too")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if brotli is None:
+        logger.warning("brotli is not installed; writing .gz siblings only")
+    written = precompress_static(args.folder, force=args.force)
+    print(f"wrote {written} precompressed files under {args.folder}")
+
+
+if __name__ == "__main__":
+    main()
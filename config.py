@@ -15,3 +15,13 @@ MAIL_PASSWORD = ""
 
 # Pagination
 ITEMS_PER_PAGE = 50
+
+# Search
+SEARCH_INDEX_MODE = "trie"  # "trie", "compact" (sorted word list + array postings) or "shared" (mmap snapshot)
+SEARCH_INDEX_DIR = None  # shared mode snapshot directory; defaults to <instance>/search_index
+TEXT_SEARCH_BACKEND = "auto"  # "auto" (FTS5 on SQLite, tsvector on Postgres), "fts5", "tsvector" or "like"
+ROOM_CATALOG = "auto"  # in-memory NumPy catalog for /api/rooms and /api/rooms/facets; "off" to always use SQL
+ROOM_COUNT_CACHE = "on"  # cached /api/rooms totals on the SQL path, refreshed in the background; "off" to count every request
+JSON_PROVIDER = "auto"  # "auto" (orjson if installed), "orjson" or "stdlib"
+RESPONSE_COMPRESSION = "auto"  # "auto" (brotli if installed, else gzip), "gzip" or "off"
+COMPRESSION_MIN_SIZE = 1024  # bytes; smaller dynamic responses are sent uncompressed
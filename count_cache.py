@@ -0,0 +1,136 @@
+"""
+Cached result counts for filtered room queries.
+
+A page of /api/rooms is a LIMIT query, but its total is a COUNT(*) over
+every match with the same ILIKE / full-text predicates, which roughly
+doubles the database work of a search. ``CountCache`` keeps those counts
+keyed by the normalized filter set and stamped with the version of the
+tables they read (see TableVersion in app.py):
+
+* an entry at the current version is served as is ("cached", exact);
+* an entry from an older version is served at once ("stale") while a
+  background thread recounts it, unless it is older than ``max_stale``;
+* a missing entry is counted in the request ("exact").
+
+The refresher thread also recounts the most requested entries as soon as
+the version moves, so popular searches rarely see anything but "cached".
+It starts on first use, so it is created in each gunicorn worker rather
+than inherited across a fork.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("filters", "total", "version", "counted_at", "hits")
+
+    def __init__(self, filters, total, version):
+        self.filters = filters
+        self.total = total
+        self.version = version
+        self.counted_at = time.monotonic()
+        self.hits = 1
+
+
+class CountCache:
+    """count(filters) -> int runs the query; version() -> hashable is the
+    current version of the tables it reads. Both are called from the
+    refresher thread too, inside context() when given (e.g.
+    app.app_context)."""
+
+    def __init__(self, count, version, context=None, max_entries=1024, refresh_interval=5.0,
+                 refresh_batch=32, max_stale=60.0):
+        self.count = count
+        self.version = version
+        self.context = context or nullcontext
+        self.max_entries = max_entries
+        self.refresh_interval = refresh_interval
+        self.refresh_batch = refresh_batch
+        self.max_stale = max_stale
+        self._entries = OrderedDict()  # key -> _Entry, least recently used first
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker = None
+        self.counts = 0  # COUNT queries run, in requests and in the background
+
+    def get(self, key, filters, count_missing=True):
+        """(total, "exact" | "cached" | "stale") for the filters under key.
+
+        Without count_missing, a miss (or a stale entry past max_stale)
+        returns (None, None) instead of counting.
+        """
+        self._ensure_worker()
+        version = self.version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                total, entry_version, counted_at = entry.total, entry.version, entry.counted_at
+        if entry is not None:
+            if entry_version == version:
+                return total, "cached"
+            if time.monotonic() - counted_at < self.max_stale:
+                self._wake.set()
+                return total, "stale"
+        if not count_missing:
+            return None, None
+        return self._recount(key, filters, version), "exact"
+
+    def _recount(self, key, filters, version):
+        # version is read before counting: a write landing during the count
+        # leaves the entry marked old, to be recounted.
+        total = self.count(filters)
+        self.counts += 1
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = _Entry(filters, total, version)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                entry.total, entry.version, entry.counted_at = total, version, time.monotonic()
+        return total
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # -- background refresher -------------------------------------------------
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="count-cache-refresher", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            try:
+                with self.context():
+                    self.refresh()
+            except Exception:
+                logger.exception("Count cache refresh failed")
+
+    def refresh(self):
+        """Recount the most requested entries that are behind the current
+        version; returns how many were recounted. Request counts halve on
+        every call, so "most requested" means recently."""
+        version = self.version()
+        with self._lock:
+            behind = [(key, entry) for key, entry in self._entries.items() if entry.version != version and entry.hits]
+            behind.sort(key=lambda item: item[1].hits, reverse=True)
+            for entry in self._entries.values():
+                entry.hits //= 2
+        for key, entry in behind[:self.refresh_batch]:
+            self._recount(key, entry.filters, version)
+        return len(behind[:self.refresh_batch])
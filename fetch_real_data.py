@@ -1,24 +1,29 @@
 import csv
 import json
+import os
 import time
 import requests
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
+from sqlalchemy import create_engine
 
-# Initialize Geocoder
-geolocator = Nominatim(user_agent="roomies_demo_fetcher")
+from services.geocoding_service import GeocodingService
+
+# Geocoder with a cache that persists across runs; rate limited to the
+# Nominatim usage policy of one request per second.
+os.makedirs("instance", exist_ok=True)
+geocoding = GeocodingService(create_engine("sqlite:///instance/geocode_cache.db"), min_interval=1.0)
+geocoding.seed()
 
 def get_coordinates(college_name, city, area):
     """Fetch coordinates for a college."""
     search_query = f"{college_name}, {area}, {city}"
     try:
-        location = geolocator.geocode(search_query)
+        location = geocoding.geocode(search_query, timeout=None)
         if location:
             return location.latitude, location.longitude
         
         # Fallback: Try just College Name and City
         search_query = f"{college_name}, {city}"
-        location = geolocator.geocode(search_query)
+        location = geocoding.geocode(search_query, timeout=None)
         if location:
             return location.latitude, location.longitude
             
@@ -103,7 +108,7 @@ def main():
             else:
                 print(f"  Could not find location for {name}")
             
-            # Be nice to the APIs
+            # Be nice to Overpass (geocoding paces itself)
             time.sleep(1.5)
 
     # Save to JSON
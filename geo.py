@@ -0,0 +1,210 @@
+"""
+Geospatial helpers for radius search over room coordinates.
+
+Two indexes answer "rooms within r km of a point":
+
+* In the database, ``rooms.geohash`` (B-tree indexed) turns the circle into
+  a few dozen prefix range scans: the geohash cells covering its bounding
+  box. Used when NumPy / the catalog is unavailable.
+* In process, ``KDTree`` is a static k-d tree over 3-D unit vectors, where
+  straight-line (chord) distance is monotonic in great-circle distance, so
+  a radius query is an exact ball query with no longitude wrap-around or
+  latitude distortion. RoomCatalog keeps one over its coordinate columns.
+
+Both return candidates; exact distances come from a vectorized haversine.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # the geohash helpers work without NumPy
+    np = None
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9  # ~5 m cells, stored in rooms.geohash
+MAX_RADIUS_KM = 50.0
+MAX_COVER_CELLS = 48  # index range scans per SQL radius query
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def valid_coordinates(lat, lon):
+    return (
+        lat is not None and lon is not None
+        and math.isfinite(lat) and math.isfinite(lon)
+        and -90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0
+    )
+
+
+def geohash_encode(lat, lon, precision=GEOHASH_PRECISION):
+    """Geohash of a point, or None if the coordinates are missing or invalid."""
+    if not valid_coordinates(lat, lon):
+        return None
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    chars = []
+    bits = value = 0
+    even = True  # bits alternate longitude, latitude, starting with longitude
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                value, lon_lo = value * 2 + 1, mid
+            else:
+                value, lon_hi = value * 2, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                value, lat_lo = value * 2 + 1, mid
+            else:
+                value, lat_hi = value * 2, mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def geohash_cell_size(precision):
+    """(height, width) in degrees of a geohash cell at precision."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def geohash_cover(lat, lon, radius_km, max_cells=MAX_COVER_CELLS):
+    """Geohash prefixes whose cells together contain the circle.
+
+    Uses the finest precision at which the circle's bounding box needs no
+    more than max_cells cells, so each query is a handful of index range
+    scans over little more than the box itself. [""] means "everything".
+    """
+    km_per_deg = math.pi * EARTH_RADIUS_KM / 180
+    dlat = radius_km / km_per_deg
+    south, north = lat - dlat, lat + dlat
+    if south <= -90.0 or north >= 90.0:
+        return [""]
+    # Degrees of longitude shrink towards the poles; size the box at its widest.
+    dlon = dlat / math.cos(math.radians(max(abs(south), abs(north))))
+    if dlon >= 180.0:
+        return [""]
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash_cell_size(precision)
+        rows = range(math.floor((south + 90.0) / height), math.floor((north + 90.0) / height) + 1)
+        cols = range(math.floor((lon - dlon + 180.0) / width), math.floor((lon + dlon + 180.0) / width) + 1)
+        if len(rows) * len(cols) <= max_cells:
+            break
+    else:
+        return [""]
+    return sorted({
+        geohash_encode((row + 0.5) * height - 90.0, ((col + 0.5) * width) % 360.0 - 180.0, precision)
+        for row in rows
+        for col in cols
+    })
+
+
+def geohash_prefix_range(prefix):
+    """[low, high) string range covering every geohash starting with prefix."""
+    return prefix, prefix + "~"  # "~" sorts after every base32 character
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between two points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def distances_km(lat, lon, lats, lons):
+    """Vectorized haversine from (lat, lon) to arrays of points; NaN stays NaN."""
+    phi1 = math.radians(lat)
+    phi2 = np.radians(lats)
+    a = (
+        np.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lons - lon) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def unit_vectors(lats, lons):
+    """(n, 3) unit vectors on the sphere for arrays of coordinates."""
+    phi, lam = np.radians(lats), np.radians(lons)
+    cos_phi = np.cos(phi)
+    return np.column_stack((cos_phi * np.cos(lam), cos_phi * np.sin(lam), np.sin(phi)))
+
+
+def chord_length(radius_km):
+    """Straight-line distance between unit vectors radius_km apart on the surface."""
+    return 2 * math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+class KDTree:
+    """Static k-d tree over (n, 3) points, answering ball queries.
+
+    Points are reordered so every node covers a contiguous slice of
+    ``items``; nodes whose bounding box lies entirely inside the ball are
+    returned as a slice without testing their points. Built in O(n log n)
+    with one argpartition per node.
+    """
+
+    LEAF_SIZE = 64
+
+    def __init__(self, items, points):
+        self.items = np.asarray(items).copy()
+        points = np.asarray(points, dtype=np.float64).copy()
+        # Per node: (lo, hi, start, end, left, right); leaves have left == -1.
+        self.nodes = []
+        stack = [(0, len(self.items), None)]
+        while stack:
+            start, end, parent = stack.pop()
+            node = len(self.nodes)
+            if parent is not None:
+                parent_id, side = parent
+                self.nodes[parent_id][side] = node
+            lo = points[start:end].min(axis=0) if end > start else np.zeros(3)
+            hi = points[start:end].max(axis=0) if end > start else np.zeros(3)
+            self.nodes.append([tuple(lo.tolist()), tuple(hi.tolist()), start, end, -1, -1])
+            if end - start <= self.LEAF_SIZE:
+                continue
+            axis = int(np.argmax(hi - lo))
+            mid = (start + end) // 2
+            order = np.argpartition(points[start:end, axis], mid - start)
+            points[start:end] = points[start:end][order]
+            self.items[start:end] = self.items[start:end][order]
+            stack.append((mid, end, (node, 5)))
+            stack.append((start, mid, (node, 4)))
+
+    def __len__(self):
+        return len(self.items)
+
+    def query_ball(self, point, radius):
+        """Items within Euclidean `radius` of point, plus some just outside it.
+
+        Leaves that straddle the ball are returned whole, so callers filter
+        the result by exact distance.
+        """
+        if not self.nodes:
+            return self.items[:0]
+        x, y, z = point
+        r2 = radius * radius
+        slices = []
+        stack = [0]
+        nodes = self.nodes
+        while stack:
+            (lx, ly, lz), (hx, hy, hz), start, end, left, right = nodes[stack.pop()]
+            dx = lx - x if x < lx else (x - hx if x > hx else 0.0)
+            dy = ly - y if y < ly else (y - hy if y > hy else 0.0)
+            dz = lz - z if z < lz else (z - hz if z > hz else 0.0)
+            if dx * dx + dy * dy + dz * dz > r2:
+                continue
+            fx, fy, fz = max(x - lx, hx - x), max(y - ly, hy - y), max(z - lz, hz - z)
+            if left < 0 or fx * fx + fy * fy + fz * fz <= r2:
+                slices.append(self.items[start:end])
+            else:
+                stack.append(right)
+                stack.append(left)
+        return np.concatenate(slices) if slices else self.items[:0]
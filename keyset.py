@@ -0,0 +1,76 @@
+"""
+Keyset (cursor) pagination.
+
+OFFSET pagination makes the database produce and throw away every row
+before the page, so page 500 is 500 times the work of page 1, and the
+page count beside it is a second full COUNT(*). A keyset page instead
+continues strictly after the last row of the previous page in
+(sort value, id) order: with an index on the sort column that is a range
+scan of one page, however deep the client has gone.
+
+Cursors are opaque to clients: URL-safe base64 of a small JSON list
+holding the sort they were issued for, the last row's sort value and its
+ID. Ties on the sort value are broken by ascending ID.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort, value, row_id):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor, sort, parse=int):
+    """(sort value, row ID) from a cursor issued for sort. parse converts
+    the JSON sort value back (None is passed through). Raises ValueError
+    for a malformed cursor or one issued for another sort."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(raw)
+        if cursor_sort != sort or type(row_id) is not int:
+            raise ValueError(cursor)
+        return (None if value is None else parse(value)), row_id
+    except (ValueError, TypeError) as error:
+        raise ValueError("Invalid cursor for this sort; start again without one.") from error
+
+
+def parse_datetime(value):
+    return datetime.fromisoformat(value)
+
+
+def keyset_condition(column, value, id_column, row_id, descending=False, backwards=False, nulls_last=False):
+    """SQL condition for the rows after (value, row_id) in
+    ORDER BY column [DESC], id_column ASC.
+
+    backwards selects the rows before it instead (read them with
+    keyset_order(..., backwards=True) for the previous page). nulls_last
+    treats NULL sort values as coming after every other value; it is only
+    supported going forwards.
+
+    The leading `column >= value` (or <=) keeps the condition a plain
+    range on an index of the sort column, which an OR of the two cases
+    alone would not be.
+    """
+    if value is None:  # the cursor is already among the NULLs
+        return and_(column.is_(None), id_column > row_id)
+    if descending != backwards:
+        in_range, beyond = column <= value, column < value
+    else:
+        in_range, beyond = column >= value, column > value
+    tie = id_column < row_id if backwards else id_column > row_id
+    condition = and_(in_range, or_(beyond, tie))
+    return or_(condition, column.is_(None)) if nulls_last else condition
+
+
+def keyset_order(column, id_column, descending=False, backwards=False):
+    """ORDER BY clauses matching keyset_condition."""
+    if backwards:
+        return (column.asc() if descending else column.desc()), id_column.desc()
+    return (column.desc() if descending else column.asc()), id_column.asc()
@@ -0,0 +1,213 @@
+"""
+Precomputed marker clusters for the explore map.
+
+Rooms are bucketed into a hierarchical Web Mercator grid: at zoom z the world
+is 2**z tiles of 256 px, split into CELLS_PER_TILE cells per side (64 px), and
+each cell at zoom z is the union of its four children at z + 1. Every cell
+keeps count, coordinate sums (for the centroid), the sum of member IDs (which
+is the member itself when count == 1) and the minimum price.
+
+A viewport query reads only the cells under the bounding box at one level,
+so its cost depends on the screen size, not on how many rooms are in view.
+Writes touch one cell per level; a removal that takes away a cell's minimum
+price recomputes it from the four children (members, at the finest level).
+Pure Python, so it does not depend on NumPy.
+"""
+
+import math
+
+from geo import valid_coordinates
+
+MAX_CLUSTER_ZOOM = 16  # above this the map gets individual rooms
+CELLS_PER_TILE = 4  # 256 px tiles / 64 px cells
+_MAX_MERCATOR_LAT = 85.05112878
+
+
+def mercator(lat, lon):
+    """Web Mercator (x, y) in [0, 1), y growing southwards."""
+    lat = max(-_MAX_MERCATOR_LAT, min(_MAX_MERCATOR_LAT, lat))
+    phi = math.radians(lat)
+    x = (lon + 180.0) / 360.0
+    y = (1.0 - math.log(math.tan(phi) + 1.0 / math.cos(phi)) / math.pi) / 2.0
+    return min(max(x, 0.0), 1.0 - 1e-12), min(max(y, 0.0), 1.0 - 1e-12)
+
+
+def _scale(zoom):
+    return (1 << zoom) * CELLS_PER_TILE
+
+
+class MapClusterIndex:
+    """Grid clusters of verified rooms with coordinates, for zooms 0..MAX_CLUSTER_ZOOM.
+
+    Rows are the RoomCatalog row dicts (id, latitude, longitude, price,
+    verified, ...), so the index follows the same write hooks and change feed.
+    """
+
+    def __init__(self):
+        self.rooms = {}  # room_id -> (x, y, lat, lon, price)
+        # Per zoom: (cx, cy) -> [count, sum_lat, sum_lon, sum_ids, min_price]
+        self.levels = [{} for _ in range(MAX_CLUSTER_ZOOM + 1)]
+        self.members = {}  # finest cell -> set of room IDs
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Bulk build: fill the finest level, then fold each level into its parent."""
+        index = cls()
+        finest = index.levels[MAX_CLUSTER_ZOOM]
+        scale = _scale(MAX_CLUSTER_ZOOM)
+        for row in rows:
+            entry = index._entry(row)
+            if entry is None:
+                continue
+            x, y, lat, lon, price = entry
+            room_id = row["id"]
+            index.rooms[room_id] = entry
+            cell = (int(x * scale), int(y * scale))
+            index.members.setdefault(cell, set()).add(room_id)
+            index._add_to(finest, cell, lat, lon, room_id, price)
+        for zoom in range(MAX_CLUSTER_ZOOM - 1, -1, -1):
+            level = index.levels[zoom]
+            for (cx, cy), (count, sum_lat, sum_lon, sum_ids, min_price) in index.levels[zoom + 1].items():
+                cluster = level.get((cx >> 1, cy >> 1))
+                if cluster is None:
+                    level[(cx >> 1, cy >> 1)] = [count, sum_lat, sum_lon, sum_ids, min_price]
+                else:
+                    cluster[0] += count
+                    cluster[1] += sum_lat
+                    cluster[2] += sum_lon
+                    cluster[3] += sum_ids
+                    cluster[4] = min(cluster[4], min_price)
+        return index
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def __contains__(self, room_id):
+        return room_id in self.rooms
+
+    @staticmethod
+    def _entry(row):
+        lat, lon = row["latitude"], row["longitude"]
+        if not row["verified"] or not valid_coordinates(lat, lon):
+            return None
+        x, y = mercator(lat, lon)
+        return x, y, lat, lon, row["price"] or 0
+
+    @staticmethod
+    def _add_to(level, cell, lat, lon, room_id, price):
+        cluster = level.get(cell)
+        if cluster is None:
+            level[cell] = [1, lat, lon, room_id, price]
+        else:
+            cluster[0] += 1
+            cluster[1] += lat
+            cluster[2] += lon
+            cluster[3] += room_id
+            cluster[4] = min(cluster[4], price)
+
+    def upsert(self, row):
+        room_id = row["id"]
+        entry = self._entry(row)
+        if self.rooms.get(room_id) == entry:
+            return
+        self.remove(room_id)
+        if entry is None:
+            return
+        x, y, lat, lon, price = entry
+        self.rooms[room_id] = entry
+        for zoom, level in enumerate(self.levels):
+            scale = _scale(zoom)
+            self._add_to(level, (int(x * scale), int(y * scale)), lat, lon, room_id, price)
+        scale = _scale(MAX_CLUSTER_ZOOM)
+        self.members.setdefault((int(x * scale), int(y * scale)), set()).add(room_id)
+
+    def remove(self, room_id):
+        entry = self.rooms.pop(room_id, None)
+        if entry is None:
+            return
+        x, y, lat, lon, price = entry
+        scale = _scale(MAX_CLUSTER_ZOOM)
+        finest = (int(x * scale), int(y * scale))
+        self.members[finest].discard(room_id)
+        if not self.members[finest]:
+            del self.members[finest]
+        # Finest level first, so a stale minimum is recomputed from fresh children.
+        for zoom in range(MAX_CLUSTER_ZOOM, -1, -1):
+            level = self.levels[zoom]
+            cell = (finest[0] >> (MAX_CLUSTER_ZOOM - zoom), finest[1] >> (MAX_CLUSTER_ZOOM - zoom))
+            cluster = level[cell]
+            if cluster[0] == 1:
+                del level[cell]
+                continue
+            cluster[0] -= 1
+            cluster[1] -= lat
+            cluster[2] -= lon
+            cluster[3] -= room_id
+            if price <= cluster[4]:
+                cluster[4] = self._min_price(zoom, cell)
+
+    def _min_price(self, zoom, cell):
+        if zoom == MAX_CLUSTER_ZOOM:
+            return min(self.rooms[room_id][4] for room_id in self.members[cell])
+        children = self.levels[zoom + 1]
+        cx, cy = cell
+        return min(
+            children[child][4]
+            for child in ((2 * cx, 2 * cy), (2 * cx + 1, 2 * cy), (2 * cx, 2 * cy + 1), (2 * cx + 1, 2 * cy + 1))
+            if child in children
+        )
+
+    # -- queries ------------------------------------------------------------
+    def _cells_in(self, level, zoom, west, south, east, north):
+        scale = _scale(zoom)
+        x0, y0 = mercator(north, west)
+        x1, y1 = mercator(south, east)
+        cx0, cx1, cy0, cy1 = int(x0 * scale), int(x1 * scale), int(y0 * scale), int(y1 * scale)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) <= len(level):
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    cell = (cx, cy)
+                    if cell in level:
+                        yield cell, level[cell]
+        else:
+            for cell, value in level.items():
+                if cx0 <= cell[0] <= cx1 and cy0 <= cell[1] <= cy1:
+                    yield cell, value
+
+    def _point(self, room_id):
+        _, _, lat, lon, price = self.rooms[room_id]
+        return {"id": room_id, "lat": lat, "lon": lon, "price": price}
+
+    def query(self, west, south, east, north, zoom):
+        """(clusters, rooms) in the bounding box at a map zoom level.
+
+        Cells holding a single room, and every room above MAX_CLUSTER_ZOOM,
+        come back as points; cells straddling the box edge are included
+        whole.
+        """
+        clusters, points = [], []
+        if zoom > MAX_CLUSTER_ZOOM:
+            for _, members in self._cells_in(self.members, MAX_CLUSTER_ZOOM, west, south, east, north):
+                for room_id in members:
+                    _, _, lat, lon, _ = self.rooms[room_id]
+                    if south <= lat <= north and west <= lon <= east:
+                        points.append(self._point(room_id))
+            points.sort(key=lambda point: point["id"])
+            return clusters, points
+
+        zoom = max(zoom, 0)
+        for _, (count, sum_lat, sum_lon, sum_ids, min_price) in self._cells_in(
+            self.levels[zoom], zoom, west, south, east, north
+        ):
+            if count == 1:
+                points.append(self._point(sum_ids))
+            else:
+                clusters.append({
+                    "lat": round(sum_lat / count, 6),
+                    "lon": round(sum_lon / count, 6),
+                    "count": count,
+                    "min_price": min_price,
+                })
+        clusters.sort(key=lambda cluster: -cluster["count"])
+        points.sort(key=lambda point: point["id"])
+        return clusters, points
@@ -0,0 +1,163 @@
+"""
+Compact binary encoding of map markers (ID, position, price, status).
+
+A marker feed is five parallel int32 columns:
+
+    id, lat, lon   lat/lon in fixed point (degrees * SCALE)
+    price          monthly rent
+    status         index into STATUSES (len(STATUSES) for anything else)
+
+Markers are ordered along a Z-order (Morton) curve, so neighbours on the map
+are neighbours in the feed, and every column except status is delta-encoded
+(each value minus the previous one, the first minus zero). The deltas are
+small, which keeps the payload compressible; a client restores the values
+with a running sum.
+
+Binary layout (little-endian), readable with DataView / Int32Array:
+
+    4 bytes   MAGIC
+    uint32    header length H
+    H bytes   JSON header: count, scale, fields, delta, statuses
+              (padded with spaces so the columns start 4-byte aligned)
+    count * int32 per field, in header["fields"] order
+
+The base64 form is the same header as JSON, with each column's bytes
+base64-encoded under "columns".
+"""
+
+import base64
+import json
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python path encodes SQL rows
+    np = None
+
+MAGIC = b"RMF1"
+SCALE = 1_000_000  # ~0.1 m at the equator
+FIELDS = ("id", "lat", "lon", "price", "status")
+DELTA_FIELDS = ("id", "lat", "lon", "price")
+STATUSES = ("green", "yellow", "red")
+_INT32_MAX = 2 ** 31 - 1
+
+
+def status_code(status):
+    try:
+        return STATUSES.index((status or "").lower())
+    except ValueError:
+        return len(STATUSES)
+
+
+def _morton(qlat, qlon):
+    """Interleave the bits of two 16-bit integers (Python ints)."""
+    code = 0
+    for bit in range(16):
+        code |= ((qlon >> bit) & 1) << (2 * bit) | ((qlat >> bit) & 1) << (2 * bit + 1)
+    return code
+
+
+def _spread_bits(values):
+    """NumPy version of the interleave: 16-bit values -> every other bit of 32."""
+    values = values.astype(np.uint32)
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    values = (values | (values << 1)) & 0x55555555
+    return values
+
+
+def _header(count):
+    return {
+        "count": count,
+        "scale": SCALE,
+        "fields": list(FIELDS),
+        "delta": list(DELTA_FIELDS),
+        "statuses": list(STATUSES),
+    }
+
+
+def encode_columns(ids, lats, lons, prices, statuses):
+    """(header, {field: little-endian int32 bytes}) for markers given as
+    parallel NumPy arrays, with statuses already as status codes."""
+    count = len(ids)
+    lat_fixed = np.rint(np.asarray(lats, dtype=np.float64) * SCALE).astype(np.int64)
+    lon_fixed = np.rint(np.asarray(lons, dtype=np.float64) * SCALE).astype(np.int64)
+    qlat = (lat_fixed + 90 * SCALE) * 0xFFFF // (180 * SCALE)
+    qlon = (lon_fixed + 180 * SCALE) * 0xFFFF // (360 * SCALE)
+    codes = _spread_bits(qlon) | (_spread_bits(qlat) << 1)
+    order = np.lexsort((np.asarray(ids), codes))
+    values = {
+        "id": np.asarray(ids, dtype=np.int64)[order],
+        "lat": lat_fixed[order],
+        "lon": lon_fixed[order],
+        "price": np.clip(np.asarray(prices, dtype=np.int64), 0, _INT32_MAX)[order],
+        "status": np.asarray(statuses, dtype=np.int64)[order],
+    }
+    columns = {}
+    for field in FIELDS:
+        column = values[field]
+        if field in DELTA_FIELDS:
+            column = np.diff(column, prepend=0)
+        columns[field] = column.astype("<i4").tobytes()
+    return _header(count), columns
+
+
+def encode_rows(rows):
+    """Pure-Python encode_columns for (id, lat, lon, price, status) tuples."""
+    markers = []
+    for room_id, lat, lon, price, status in rows:
+        lat_fixed, lon_fixed = round(lat * SCALE), round(lon * SCALE)
+        code = _morton(
+            (lat_fixed + 90 * SCALE) * 0xFFFF // (180 * SCALE),
+            (lon_fixed + 180 * SCALE) * 0xFFFF // (360 * SCALE),
+        )
+        price = min(max(price or 0, 0), _INT32_MAX)
+        markers.append((code, room_id, lat_fixed, lon_fixed, price, status_code(status)))
+    markers.sort()
+    columns = {}
+    for position, field in enumerate(FIELDS, start=1):
+        column = array("i")
+        previous = 0
+        for marker in markers:
+            value = marker[position]
+            if field in DELTA_FIELDS:
+                value, previous = value - previous, value
+            column.append(value)
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns[field] = column.tobytes()
+    return _header(len(markers)), columns
+
+
+def to_binary(header, columns):
+    text = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    text += b" " * (-(len(MAGIC) + 4 + len(text)) % 4)
+    return b"".join([MAGIC, struct.pack("<I", len(text)), text, *(columns[field] for field in FIELDS)])
+
+
+def to_base64(header, columns):
+    return dict(header, columns={field: base64.b64encode(columns[field]).decode("ascii") for field in FIELDS})
+
+
+def decode_binary(payload):
+    """(header, {field: list of values}) with deltas undone; for tests and tools."""
+    if payload[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a marker feed")
+    (length,) = struct.unpack_from("<I", payload, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(payload[start:start + length])
+    offset, count = start + length, header["count"]
+    values = {}
+    for field in header["fields"]:
+        column = list(struct.unpack_from(f"<{count}i", payload, offset))
+        offset += 4 * count
+        if field in header["delta"]:
+            total = 0
+            for i, delta in enumerate(column):
+                total += delta
+                column[i] = total
+        values[field] = column
+    return header, values
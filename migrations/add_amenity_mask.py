@@ -0,0 +1,67 @@
+"""
+Migration: Add rooms.amenity_mask and backfill it from rooms.amenities
+
+Each known amenity (see amenities.py) is one bit, so multi-amenity filters
+run as a single bitwise-AND instead of one ILIKE per amenity. Safe to re-run:
+the backfill recomputes every row.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from amenities import amenity_mask
+
+BATCH_SIZE = 1000
+
+
+def run_migration():
+    """Add the amenity_mask column and index, then backfill it."""
+    with app.app_context():
+        try:
+            with db.engine.begin() as conn:
+                inspector = db.inspect(conn)
+                room_columns = [col['name'] for col in inspector.get_columns('rooms')]
+                if 'amenity_mask' not in room_columns:
+                    print("Adding amenity_mask to rooms...")
+                    conn.execute(db.text("""
+                        ALTER TABLE rooms
+                        ADD COLUMN amenity_mask INTEGER NOT NULL DEFAULT 0
+                    """))
+                    print("[OK] Added amenity_mask to rooms")
+                else:
+                    print("[SKIP] amenity_mask already exists in rooms")
+
+                conn.execute(db.text(
+                    "CREATE INDEX IF NOT EXISTS ix_rooms_amenity_mask ON rooms (amenity_mask)"
+                ))
+                print("[OK] Index ix_rooms_amenity_mask in place")
+
+                rows = conn.execute(db.text("SELECT id, amenities, amenity_mask FROM rooms")).all()
+                updates = [
+                    {"id": room_id, "mask": amenity_mask(amenities)}
+                    for room_id, amenities, current in rows
+                    if amenity_mask(amenities) != current
+                ]
+                for start in range(0, len(updates), BATCH_SIZE):
+                    conn.execute(
+                        db.text("UPDATE rooms SET amenity_mask = :mask WHERE id = :id"),
+                        updates[start:start + BATCH_SIZE],
+                    )
+                print(f"[OK] Backfilled amenity_mask for {len(updates)} of {len(rows)} rooms")
+
+            print("\n[SUCCESS] Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"[ERROR] Migration failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == "__main__":
+    run_migration()
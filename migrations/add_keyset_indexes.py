@@ -0,0 +1,43 @@
+"""
+Migration: Add the (price, id) and (created_at, id) indexes on rooms
+
+Cursor pages of /api/rooms, /api/rooms/search and /admin/listings (see
+keyset.py) continue from the last row in (sort value, id) order; these
+indexes turn that into a range scan of one page. Safe to re-run.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+
+INDEXES = {
+    "ix_rooms_price_id": "price, id",
+    "ix_rooms_created_at_id": "created_at, id",
+}
+
+
+def run_migration():
+    """Create the keyset pagination indexes if they are missing."""
+    with app.app_context():
+        try:
+            with db.engine.begin() as conn:
+                for name, columns in INDEXES.items():
+                    conn.execute(db.text(f"CREATE INDEX IF NOT EXISTS {name} ON rooms ({columns})"))
+                    print(f"[OK] Index {name} in place")
+
+            print("\n[SUCCESS] Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"[ERROR] Migration failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == "__main__":
+    run_migration()
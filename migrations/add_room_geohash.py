@@ -0,0 +1,64 @@
+"""
+Migration: Add rooms.geohash and backfill it from latitude / longitude
+
+/api/rooms/nearby without the in-memory catalog turns a radius into a few
+geohash prefix ranges on this B-tree indexed column (see geo.py). Safe to
+re-run: the backfill recomputes every row.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from geo import geohash_encode
+
+BATCH_SIZE = 1000
+
+
+def run_migration():
+    """Add the geohash column and index, then backfill it."""
+    with app.app_context():
+        try:
+            with db.engine.begin() as conn:
+                inspector = db.inspect(conn)
+                room_columns = [col['name'] for col in inspector.get_columns('rooms')]
+                if 'geohash' not in room_columns:
+                    print("Adding geohash to rooms...")
+                    conn.execute(db.text("ALTER TABLE rooms ADD COLUMN geohash VARCHAR(12)"))
+                    print("[OK] Added geohash to rooms")
+                else:
+                    print("[SKIP] geohash already exists in rooms")
+
+                conn.execute(db.text(
+                    "CREATE INDEX IF NOT EXISTS ix_rooms_geohash ON rooms (geohash)"
+                ))
+                print("[OK] Index ix_rooms_geohash in place")
+
+                rows = conn.execute(db.text("SELECT id, latitude, longitude, geohash FROM rooms")).all()
+                updates = [
+                    {"id": room_id, "geohash": geohash_encode(lat, lon)}
+                    for room_id, lat, lon, current in rows
+                    if geohash_encode(lat, lon) != current
+                ]
+                for start in range(0, len(updates), BATCH_SIZE):
+                    conn.execute(
+                        db.text("UPDATE rooms SET geohash = :geohash WHERE id = :id"),
+                        updates[start:start + BATCH_SIZE],
+                    )
+                print(f"[OK] Backfilled geohash for {len(updates)} of {len(rows)} rooms")
+
+            print("\n[SUCCESS] Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"[ERROR] Migration failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == "__main__":
+    run_migration()
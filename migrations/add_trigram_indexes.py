@@ -0,0 +1,49 @@
+"""
+Migration: Trigram indexes for the substring room filters
+
+The college / city / location filters match ILIKE '%value%', which no B-tree
+index can serve.
+
+- Postgres: enables pg_trgm and adds GIN (gin_trgm_ops) indexes on
+  rooms.title, rooms.location and rooms.college_nearby.
+- SQLite: creates the FTS5 trigram side table rooms_trgm, kept in sync with
+  rooms by triggers and filled from the existing rows.
+
+The app picks the indexed path up automatically on its next start.
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db, Room
+from text_search import detect_substring_filter, install_substring_index
+
+
+def run_migration():
+    """Install the trigram index for the rooms table."""
+    with app.app_context():
+        try:
+            if detect_substring_filter(db.engine, Room.__table__).name != "ilike":
+                print("[SKIP] Trigram indexes already exist on rooms")
+                return True
+
+            substring_filter = install_substring_index(db.engine, Room.__table__)
+            if substring_filter.name == "ilike":
+                print(f"[SKIP] No trigram index support for {db.engine.dialect.name}")
+            else:
+                print(f"[OK] Added {substring_filter.name} indexes on rooms")
+
+            print("\n[SUCCESS] Migration completed successfully!")
+            return True
+        except Exception as e:
+            print(f"[ERROR] Migration failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+if __name__ == "__main__":
+    run_migration()
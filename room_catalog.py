@@ -0,0 +1,379 @@
+"""
+In-memory columnar catalog of rooms for listing pages and facet counts.
+
+Each filterable room attribute lives in one NumPy array (strings as integer
+codes into a per-column dictionary), so a filter is a handful of vectorized
+boolean masks, a sorted page is one partition plus a small lexsort, and
+every facet is one ``bincount`` over the matching rows. At 100k rooms that
+takes a few milliseconds, where the equivalent SQL scans and sorts the whole
+table. Radius queries go through a k-d tree over the coordinate columns,
+and distances to every college are kept as one int32 matrix (metres), so
+"within N km of a college" and distance sorts are a column compare/sort.
+Callers hydrate ORM objects only for the IDs of the final page.
+
+The catalog is updated in place with upsert()/remove(), so it can follow
+the room change feed without a rebuild. NumPy is optional: when it is
+missing HAS_NUMPY is False and callers fall back to SQL.
+"""
+
+from amenities import AMENITIES
+from geo import KDTree, chord_length, distances_km, unit_vectors
+from marker_feed import status_code
+
+try:
+    import numpy as np
+except ImportError:  # facets fall back to one grouped SQL query
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Upper bounds (exclusive) of the price buckets; the last bucket is open.
+PRICE_BUCKETS = (5000, 10000, 15000, 20000)
+TOP_COLLEGES = 10
+# College distance of rooms without coordinates; sorts after every real one.
+UNKNOWN_DISTANCE_M = 2 ** 31 - 1
+
+
+def price_bucket_ranges():
+    """[(min, max or None)] for each price bucket, in order."""
+    lows = (0,) + PRICE_BUCKETS
+    return [(low, high - 1 if high is not None else None) for low, high in zip(lows, PRICE_BUCKETS + (None,))]
+
+
+def facet_payload(total, property_types, price_counts, colleges, statuses, amenity_counts, top=TOP_COLLEGES):
+    """Shape raw counts ({value: count} dicts / per-bucket lists) for the API."""
+    def ranked(counts, limit=None):
+        items = sorted(((value, n) for value, n in counts.items() if n), key=lambda item: (-item[1], item[0]))
+        return [{"value": value, "count": n} for value, n in items[:limit]]
+
+    return {
+        "total": total,
+        "facets": {
+            "property_type": ranked(property_types),
+            "price": [
+                {"min": low, "max": high, "count": int(price_counts[i])}
+                for i, (low, high) in enumerate(price_bucket_ranges())
+            ],
+            "college": ranked(colleges, top),
+            "availability_status": ranked(statuses),
+            "amenities": ranked(dict(zip(AMENITIES, amenity_counts))),
+        },
+    }
+
+
+class _Codes:
+    """String dictionary for one column: value <-> small integer code."""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+        self.folded = []  # lowercased values, for substring filters
+
+    def code(self, value):
+        value = value or ""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            self.folded.append(value.lower())
+        return code
+
+    def matching(self, needle):
+        """Codes of values containing needle, case-insensitively (like ILIKE '%needle%')."""
+        needle = needle.lower()
+        return np.array([code for code, value in enumerate(self.folded) if needle in value], dtype=np.int32)
+
+    def exact(self, value):
+        """Codes of values equal to value, case-insensitively."""
+        value = value.lower()
+        return np.array([code for code, folded in enumerate(self.folded) if folded == value], dtype=np.int32)
+
+
+class RoomCatalog:
+    """Columnar snapshot of the rooms table.
+
+    Rows are dicts with id, price, property_type, college_nearby, location,
+    availability_status, verified, capacity_total, capacity_occupied,
+    created_at (epoch seconds or None), latitude, longitude and amenity_mask.
+    Removed rooms leave a dead row behind until the next compaction.
+
+    `colleges` are (college_id, latitude, longitude) tuples; each gets a
+    column of room distances in ``college_distance_m``.
+    """
+
+    NUMERIC_COLUMNS = {
+        "ids": "int64",
+        "alive": "bool",
+        "price": "int64",
+        "verified": "bool",
+        "capacity_total": "int32",
+        "capacity_occupied": "int32",
+        "created_at": "float64",
+        "latitude": "float64",
+        "longitude": "float64",
+        "amenity_mask": "int64",
+    }
+    STRING_COLUMNS = ("property_type", "college_nearby", "location", "availability_status")
+    SORT_KEYS = ("price_asc", "price_desc", "newest", "slots_desc", "distance")
+
+    def __init__(self, capacity=1024, colleges=()):
+        self.size = 0
+        self.version = 0  # bumped by every upsert()/remove(), for caches derived from the catalog
+        self.row_of = {}  # room_id -> row number
+        self.strings = {name: _Codes() for name in self.STRING_COLUMNS}
+        colleges = [(college_id, lat, lon) for college_id, lat, lon in colleges if lat is not None and lon is not None]
+        self.college_column = {college_id: j for j, (college_id, _, _) in enumerate(colleges)}
+        self.college_lats = np.array([lat for _, lat, _ in colleges], dtype=np.float64)
+        self.college_lons = np.array([lon for _, _, lon in colleges], dtype=np.float64)
+        self._bulk_loading = False
+        self._allocate(capacity)
+        # k-d tree over the coordinates, built on the first radius query.
+        # Rows written since the build are checked by brute force until
+        # there are enough of them to be worth a rebuild.
+        self._tree = None
+        self._tree_pending = set()
+
+    def _columns(self):
+        return tuple(self.NUMERIC_COLUMNS) + self.STRING_COLUMNS + ("college_distance_m",)
+
+    def _allocate(self, capacity):
+        dtypes = dict(self.NUMERIC_COLUMNS, **{name: "int32" for name in self.STRING_COLUMNS})
+        dtypes["college_distance_m"] = "int32"
+        for name, dtype in dtypes.items():
+            shape = (capacity, len(self.college_column)) if name == "college_distance_m" else capacity
+            new = np.zeros(shape, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    @classmethod
+    def from_rows(cls, rows, colleges=()):
+        rows = list(rows)
+        catalog = cls(capacity=max(1024, len(rows) * 5 // 4), colleges=colleges)
+        catalog._bulk_loading = True
+        for row in rows:
+            catalog.upsert(row)
+        catalog._bulk_loading = False
+        # One vectorized pass per college instead of one call per row.
+        n = catalog.size
+        for column, (lat, lon) in enumerate(zip(catalog.college_lats, catalog.college_lons)):
+            metres = np.rint(distances_km(lat, lon, catalog.latitude[:n], catalog.longitude[:n]) * 1000)
+            catalog.college_distance_m[:n, column] = np.where(np.isnan(metres), UNKNOWN_DISTANCE_M, metres)
+        return catalog
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def __contains__(self, room_id):
+        return room_id in self.row_of
+
+    def upsert(self, row):
+        room_id = row["id"]
+        self.version += 1
+        i = self.row_of.get(room_id)
+        if i is None:
+            if self.size == self.capacity:
+                self._compact_or_grow()
+            i = self.size
+            self.size += 1
+            self.row_of[room_id] = i
+        self.ids[i] = room_id
+        self.alive[i] = True
+        self.price[i] = row["price"] or 0
+        self.verified[i] = bool(row["verified"])
+        self.capacity_total[i] = row["capacity_total"] or 0
+        self.capacity_occupied[i] = row["capacity_occupied"] or 0
+        self.amenity_mask[i] = row["amenity_mask"] or 0
+        for name in ("created_at", "latitude", "longitude"):
+            value = row[name]
+            getattr(self, name)[i] = np.nan if value is None else value
+        if self.college_column and not self._bulk_loading:
+            self.college_distance_m[i] = self._college_distances(row["latitude"], row["longitude"])
+        for name in self.STRING_COLUMNS:
+            getattr(self, name)[i] = self.strings[name].code(row[name])
+        if self._tree is not None:
+            self._tree_pending.add(i)
+
+    def _college_distances(self, lat, lon):
+        if lat is None or lon is None:
+            return UNKNOWN_DISTANCE_M
+        metres = np.rint(distances_km(lat, lon, self.college_lats, self.college_lons) * 1000)
+        return np.where(np.isnan(metres), UNKNOWN_DISTANCE_M, metres)
+
+    def remove(self, room_id):
+        i = self.row_of.pop(room_id, None)
+        if i is not None:
+            self.alive[i] = False
+            self.version += 1
+
+    def _compact_or_grow(self):
+        live = np.flatnonzero(self.alive[:self.size])
+        if len(live) < self.size * 3 // 4:
+            for name in self._columns():
+                column = getattr(self, name)
+                column[:len(live)] = column[live]
+            self.size = len(live)
+            self.row_of = {int(room_id): i for i, room_id in enumerate(self.ids[:self.size])}
+            self._tree, self._tree_pending = None, set()  # row numbers changed
+        else:
+            self._allocate(self.capacity * 2)
+
+    # -- queries ------------------------------------------------------------
+    def select(self, filters, text_ids=None):
+        """Boolean mask over rows [0, size) matching the api_rooms filters.
+
+        `text_ids` are the room IDs matching the free-text `q` filter, which
+        stays with the database's text index.
+        """
+        n = self.size
+        mask = self.alive[:n].copy()
+        if not filters.get("include_unverified"):
+            mask &= self.verified[:n]
+        if filters.get("college"):
+            mask &= np.isin(self.college_nearby[:n], self.strings["college_nearby"].matching(filters["college"]))
+        if filters.get("city"):
+            mask &= np.isin(self.location[:n], self.strings["location"].matching(filters["city"]))
+        if filters.get("property_type"):
+            mask &= np.isin(self.property_type[:n], self.strings["property_type"].exact(filters["property_type"]))
+        if filters.get("max_rent") is not None:
+            mask &= self.price[:n] <= filters["max_rent"]
+        if filters.get("min_available") is not None:
+            mask &= (self.capacity_total[:n] - self.capacity_occupied[:n]) >= filters["min_available"]
+        if filters.get("amenity_mask"):
+            required = filters["amenity_mask"]
+            mask &= (self.amenity_mask[:n] & required) == required
+        if filters.get("within_km") is not None and filters.get("college_id") is not None:
+            column = self.college_column.get(filters["college_id"])
+            if column is None:
+                mask[:] = False  # unknown college or one without coordinates
+            else:
+                mask &= self.college_distance_m[:n, column] <= filters["within_km"] * 1000
+        if text_ids is not None:
+            mask &= np.isin(self.ids[:n], np.fromiter(text_ids, dtype=np.int64))
+        return mask
+
+    def _sort_values(self, sort_key, rows, college_id=None):
+        """Ascending sort key for rows, matching the SQL ORDER BY of api_rooms."""
+        if sort_key == "distance":
+            column = self.college_column.get(college_id)
+            if column is None:
+                return np.zeros(len(rows), dtype=np.int32)  # every distance unknown: ID order
+            return self.college_distance_m[rows, column]
+        if sort_key == "price_desc":
+            return -self.price[rows]
+        if sort_key == "newest":
+            # created_at is NOT NULL; NaN only guards hand-built rows.
+            values = -self.created_at[rows]
+            return np.where(np.isnan(values), np.inf, values)
+        if sort_key == "slots_desc":
+            return -(self.capacity_total[rows].astype(np.int64) - self.capacity_occupied[rows])
+        return self.price[rows]
+
+    def _ordered_slice(self, rows, values, offset, limit):
+        """Positions into rows of one page ordered by (values, ID).
+
+        Only the first offset + limit rows are ordered: argpartition-style
+        selection picks them in O(n), then a lexsort orders that slice.
+        """
+        k = min(offset + limit, len(rows))
+        if k <= offset:
+            return np.zeros(0, dtype=np.int64)
+        positions = np.arange(len(rows))
+        if k < len(rows):
+            # Keep everything tied with the k-th value so the ID tiebreak
+            # stays exact at the page boundary.
+            kth = np.partition(values, k - 1)[k - 1]
+            positions = np.flatnonzero(values <= kth)
+        order = np.lexsort((self.ids[rows[positions]], values[positions]))[offset:k]
+        return positions[order]
+
+    def page(self, mask, sort_key, offset, limit, college_id=None, after=None):
+        """(total, room IDs of one page) for the rows in mask, ties by ID.
+
+        sort_key "distance" orders by distance to college_id. after is a
+        (sort_value(), room ID) keyset: the page starts past that row and
+        offset counts from there. total always counts the whole mask.
+        """
+        rows = np.flatnonzero(mask)
+        total = len(rows)
+        values = self._sort_values(sort_key, rows, college_id)
+        if after is not None:
+            value, room_id = after
+            ids = self.ids[rows]
+            keep = (values > value) | ((values == value) & (ids > room_id))
+            rows, values = rows[keep], values[keep]
+        positions = self._ordered_slice(rows, values, offset, limit)
+        return total, self.ids[rows[positions]].tolist()
+
+    def sort_value(self, sort_key, room_id, college_id=None):
+        """room_id's ascending sort value under sort_key, for page(after=)."""
+        rows = np.array([self.row_of[room_id]])
+        return self._sort_values(sort_key, rows, college_id)[0].item()
+
+    def _spatial_index(self):
+        if self._tree is None or len(self._tree_pending) > max(1024, self.size // 16):
+            n = self.size
+            rows = np.flatnonzero(self.alive[:n] & ~np.isnan(self.latitude[:n]) & ~np.isnan(self.longitude[:n]))
+            self._tree = KDTree(rows, unit_vectors(self.latitude[rows], self.longitude[rows]))
+            self._tree_pending = set()
+        return self._tree
+
+    def nearby(self, mask, lat, lon, radius_km, offset, limit):
+        """(total, room IDs, distances in km) of one page of the rows in mask
+        within radius_km of (lat, lon), nearest first, ties by ID."""
+        tree = self._spatial_index()
+        center = unit_vectors(np.array([lat]), np.array([lon]))[0]
+        # Slack on the chord so float rounding never drops a boundary row;
+        # the haversine below is the exact test.
+        rows = tree.query_ball(center, chord_length(radius_km) * (1 + 1e-9) + 1e-12)
+        if self._tree_pending:
+            rows = np.union1d(rows, np.fromiter(self._tree_pending, dtype=np.int64))
+        rows = rows[mask[rows]]
+        distances = distances_km(lat, lon, self.latitude[rows], self.longitude[rows])
+        inside = distances <= radius_km  # also drops rows without coordinates
+        rows, distances = rows[inside], distances[inside]
+        positions = self._ordered_slice(rows, distances, offset, limit)
+        return len(rows), self.ids[rows[positions]].tolist(), distances[positions].tolist()
+
+    def markers(self, mask, bbox=None):
+        """(ids, lats, lons, prices, status codes) of the rows in mask that
+        have coordinates, optionally inside bbox = (west, south, east, north);
+        status codes are marker_feed.status_code() values."""
+        rows = np.flatnonzero(mask & ~np.isnan(self.latitude[:self.size]) & ~np.isnan(self.longitude[:self.size]))
+        lats, lons = self.latitude[rows], self.longitude[rows]
+        if bbox is not None:
+            west, south, east, north = bbox
+            inside = (lats >= south) & (lats <= north) & (lons >= west) & (lons <= east)
+            rows, lats, lons = rows[inside], lats[inside], lons[inside]
+        codes = self.strings["availability_status"]
+        feed_codes = np.array([status_code(value) for value in codes.values], dtype=np.int32)
+        return self.ids[rows], lats, lons, self.price[rows], feed_codes[self.availability_status[rows]]
+
+    def facets(self, mask, top=TOP_COLLEGES):
+        """Facet counts over the rows selected by mask."""
+        rows = np.flatnonzero(mask)
+
+        def counts(name, fold=False):
+            codes = self.strings[name]
+            tally = np.bincount(getattr(self, name)[rows], minlength=len(codes.values))
+            result = {}
+            for code in np.flatnonzero(tally):
+                value = codes.folded[code] if fold else codes.values[code]
+                result[value] = result.get(value, 0) + int(tally[code])
+            return result
+
+        buckets = np.searchsorted(np.array(PRICE_BUCKETS), self.price[rows], side="right")
+        price_counts = np.bincount(buckets, minlength=len(PRICE_BUCKETS) + 1)
+        masks = self.amenity_mask[rows]
+        amenity_counts = [int(np.count_nonzero(masks & (1 << bit))) for bit in range(len(AMENITIES))]
+        return facet_payload(
+            len(rows),
+            counts("property_type", fold=True),
+            price_counts,
+            counts("college_nearby"),
+            counts("availability_status"),
+            amenity_counts,
+            top,
+        )
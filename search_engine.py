@@ -1,44 +1,820 @@
+from array import array
+from bisect import bisect_left, insort
+import heapq
+import math
+import re
+from datetime import datetime
+from itertools import chain, product
+
+DEFAULT_TOP_K = 20
+
+# Multi-word queries first walk rooms in score order and stop once enough
+# matches are found; after this many probes they fall back to intersecting
+# the posting lists and ranking the result.
+RANKED_SCAN_BUDGET = 2000
+
+# Hard cap on trie nodes (or compact-index word characters) a fuzzy query may
+# expand, so a pathological query cannot blow up autocomplete latency.
+FUZZY_NODE_BUDGET = 5000
+
+# Words are runs of letters/digits, so "West," and "Fr." index as "west" and "fr".
+_WORD_RE = re.compile(r"\w+")
+
+
+def rank_score(verified, available_slots, created_at=None, popularity=0, now=None):
+    """Autocomplete ranking score for a room; higher ranks first.
+
+    Verified rooms always outrank unverified ones. Within each group rooms are
+    ordered by open slots (capped at 10), then a recency bonus that halves
+    every 30 days, then popularity (bookings, capped at 10).
+
+    The bonus is measured at `now` (default: the current time) and stored
+    with the room, so indexes pass the time of their last full build: every
+    room is then ranked by recency as of that build, a room written since
+    gets no edge over unchanged ones, and ages move on at the next build.
+    """
+    score = 1000.0 if verified else 0.0
+    score += 10.0 * min(max(available_slots or 0, 0), 10)
+    if created_at is not None:
+        age_days = max(((now or datetime.utcnow()) - created_at).total_seconds() / 86400, 0.0)
+        score += 10.0 * math.pow(0.5, age_days / 30)
+    score += min(max(popularity or 0, 0), 10)
+    return score
+
+
+def intersect_postings(postings):
+    """Intersect posting lists smallest-first.
+
+    Accepts sets (probed by hash), sorted ``array('I')`` lists (probed by
+    bisect) and any other container supporting ``in``, so the work is bounded
+    by the shortest list rather than the longest. Stops as soon as the
+    running result is empty.
+    """
+    postings = sorted(postings, key=len)
+    if not postings:
+        return set()
+    result = set(postings[0])
+    for ids in postings[1:]:
+        if not result:
+            break
+        if isinstance(ids, (set, frozenset)):
+            result &= ids
+        elif isinstance(ids, array):
+            n = len(ids)
+            result = {rid for rid in result if _sorted_contains(ids, rid, n)}
+        else:
+            result = {rid for rid in result if rid in ids}
+    return result
+
+
+class _PostingUnion:
+    """Read-only union of posting sets, without materialising it."""
+
+    __slots__ = ("sets", "size")
+
+    def __init__(self, sets):
+        self.sets = sets
+        self.size = sum(len(ids) for ids in sets)  # upper bound, used for ordering
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, rid):
+        return any(rid in ids for ids in self.sets)
+
+    def __iter__(self):
+        return chain.from_iterable(self.sets)
+
+
+def rank_postings(postings, limit, ranked_ids, scores):
+    """Best `limit` room IDs present in every posting list, highest score first.
+
+    `ranked_ids` iterates all indexed rooms best-first. When even the
+    shortest list is long, walking that order and stopping at `limit`
+    matches beats building the full intersection; otherwise intersect
+    smallest-first and rank the (small) result.
+    """
+    postings.sort(key=len)
+    if len(postings[0]) > RANKED_SCAN_BUDGET:
+        found = []
+        budget = RANKED_SCAN_BUDGET
+        for probes, rid in enumerate(ranked_ids):
+            if probes == budget:
+                # Keep walking only if the observed hit rate says we will
+                # finish before a full intersection would.
+                if not found or probes * limit // len(found) >= len(postings[0]):
+                    break
+                budget = len(postings[0])
+            for ids in postings:
+                if rid not in ids:
+                    break
+            else:
+                found.append(rid)
+                if len(found) == limit:
+                    return found
+        else:
+            return found
+    matches = intersect_postings(postings)
+    return heapq.nlargest(limit, matches, key=scores.get)
+
+
+def _sorted_contains(ids, rid, n):
+    i = bisect_left(ids, rid)
+    return i < n and ids[i] == rid
+
+
+def fuzzy_max_distance(token):
+    """Edit distance allowed for a query token: none for 1-2 chars, 1 up to 5, else 2."""
+    if len(token) <= 2:
+        return 0
+    return 1 if len(token) <= 5 else 2
+
+
+def _levenshtein_row(row, char, token):
+    """Next row of the Levenshtein DP table after consuming `char`.
+
+    Stepping this row along a trie path simulates a Levenshtein automaton for
+    `token`: row[-1] is the distance to the path so far and min(row) bounds
+    the distance of anything below it.
+    """
+    new = [row[0] + 1]
+    for j, tc in enumerate(token, 1):
+        new.append(min(new[j - 1] + 1, row[j] + 1, row[j - 1] + (tc != char)))
+    return new
+
+
+def _rank_fuzzy(levels, rank_matches, scores, limit, exclude):
+    """Rank rooms matched by every token by total edit distance, then score.
+
+    `levels` holds, per token, a dict of edit distance -> list of posting
+    sets. Tiers of equal total distance are filled in order, each through
+    `rank_matches` (the index's best-by-score intersection), so a tier stops
+    at `limit` rooms instead of materialising every fuzzy match.
+    """
+    seen = set(exclude)
+    ranked = []
+    per_token = [sorted(by_dist.items()) for by_dist in levels]
+    max_total = sum(options[-1][0] for options in per_token)
+    for total in range(max_total + 1):
+        want = limit - len(ranked)
+        tier = set()
+        for combo in product(*per_token):
+            if sum(dist for dist, _ in combo) != total:
+                continue
+            postings = [sets[0] if len(sets) == 1 else _PostingUnion(sets) for _, sets in combo]
+            tier.update(rid for rid in rank_matches(postings, want + len(seen)) if rid not in seen)
+        best = heapq.nlargest(want, tier, key=scores.get)
+        ranked.extend(best)
+        seen.update(best)
+        if len(ranked) >= limit:
+            break
+    return ranked
+
+
 class TrieNode:
+    __slots__ = ("children", "room_ids", "word_ids", "top", "top_dirty")
+
     def __init__(self):
         self.children = {}
         self.room_ids = set()  # Store sets of Room IDs that match this prefix
+        self.word_ids = None  # Room IDs whose word ends exactly here (terminal nodes only)
+        self.top = []  # Best-scored room IDs for this prefix, highest first (bounded to top_k)
+        self.top_dirty = False  # True when `top` may be missing better rooms from room_ids
 
 class SearchTrie:
-    def __init__(self):
+    def __init__(self, top_k=DEFAULT_TOP_K):
         self.root = TrieNode()
+        self.top_k = top_k
+        # room_id -> set of words indexed for that room, so a room can be
+        # removed or replaced without rebuilding the whole trie.
+        self.room_words = {}
+        self.room_scores = {}
+        self.rank_keys = []  # sorted (-score, room_id) for every indexed room
+
+    @staticmethod
+    def tokenize(text):
+        """Split text into the lowercase words that get indexed."""
+        if not text:
+            return []
+        return _WORD_RE.findall(text.lower())
 
     def insert(self, text, room_id):
         """Insert a text (title, location, college) linked to a room_id."""
         if not text:
             return
-        
-        text = text.lower()
+
         # We want to be able to search by any word in the text
         # e.g. "Sardar Patel" -> Search "Patel" should find it.
-        # So we insert suffixes or just words?
-        # Let's insert each word as a starting point for the Trie.
-        words = text.split()
-        for word in words:
-            self._insert_word(word, room_id)
+        # So we insert each word as a starting point for the Trie.
+        words = self.room_words.setdefault(room_id, set())
+        for word in self.tokenize(text):
+            if word not in words:
+                words.add(word)
+                self._insert_word(word, room_id)
+
+    def insert_room(self, room_id, texts, score=0.0):
+        """Index every text field of a room (title, location, college)."""
+        self._set_score(room_id, score)
+        for text in texts:
+            self.insert(text, room_id)
+
+    def remove_room(self, room_id):
+        """Drop a room from every prefix it was indexed under."""
+        words = self.room_words.pop(room_id, None)
+        if words:
+            for word in words:
+                self._remove_word(word, room_id)
+        self._set_score(room_id, None)
+
+    def replace_room(self, room_id, texts, score=0.0):
+        """Re-index a room after an edit.
+
+        When only the score changed, the room is re-ranked in the top-k lists
+        of its prefix nodes without touching the postings.
+        """
+        new_words = set()
+        for text in texts:
+            new_words.update(self.tokenize(text))
+        if room_id in self.room_words and self.room_words[room_id] == new_words:
+            if self.room_scores.get(room_id) != score:
+                self._set_score(room_id, score)
+                for node in self._room_nodes(room_id):
+                    self._place(node, room_id)
+            return
+        self.remove_room(room_id)
+        self.insert_room(room_id, texts, score)
+
+    def _set_score(self, room_id, score):
+        """Record a room's score (None to forget it) and keep rank_keys sorted."""
+        old = self.room_scores.pop(room_id, None)
+        if old is not None:
+            i = bisect_left(self.rank_keys, (-old, room_id))
+            if i < len(self.rank_keys) and self.rank_keys[i] == (-old, room_id):
+                del self.rank_keys[i]
+        if score is not None:
+            self.room_scores[room_id] = score
+            insort(self.rank_keys, (-score, room_id))
+
+    def _room_nodes(self, room_id):
+        seen = {}
+        for word in self.room_words.get(room_id, ()):
+            node = self.root
+            for char in word:
+                node = node.children[char]
+                seen[id(node)] = node
+        return seen.values()
+
+    def _place(self, node, room_id):
+        """Insert or move room_id within node.top according to its score."""
+        top = node.top
+        scores = self.room_scores
+        was_member = room_id in top
+        if was_member:
+            top.remove(room_id)
+        score = scores.get(room_id, 0.0)
+        if len(top) >= self.top_k and score <= scores.get(top[-1], 0.0):
+            if was_member:
+                # It dropped out; some room outside the list may now deserve the slot.
+                node.top_dirty = True
+            return
+        i = 0
+        while i < len(top) and scores.get(top[i], 0.0) >= score:
+            i += 1
+        top.insert(i, room_id)
+        if len(top) > self.top_k:
+            top.pop()
+        elif was_member and i == len(top) - 1 and len(node.room_ids) > len(top):
+            # A demoted member landed in the last slot, but a room that never
+            # made the list could outrank it now.
+            node.top_dirty = True
 
     def _insert_word(self, word, room_id):
+        scores = self.room_scores
+        score = scores.get(room_id, 0.0)
+        top_k = self.top_k
         node = self.root
         for char in word:
             if char not in node.children:
                 node.children[char] = TrieNode()
             node = node.children[char]
-            node.room_ids.add(room_id)
+            if room_id not in node.room_ids:
+                node.room_ids.add(room_id)
+                # New to this node, so it cannot already be in node.top; skip
+                # _place entirely when it would not make the list.
+                top = node.top
+                if len(top) < top_k or score > scores.get(top[-1], 0.0):
+                    self._place(node, room_id)
+        if node.word_ids is None:
+            node.word_ids = set()
+        node.word_ids.add(room_id)
+
+    def _remove_word(self, word, room_id):
+        # Walk down recording the path, then prune nodes left without rooms.
+        # Other words of the same room are removed in the same pass, so the
+        # room can be dropped from every prefix node on the path.
+        path = []
+        node = self.root
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                break
+            child.room_ids.discard(room_id)
+            if room_id in child.top:
+                child.top.remove(room_id)
+                if len(child.room_ids) > len(child.top):
+                    child.top_dirty = True
+            path.append((node, char, child))
+            node = child
+        else:
+            if node.word_ids is not None:
+                node.word_ids.discard(room_id)
+                if not node.word_ids:
+                    node.word_ids = None
+        for parent, char, child in reversed(path):
+            if child.room_ids or child.children:
+                break
+            del parent.children[char]
+
+    def _find(self, prefix):
+        node = self.root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
 
     def search(self, prefix):
         """Returns a set of room_ids that contain a word starting with prefix."""
         if not prefix:
             return set()
-        
-        prefix = prefix.lower()
-        node = self.root
-        for char in prefix:
-            if char not in node.children:
-                return set()
-            node = node.children[char]
-        
-        return node.room_ids
+
+        node = self._find(prefix)
+        return node.room_ids if node is not None else set()
+
+    def search_top(self, prefix, limit=None):
+        """Returns up to `limit` (at most top_k) best-ranked room_ids for prefix.
+
+        Reads the precomputed list on the prefix node, so the cost is O(k)
+        regardless of how many rooms match. Lists invalidated by removals are
+        refilled lazily here.
+        """
+        if not prefix:
+            return []
+        node = self._find(prefix)
+        if node is None:
+            return []
+        return self._node_top(node)[:limit or self.top_k]
+
+    def _node_top(self, node):
+        if node.top_dirty:
+            node.top = heapq.nlargest(self.top_k, node.room_ids, key=self.room_scores.get)
+            node.top_dirty = False
+        return node.top
+
+    def search_query(self, query, limit=None, fuzzy=False):
+        """Best-ranked room_ids matching every word of a (possibly multi-word) query.
+
+        All but the last token must match an indexed word exactly; the last
+        token is a prefix ("sardar pat"). Single-token queries use the
+        precomputed top-k lists. With fuzzy=True, remaining slots are filled
+        with rooms within a small edit distance of each token, ranked after
+        every exact match.
+        """
+        tokens = self.tokenize(query)
+        if not tokens:
+            return []
+        limit = limit or self.top_k
+        results = self._exact_query(tokens, limit)
+        if not fuzzy or len(results) >= limit:
+            return results
+
+        budget = [FUZZY_NODE_BUDGET]
+        terms = dict.fromkeys((token, False) for token in tokens[:-1])
+        terms[(tokens[-1], True)] = None
+        levels = []
+        for token, prefix in terms:
+            by_dist = {}
+            for dist, node in self._fuzzy_nodes(token, prefix, budget):
+                if len(tokens) == 1:
+                    # A node's top-k already holds its best rooms for any limit <= k.
+                    ids = set(self._node_top(node))
+                else:
+                    ids = node.room_ids if prefix else node.word_ids
+                by_dist.setdefault(dist, []).append(ids)
+            if not by_dist:
+                return results
+            levels.append(by_dist)
+        return results + _rank_fuzzy(
+            levels, self._rank_matches, self.room_scores, limit - len(results), results
+        )
+
+    def _fuzzy_nodes(self, token, prefix, budget):
+        """(distance, node) pairs within fuzzy_max_distance(token) of token.
+
+        In prefix mode any node on a close-enough path matches (covering all
+        words below it); otherwise only nodes that end an indexed word do.
+        `budget` is a one-element list shared across the query's tokens and
+        decremented per node expanded.
+        """
+        max_dist = fuzzy_max_distance(token)
+        found = []
+        # `covered` is the distance of the nearest matched ancestor: in prefix
+        # mode its postings already include everything below it.
+        stack = [(self.root, list(range(len(token) + 1)), max_dist + 1)]
+        while stack:
+            node, row, covered = stack.pop()
+            for char, child in node.children.items():
+                if budget[0] <= 0:
+                    return found
+                budget[0] -= 1
+                new = _levenshtein_row(row, char, token)
+                dist, best = new[-1], min(new)
+                child_covered = covered
+                if prefix:
+                    if dist < covered:
+                        found.append((dist, child))
+                        child_covered = dist
+                elif dist <= max_dist and child.word_ids:
+                    found.append((dist, child))
+                if best < child_covered if prefix else best <= max_dist:
+                    stack.append((child, new, child_covered))
+        return found
+
+    def _exact_query(self, tokens, limit):
+        if len(tokens) == 1:
+            return self.search_top(tokens[0], limit)
+        postings = []
+        for token in dict.fromkeys(tokens[:-1]):
+            node = self._find(token)
+            if node is None or not node.word_ids:
+                return []
+            postings.append(node.word_ids)
+        last = self._find(tokens[-1])
+        if last is None:
+            return []
+        postings.append(last.room_ids)
+        return self._rank_matches(postings, limit)
+
+    def _rank_matches(self, postings, limit):
+        return rank_postings(postings, limit, (rid for _, rid in self.rank_keys), self.room_scores)
+
+
+class CompactSearchIndex:
+    """Memory-lean alternative to SearchTrie with the same interface.
+
+    Instead of one node (dict + set) per character, every distinct word is
+    kept once in a sorted list with its room IDs in a sorted ``array('I')``.
+    A prefix query is a bisect over the word list followed by a union of the
+    posting arrays in that range.
+    """
+
+    def __init__(self):
+        self.words = []  # sorted, distinct indexed words
+        self.postings = []  # postings[i] -> sorted array('I') of room IDs for words[i]
+        self.room_words = {}
+        self.room_scores = {}
+
+    tokenize = staticmethod(SearchTrie.tokenize)
+
+    def insert(self, text, room_id):
+        """Insert a text (title, location, college) linked to a room_id."""
+        if not text:
+            return
+        # Per-room words are kept as a tuple of the canonical strings from
+        # self.words, so a million rooms do not each hold private copies.
+        words = self.room_words.get(room_id, ())
+        added = []
+        for word in self.tokenize(text):
+            if word not in words and word not in added:
+                added.append(self._insert_word(word, room_id))
+        if added:
+            self.room_words[room_id] = words + tuple(added)
+
+    def insert_room(self, room_id, texts, score=0.0):
+        """Index every text field of a room (title, location, college)."""
+        self.room_scores[room_id] = score
+        for text in texts:
+            self.insert(text, room_id)
+
+    def remove_room(self, room_id):
+        """Drop a room from every word it was indexed under."""
+        words = self.room_words.pop(room_id, None)
+        if words:
+            for word in words:
+                self._remove_word(word, room_id)
+        self.room_scores.pop(room_id, None)
+
+    def replace_room(self, room_id, texts, score=0.0):
+        """Re-index a room after an edit. Only the score is updated when its words are unchanged."""
+        new_words = set()
+        for text in texts:
+            new_words.update(self.tokenize(text))
+        if room_id in self.room_words and set(self.room_words[room_id]) == new_words:
+            self.room_scores[room_id] = score
+            return
+        self.remove_room(room_id)
+        self.insert_room(room_id, texts, score)
+
+    def _insert_word(self, word, room_id):
+        i = bisect_left(self.words, word)
+        if i == len(self.words) or self.words[i] != word:
+            self.words.insert(i, word)
+            self.postings.insert(i, array("I", (room_id,)))
+            return word
+        ids = self.postings[i]
+        j = bisect_left(ids, room_id)
+        if j == len(ids) or ids[j] != room_id:
+            ids.insert(j, room_id)
+        return self.words[i]
+
+    def _remove_word(self, word, room_id):
+        i = bisect_left(self.words, word)
+        if i == len(self.words) or self.words[i] != word:
+            return
+        ids = self.postings[i]
+        j = bisect_left(ids, room_id)
+        if j < len(ids) and ids[j] == room_id:
+            del ids[j]
+        if not ids:
+            del self.words[i]
+            del self.postings[i]
+
+    def _prefix_range(self, prefix):
+        lo = bisect_left(self.words, prefix)
+        hi = bisect_left(self.words, prefix + "\U0010ffff", lo)
+        return lo, hi
+
+    def search(self, prefix):
+        """Returns a set of room_ids that contain a word starting with prefix."""
+        if not prefix:
+            return set()
+        lo, hi = self._prefix_range(prefix.lower())
+        return set().union(*self.postings[lo:hi])
+
+    def search_top(self, prefix, limit=None):
+        """Returns up to `limit` best-ranked room_ids for prefix.
+
+        The compact layout has no per-prefix lists, so this ranks the whole
+        matching range; prefer the trie when short-prefix latency matters.
+        """
+        if not prefix:
+            return []
+        return heapq.nlargest(
+            limit or DEFAULT_TOP_K, self.search(prefix), key=self.room_scores.get
+        )
+
+    def search_query(self, query, limit=None, fuzzy=False):
+        """Best-ranked room_ids matching every word of a (possibly multi-word) query.
+
+        All but the last token must match an indexed word exactly; the last
+        token is a prefix. Exact words use their sorted posting arrays as-is.
+        With fuzzy=True, remaining slots are filled with rooms within a small
+        edit distance of each token, ranked after every exact match.
+        """
+        tokens = self.tokenize(query)
+        if not tokens:
+            return []
+        limit = limit or DEFAULT_TOP_K
+        results = self._exact_query(tokens, limit)
+        if not fuzzy or len(results) >= limit:
+            return results
+
+        budget = [FUZZY_NODE_BUDGET]
+        terms = dict.fromkeys((token, False) for token in tokens[:-1])
+        terms[(tokens[-1], True)] = None
+        levels = []
+        for token, prefix in terms:
+            by_dist = {}
+            for dist, i in self._fuzzy_words(token, prefix, budget):
+                by_dist.setdefault(dist, []).append(self.postings[i])
+            if not by_dist:
+                return results
+            # Posting arrays are merged once per distance so membership is a hash probe.
+            levels.append({dist: [set().union(*ids)] for dist, ids in by_dist.items()})
+        return results + _rank_fuzzy(
+            levels, self._rank_matches, self.room_scores, limit - len(results), results
+        )
+
+    def _fuzzy_words(self, token, prefix, budget):
+        """(distance, word index) pairs within fuzzy_max_distance(token) of token.
+
+        Walks the sorted word list reusing DP rows across shared prefixes,
+        which is the same automaton walk as the trie; a hopeless prefix skips
+        its whole range with one bisect. `budget` counts characters expanded.
+        """
+        max_dist = fuzzy_max_distance(token)
+        words = self.words
+        found = []
+        rows = [list(range(len(token) + 1))]
+        prev = ""
+        i = 0
+        while i < len(words):
+            word = words[i]
+            common = 0
+            limit = min(len(word), len(prev), len(rows) - 1)
+            while common < limit and word[common] == prev[common]:
+                common += 1
+            del rows[common + 1:]
+            pruned = False
+            for char in word[common:]:
+                if budget[0] <= 0:
+                    return found
+                budget[0] -= 1
+                rows.append(_levenshtein_row(rows[-1], char, token))
+                if min(rows[-1]) > max_dist:
+                    pruned = True
+                    break
+            if pruned:
+                dead = word[:len(rows) - 1]
+                i = bisect_left(words, dead + "\U0010ffff", i)
+                prev = dead
+                continue
+            dist = min(row[-1] for row in rows[1:]) if prefix else rows[-1][-1]
+            if dist <= max_dist:
+                found.append((dist, i))
+            prev = word
+            i += 1
+        return found
+
+    def _rank_matches(self, postings, limit):
+        return heapq.nlargest(limit, intersect_postings(postings), key=self.room_scores.get)
+
+    def _exact_query(self, tokens, limit):
+        postings = []
+        for token in dict.fromkeys(tokens[:-1]):
+            i = bisect_left(self.words, token)
+            if i == len(self.words) or self.words[i] != token:
+                return []
+            postings.append(self.postings[i])
+        lo, hi = self._prefix_range(tokens[-1])
+        if lo == hi:
+            return []
+        if hi - lo == 1:
+            postings.append(self.postings[lo])
+        else:
+            postings.append(set().union(*self.postings[lo:hi]))
+        matches = intersect_postings(postings)
+        return heapq.nlargest(limit, matches, key=self.room_scores.get)
+
+
+SEARCH_INDEX_MODES = {
+    "trie": SearchTrie,
+    "compact": CompactSearchIndex,
+}
+
+
+def create_search_index(mode="trie"):
+    """Build an empty index for the configured mode ("trie" or "compact")."""
+    try:
+        return SEARCH_INDEX_MODES[(mode or "trie").lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown search index mode: {mode!r}")
+
+
+# Field weights for relevance ranking: a title hit beats a college hit, which
+# beats location, which beats amenities.
+DEFAULT_FIELD_WEIGHTS = {"title": 3.0, "college": 2.0, "location": 1.5, "amenities": 1.0}
+
+
+class BM25Index:
+    """In-process BM25F relevance scorer over room text fields.
+
+    Term statistics (per-field term frequencies and lengths, document
+    frequencies) are kept up to date on every insert/remove, so a query only
+    touches the postings of its own terms. Each query word also matches
+    longer indexed words it is a prefix of ("pow" -> "powai"), scoring the
+    best of them, like the full-text filters do.
+    """
+
+    def __init__(self, field_weights=None, k1=1.2, b=0.75):
+        self.field_weights = dict(field_weights or DEFAULT_FIELD_WEIGHTS)
+        self.fields = tuple(self.field_weights)
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> {room_id: per-field term frequencies}
+        self.words = []  # sorted terms, for prefix expansion
+        self.field_lengths = {}  # room_id -> per-field word counts
+        self.total_lengths = [0] * len(self.fields)
+        self.room_terms = {}  # room_id -> indexed terms, for removal
+
+    @classmethod
+    def from_rows(cls, rows, **options):
+        """Index rows ({"id": room_id, field name: text})."""
+        index = cls(**options)
+        for row in rows:
+            index.insert_room(row["id"], row)
+        return index
+
+    def __len__(self):
+        return len(self.field_lengths)
+
+    def __contains__(self, room_id):
+        return room_id in self.field_lengths
+
+    def insert_room(self, room_id, fields):
+        """Index `fields` ({field name: text}) for room_id."""
+        if room_id in self.field_lengths:
+            self.remove_room(room_id)
+        frequencies = {}
+        lengths = []
+        for i, name in enumerate(self.fields):
+            words = SearchTrie.tokenize(fields.get(name) or "")
+            lengths.append(len(words))
+            self.total_lengths[i] += len(words)
+            for word in words:
+                tf = frequencies.get(word)
+                if tf is None:
+                    tf = frequencies[word] = [0] * len(self.fields)
+                tf[i] += 1
+        for word, tf in frequencies.items():
+            rooms = self.postings.get(word)
+            if rooms is None:
+                rooms = self.postings[word] = {}
+                insort(self.words, word)
+            rooms[room_id] = tuple(tf)
+        self.field_lengths[room_id] = tuple(lengths)
+        self.room_terms[room_id] = tuple(frequencies)
+
+    replace_room = insert_room
+
+    def upsert(self, row):
+        self.insert_room(row["id"], row)
+
+    def remove_room(self, room_id):
+        lengths = self.field_lengths.pop(room_id, None)
+        if lengths is None:
+            return
+        for i, length in enumerate(lengths):
+            self.total_lengths[i] -= length
+        for word in self.room_terms.pop(room_id):
+            rooms = self.postings[word]
+            del rooms[room_id]
+            if not rooms:
+                del self.postings[word]
+                del self.words[bisect_left(self.words, word)]
+
+    remove = remove_room
+
+    def _expand(self, word):
+        lo = bisect_left(self.words, word)
+        hi = lo
+        while hi < len(self.words) and self.words[hi].startswith(word):
+            hi += 1
+        return self.words[lo:hi]
+
+    def idf(self, term):
+        n = len(self.field_lengths)
+        df = len(self.postings.get(term, ()))
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def scores(self, query, room_ids=None):
+        """{room_id: BM25F score} for rooms matching at least one query word.
+
+        Each field's term frequency is normalized by that field's length
+        against its average, weighted, summed, then saturated once by k1.
+        With `room_ids`, only those rooms are scored.
+        """
+        n = len(self.field_lengths)
+        if not n:
+            return {}
+        candidates = None if room_ids is None else set(room_ids)
+        k1, b = self.k1, self.b
+        weights = [self.field_weights[name] for name in self.fields]
+        averages = [(total / n) or 1.0 for total in self.total_lengths]
+        totals = {}
+        for word in set(SearchTrie.tokenize(query)):
+            best = {}
+            for term in self._expand(word):
+                idf = self.idf(term)
+                rooms = self.postings[term]
+                if candidates is None:
+                    hits = rooms.items()
+                elif len(candidates) < len(rooms):
+                    hits = ((rid, rooms[rid]) for rid in candidates if rid in rooms)
+                else:
+                    hits = ((rid, tf) for rid, tf in rooms.items() if rid in candidates)
+                for rid, tf in hits:
+                    lengths = self.field_lengths[rid]
+                    weighted = 0.0
+                    for i, count in enumerate(tf):
+                        if count:
+                            weighted += weights[i] * count / (1.0 - b + b * lengths[i] / averages[i])
+                    score = idf * weighted * (k1 + 1.0) / (weighted + k1)
+                    if score > best.get(rid, 0.0):
+                        best[rid] = score
+            for rid, score in best.items():
+                totals[rid] = totals.get(rid, 0.0) + score
+        return totals
+
+    def rank(self, query, room_ids, limit=None):
+        """room_ids ordered by relevance to query, best first.
+
+        Rooms without a scoring term (e.g. matched by a substring filter)
+        come after every scored room; ties go to the lower ID. With `limit`,
+        only the best `limit` are selected (no full sort).
+        """
+        scores = self.scores(query, room_ids)
+        key = lambda rid: (-scores.get(rid, 0.0), rid)
+        if limit is not None and limit < len(room_ids):
+            return heapq.nsmallest(limit, room_ids, key=key)
+        return sorted(room_ids, key=key)
@@ -0,0 +1,577 @@
+"""
+Shared, memory-mapped search index snapshots.
+
+The autocomplete index is serialized into one flat binary file that every
+gunicorn worker maps read-only, so N workers share a single copy of the
+postings and only one of them scans the ``rooms`` table per rebuild.
+
+Rebuilds write a new generation file and then atomically replace a small
+``CURRENT`` pointer file; workers notice the new pointer on their next query
+and switch over without a restart. Writes a worker makes between snapshots
+live in a small in-process overlay so that worker sees them immediately.
+
+Each generation records the position in the caller's change feed its rows
+were read at, so after a write the next generation is the current one with
+only the rooms changed since that position re-read; the full table is
+scanned for the first build and then every ``FULL_REBUILD_AGE`` seconds.
+
+File layout (little-endian, sections 8-byte aligned, offsets in the header):
+
+    header          magic, counts, top_k, built_at, rebuilt_at, feed
+                    position, section offsets
+    word_offsets    uint32[n_words + 1]   into the words blob
+    words           UTF-8 words, sorted
+    post_offsets    uint64[n_words + 1]   into postings
+    postings        uint32[...]           room IDs per word, sorted
+    room_ids        uint32[n_rooms]       sorted
+    scores          float64[n_rooms]      parallel to room_ids
+    ranked          uint32[n_rooms]       room IDs, best score first
+    prefix_offsets  uint32[n_prefixes + 1] into the prefix blob
+    prefixes        UTF-8 short prefixes, sorted
+    top_offsets     uint32[n_prefixes + 1] into top_ids
+    top_ids         uint32[...]           best-first room IDs per prefix
+"""
+
+import heapq
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from search_engine import (
+    DEFAULT_TOP_K,
+    CompactSearchIndex,
+    SearchTrie,
+    rank_postings,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: rebuilds are not coordinated across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RMSIDX02"
+# magic, n_words, n_rooms, n_prefixes, top_k, built_at, rebuilt_at (last full
+# build), feed position, then 12 section offsets
+HEADER = struct.Struct("<8sIIIIddQ12Q")
+POINTER_FILE = "CURRENT"
+LOCK_FILE = "rebuild.lock"
+
+# Prefixes up to this length get a precomputed top-k list in the snapshot;
+# they match the most rooms, so ranking their whole range would be slowest.
+PREFIX_TOP_DEPTH = 2
+
+# How often a worker checks the pointer file for a newer generation.
+RELOAD_INTERVAL = 1.0
+
+# Incremental publishes fall back to a full build once the last one is this
+# old (seconds), as a safety net; the caller's change feed must be kept
+# longer than this.
+FULL_REBUILD_AGE = 3600
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def write_snapshot(path, rows, top_k=DEFAULT_TOP_K, built_at=None, position=0, base=None, removed=()):
+    """Serialize (room_id, texts, score) rows into a snapshot file at path.
+
+    With base (a SnapshotIndex built with the same top_k), the file holds
+    base's rooms with those in rows replaced and those in removed dropped;
+    the other rooms keep base's postings, scores and ranking rather than
+    being re-read. position is the change feed position the rows were read at.
+    """
+    built_at = time.time() if built_at is None else built_at
+    postings = {}
+    scores = {}
+    room_prefixes = {}
+    for room_id, texts, score in rows:
+        scores[room_id] = score
+        words = set()
+        for text in texts:
+            words.update(SearchTrie.tokenize(text))
+        for word in words:
+            postings.setdefault(word, []).append(room_id)
+        room_prefixes[room_id] = {word[:n] for word in words for n in range(1, PREFIX_TOP_DEPTH + 1)}
+
+    def rank(rid):
+        return -scores[rid], rid
+
+    if base is None:
+        rebuilt_at = built_at
+        ranked = sorted(scores, key=rank)
+        prefix_top = {}
+        for room_id in ranked:
+            for prefix in room_prefixes[room_id]:
+                top = prefix_top.setdefault(prefix, [])
+                if len(top) < top_k:
+                    top.append(room_id)
+        words = sorted(postings)
+    else:
+        if base.top_k != top_k:
+            raise ValueError("base snapshot was built with another top_k")
+        rebuilt_at = base.rebuilt_at
+        dropped = set(scores).union(removed)
+        for i in range(len(base.words)):
+            kept = [rid for rid in base.postings[i] if rid not in dropped]
+            if kept:
+                postings.setdefault(base.words[i], []).extend(kept)
+        for rid, score in zip(base.room_scores.room_ids, base.room_scores.scores):
+            if rid not in dropped:
+                scores[rid] = score
+        ranked = list(heapq.merge(
+            (rid for rid in base.ranked if rid not in dropped), sorted(room_prefixes, key=rank), key=rank,
+        ))
+        words = sorted(postings)
+        prefix_top = _merge_prefix_top(base, dropped, room_prefixes, postings, words, rank, top_k)
+    prefixes = sorted(prefix_top)
+    room_ids = sorted(scores)
+
+    word_offsets, words_blob = _pack_strings(words)
+    post_offsets = array("Q", [0])
+    flat = array("I")
+    for word in words:
+        flat.extend(sorted(set(postings[word])))
+        post_offsets.append(len(flat))
+    prefix_offsets, prefix_blob = _pack_strings(prefixes)
+    top_offsets = array("I", [0])
+    top_ids = array("I")
+    for prefix in prefixes:
+        top_ids.extend(prefix_top[prefix])
+        top_offsets.append(len(top_ids))
+
+    sections = [
+        word_offsets.tobytes(),
+        words_blob,
+        post_offsets.tobytes(),
+        flat.tobytes(),
+        array("I", room_ids).tobytes(),
+        array("d", (scores[rid] for rid in room_ids)).tobytes(),
+        array("I", ranked).tobytes(),
+        prefix_offsets.tobytes(),
+        prefix_blob,
+        top_offsets.tobytes(),
+        top_ids.tobytes(),
+    ]
+    offsets = []
+    offset = _align(HEADER.size)
+    for data in sections:
+        offsets.append(offset)
+        offset = _align(offset + len(data))
+    offsets.append(offset)  # end of file
+
+    header = HEADER.pack(
+        MAGIC, len(words), len(room_ids), len(prefixes), top_k, built_at, rebuilt_at, position, *offsets,
+    )
+    with open(path, "wb") as fh:
+        fh.write(header)
+        for offset, data in zip(offsets, sections):
+            fh.write(b"\0" * (offset - fh.tell()))
+            fh.write(data)
+        fh.write(b"\0" * (offsets[-1] - fh.tell()))
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _merge_prefix_top(base, dropped, room_prefixes, postings, words, rank, top_k):
+    """base's per-prefix top lists without the dropped rooms and with the
+    rooms in room_prefixes ({room_id: prefixes}) ranked in."""
+    added = {}
+    for room_id, prefixes in room_prefixes.items():
+        for prefix in prefixes:
+            added.setdefault(prefix, []).append(room_id)
+    prefix_top = {}
+    for j in range(len(base.prefixes)):
+        prefix = base.prefixes[j]
+        top = list(base.prefix_top[j])
+        kept = [rid for rid in top if rid not in dropped]
+        candidates = added.pop(prefix, [])
+        if len(kept) < len(top) == top_k:
+            # A room left a full list and its runner-up is not stored, so
+            # rank every room with a word under this prefix again.
+            candidates = set()
+            i = bisect_left(words, prefix)
+            while i < len(words) and words[i].startswith(prefix):
+                candidates.update(postings[words[i]])
+                i += 1
+        else:
+            candidates += kept
+        if candidates:
+            prefix_top[prefix] = heapq.nsmallest(top_k, candidates, key=rank)
+    for prefix, candidates in added.items():
+        prefix_top[prefix] = heapq.nsmallest(top_k, candidates, key=rank)
+    return prefix_top
+
+
+def _pack_strings(strings):
+    offsets = array("I", [0])
+    blob = bytearray()
+    for value in strings:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+class SortedIds:
+    """Sorted uint32 room IDs viewed straight from the mapped file."""
+
+    __slots__ = ("ids",)
+
+    def __init__(self, ids):
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        return self.ids[i]
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __contains__(self, rid):
+        i = bisect_left(self.ids, rid)
+        return i < len(self.ids) and self.ids[i] == rid
+
+
+class _MappedStrings:
+    """Sorted string table; items are decoded on access."""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+class _MappedPostings:
+    def __init__(self, offsets, ids):
+        self.offsets = offsets
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return SortedIds(self.ids[self.offsets[i]:self.offsets[i + 1]])
+
+
+class _MappedScores:
+    """room_id -> score lookups by bisect over the sorted room_ids section."""
+
+    def __init__(self, room_ids, scores):
+        self.room_ids = room_ids
+        self.scores = scores
+
+    def __len__(self):
+        return len(self.room_ids)
+
+    def __contains__(self, room_id):
+        return self.get(room_id) is not None
+
+    def get(self, room_id, default=None):
+        i = bisect_left(self.room_ids, room_id)
+        if i < len(self.room_ids) and self.room_ids[i] == room_id:
+            return self.scores[i]
+        return default
+
+
+class SnapshotIndex(CompactSearchIndex):
+    """Read-only CompactSearchIndex backed by a memory-mapped snapshot file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if len(view) < HEADER.size or view[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a search index snapshot")
+        _, n_words, n_rooms, n_prefixes, top_k, built_at, rebuilt_at, position, *offsets = HEADER.unpack_from(view)
+
+        def section(i, fmt=None):
+            data = view[offsets[i]:offsets[i + 1]]
+            return data.cast(fmt) if fmt else data
+
+        word_offsets = section(0, "I")[:n_words + 1]
+        post_offsets = section(2, "Q")[:n_words + 1]
+        room_ids = section(4, "I")[:n_rooms]
+        prefix_offsets = section(7, "I")[:n_prefixes + 1]
+        top_offsets = section(9, "I")[:n_prefixes + 1]
+
+        self.path = path
+        self.top_k = top_k
+        self.built_at = built_at
+        self.rebuilt_at = rebuilt_at
+        self.position = position
+        self.words = _MappedStrings(word_offsets, section(1))
+        self.postings = _MappedPostings(post_offsets, section(3, "I"))
+        self.room_scores = _MappedScores(room_ids, section(5, "d")[:n_rooms])
+        self.ranked = section(6, "I")[:n_rooms]
+        self.prefixes = _MappedStrings(prefix_offsets, section(8))
+        self.prefix_top = _MappedPostings(top_offsets, section(10, "I"))
+        self.room_words = None  # read-only: no per-room bookkeeping
+
+    def insert(self, text, room_id):
+        raise TypeError("SnapshotIndex is read-only")
+
+    insert_room = replace_room = remove_room = insert
+
+    def search_top(self, prefix, limit=None):
+        """Best-ranked room_ids for prefix; short prefixes read a stored top-k list."""
+        if not prefix:
+            return []
+        prefix = prefix.lower()
+        limit = limit or self.top_k
+        if len(prefix) <= PREFIX_TOP_DEPTH and limit <= self.top_k:
+            i = bisect_left(self.prefixes, prefix)
+            if i < len(self.prefixes) and self.prefixes[i] == prefix:
+                return list(self.prefix_top[i])[:limit]
+            return []
+        return super().search_top(prefix, limit)
+
+    def _exact_query(self, tokens, limit):
+        if len(tokens) == 1:
+            return self.search_top(tokens[0], limit)
+        return super()._exact_query(tokens, limit)
+
+    def _rank_matches(self, postings, limit):
+        return rank_postings(postings, limit, self.ranked, self.room_scores)
+
+
+class SharedSearchIndex:
+    """Search index shared between processes through snapshot files.
+
+    Queries read the current SnapshotIndex plus a local overlay (a SearchTrie)
+    for rooms this process changed since that snapshot was built. Rooms in
+    the overlay are hidden from the snapshot results.
+    """
+
+    def __init__(self, directory, top_k=DEFAULT_TOP_K):
+        self.directory = directory
+        self.top_k = top_k
+        self.snapshot = None
+        self.overlay = SearchTrie(top_k=top_k)
+        self.changed = {}  # room_id -> time.time() of the local change
+        self._pointer = None
+        self._next_check = 0.0
+        self._lock = threading.RLock()
+        self._rebuild_timer = None
+        self._publish_requested_at = None  # latest write awaiting the pending timer
+        os.makedirs(directory, exist_ok=True)
+
+    # -- writes -----------------------------------------------------------
+    def insert_room(self, room_id, texts, score=0.0):
+        self.replace_room(room_id, texts, score)
+
+    def replace_room(self, room_id, texts, score=0.0):
+        with self._lock:
+            self.changed[room_id] = time.time()
+            self.overlay.replace_room(room_id, texts, score)
+
+    def remove_room(self, room_id):
+        with self._lock:
+            self.changed[room_id] = time.time()
+            self.overlay.remove_room(room_id)
+
+    # -- reads ------------------------------------------------------------
+    def search(self, prefix):
+        snapshot = self._current()
+        base = snapshot.search(prefix) if snapshot else set()
+        return (base - self.changed.keys()) | self.overlay.search(prefix)
+
+    def search_top(self, prefix, limit=None):
+        limit = limit or self.top_k
+        snapshot = self._current()
+        base = snapshot.search_top(prefix, limit + len(self.changed)) if snapshot else []
+        return self._merge(base, self.overlay.search_top(prefix, limit), limit)
+
+    def search_query(self, query, limit=None, fuzzy=False):
+        limit = limit or self.top_k
+        snapshot = self._current()
+        extra = len(self.changed)
+        base = snapshot.search_query(query, limit + extra) if snapshot else []
+        results = self._merge(base, self.overlay.search_query(query, limit), limit)
+        if not fuzzy or len(results) >= limit:
+            return results
+        # Fuzzy tails come after every exact match; the snapshot's first.
+        seen = set(results)
+        tails = []
+        if snapshot:
+            tail = snapshot.search_query(query, limit + extra, fuzzy=True)[len(base):]
+            tails.append(rid for rid in tail if rid not in self.changed)
+        tails.append(self.overlay.search_query(query, limit, fuzzy=True))
+        for tail in tails:
+            for rid in tail:
+                if rid not in seen:
+                    results.append(rid)
+                    seen.add(rid)
+                    if len(results) == limit:
+                        return results
+        return results
+
+    def _merge(self, base, local, limit):
+        scores = self.snapshot.room_scores if self.snapshot else {}
+        local_scores = self.overlay.room_scores
+        base = [rid for rid in base if rid not in self.changed]
+        merged = heapq.merge(
+            ((-scores.get(rid, 0.0), rid) for rid in base),
+            ((-local_scores.get(rid, 0.0), rid) for rid in local),
+        )
+        return [rid for _, rid in merged][:limit]
+
+    # -- generations --------------------------------------------------------
+    @property
+    def generation(self):
+        """Name of the snapshot file currently in use (None before the first)."""
+        self._current()
+        return self._pointer
+
+    @property
+    def position(self):
+        """Change feed position of the snapshot in use (None before the first)."""
+        snapshot = self._current()
+        return snapshot.position if snapshot else None
+
+    def _current(self):
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + RELOAD_INTERVAL
+            self.reload()
+        return self.snapshot
+
+    def _read_pointer(self):
+        try:
+            with open(os.path.join(self.directory, POINTER_FILE)) as fh:
+                return fh.read().strip() or None
+        except OSError:
+            return None
+
+    def reload(self):
+        """Switch to the generation named in the pointer file, if it changed."""
+        name = self._read_pointer()
+        if name is None or name == self._pointer:
+            return False
+        try:
+            snapshot = SnapshotIndex(os.path.join(self.directory, name))
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not open search snapshot %s: %s", name, exc)
+            return False
+        with self._lock:
+            self.snapshot = snapshot
+            self._pointer = name
+            # Local changes older than the snapshot's DB read are now in it.
+            for room_id, changed_at in list(self.changed.items()):
+                if changed_at < snapshot.built_at:
+                    del self.changed[room_id]
+                    self.overlay.remove_room(room_id)
+        return True
+
+    def publish(self, load_rows, requested_at=None, incremental=False):
+        """Build a new generation and point every worker at it.
+
+        load_rows(since) returns (position, rows, removed): the change feed
+        position it read at, (room_id, texts, score) rows and deleted room
+        IDs. since=None asks for every room; with incremental, it is the
+        current generation's position and only rooms changed after it are
+        returned, unless its last full build is older than FULL_REBUILD_AGE.
+
+        Builds are serialized across processes with a file lock. A build is
+        skipped when another process already published a snapshot that
+        started after `requested_at`, which is what keeps N workers booting
+        or reacting to the same write from each building one.
+        """
+        with self._file_lock():
+            self.reload()
+            if requested_at is not None and self.snapshot and self.snapshot.built_at >= requested_at:
+                return False
+            built_at = time.time()
+            base = self.snapshot
+            if not (incremental and base and base.top_k == self.top_k
+                    and built_at - base.rebuilt_at < FULL_REBUILD_AGE):
+                base = None
+            position, rows, removed = load_rows(base.position if base else None)
+            name = f"search_index.{int(built_at * 1000)}.bin"
+            path = os.path.join(self.directory, name)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            write_snapshot(tmp, rows, top_k=self.top_k, built_at=built_at, position=position,
+                           base=base, removed=removed)
+            os.replace(tmp, path)
+            pointer_tmp = os.path.join(self.directory, f"{POINTER_FILE}.{os.getpid()}.tmp")
+            with open(pointer_tmp, "w") as fh:
+                fh.write(name)
+            os.replace(pointer_tmp, os.path.join(self.directory, POINTER_FILE))
+            self.reload()
+            self._remove_old_generations()
+        return True
+
+    def schedule_publish(self, load_rows, delay=2.0):
+        """Debounced background incremental publish, e.g. after listing
+        writes. Other workers see a write within about delay +
+        RELOAD_INTERVAL seconds plus the build time."""
+        with self._lock:
+            # A pending publish must cover this write too, so it is skipped
+            # only for a snapshot that started after the latest request.
+            self._publish_requested_at = time.time()
+            if self._rebuild_timer is not None:
+                return
+
+            def run():
+                with self._lock:
+                    self._rebuild_timer = None
+                    requested_at = self._publish_requested_at
+                try:
+                    self.publish(load_rows, requested_at=requested_at, incremental=True)
+                except Exception:
+                    logger.exception("Background search index rebuild failed")
+
+            self._rebuild_timer = threading.Timer(delay, run)
+            self._rebuild_timer.daemon = True
+            self._rebuild_timer.start()
+
+    def _file_lock(self):
+        return _FileLock(os.path.join(self.directory, LOCK_FILE))
+
+    def _remove_old_generations(self, keep=2):
+        # The previous generation is kept for workers that read the old
+        # pointer a moment ago. Mapped files stay readable after unlink on
+        # POSIX; elsewhere removal fails while a worker has them open, which
+        # is fine, they are retried after the next publish.
+        names = sorted(
+            (name for name in os.listdir(self.directory)
+             if name.startswith("search_index.") and name.endswith(".bin")),
+            key=lambda name: int(name.split(".")[1]),
+        )
+        for name in names[:-keep]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class _FileLock:
+    def __init__(self, path):
+        self.path = path
+        self.fh = None
+
+    def __enter__(self):
+        self.fh = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self.fh, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.fh, fcntl.LOCK_UN)
+        self.fh.close()
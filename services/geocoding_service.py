@@ -0,0 +1,278 @@
+"""
+Geocoding with a persistent cache, an offline gazetteer and a rate-limited worker.
+
+Lookups are answered, in order, from:
+
+1. an in-process dict of normalized address -> result,
+2. the ``geocode_cache`` table (shared by every process using the database),
+3. the gazetteer (services/gazetteer.py): an address naming a known area or
+   college gets that place's coordinates without any network call.
+
+Anything else is queued for a background worker that calls the real
+geocoder (Nominatim by default) at most once per ``min_interval`` seconds and
+stores the answer, including "not found", in the cache. Callers choose how
+long to wait for it: verification does not wait at all, data scripts wait
+for their whole batch.
+
+The geocoder is anything with a geopy-style ``geocode(query)`` returning an
+object with ``latitude``, ``longitude`` and ``address`` (or None), so tests
+can pass a local stand-in.
+"""
+
+import logging
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from sqlalchemy import Column, DateTime, Float, MetaData, String, Table, create_engine, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
+
+from services.gazetteer import AREA_COORDINATES, load_colleges
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+geocode_cache = Table(
+    "geocode_cache", metadata,
+    Column("address_key", String(255), primary_key=True),  # normalize_address() output
+    Column("latitude", Float),  # NULL: the geocoder found nothing
+    Column("longitude", Float),
+    Column("display_address", String(512)),
+    Column("source", String(20), nullable=False),  # gazetteer, college or geocoder
+    Column("updated_at", DateTime, nullable=False),
+)
+
+MISS_TTL = timedelta(days=7)  # retry addresses the geocoder could not find after this
+_MISS = object()
+
+
+class GeocodeResult(NamedTuple):
+    latitude: float
+    longitude: float
+    address: str
+    source: str
+
+
+def normalize_address(address):
+    """Cache key for an address: lowercase words, punctuation and ", India" dropped."""
+    words = re.sub(r"[^a-z0-9]+", " ", (address or "").lower()).split()
+    if words and words[-1] == "india":
+        words.pop()
+    return " ".join(words)[:255]
+
+
+class GeocodingService:
+    def __init__(self, engine=None, geocoder=None, min_interval=1.0, miss_ttl=MISS_TTL):
+        if engine is None:  # memory only, e.g. for one-off scripts
+            engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        self.engine = engine
+        geocode_cache.create(engine, checkfirst=True)
+        self._geocoder = geocoder
+        self.min_interval = min_interval
+        self.miss_ttl = miss_ttl
+        self._memory = {}  # address key -> GeocodeResult (misses stay in the table, which knows their age)
+        # (padded key, result) for places matched inside longer addresses,
+        # longest first so "andheri west" wins over "andheri".
+        self._places = []
+        self._queue = queue.Queue()
+        self._pending = {}  # address key -> threading.Event
+        self._lock = threading.Lock()
+        self._worker = None
+        self._last_call = 0.0
+        self.geocoder_calls = 0
+
+    @property
+    def geocoder(self):
+        if self._geocoder is None:
+            from geopy.geocoders import Nominatim
+
+            self._geocoder = Nominatim(user_agent="roomies_geocoding_service", timeout=10)
+        return self._geocoder
+
+    # -- seeding ------------------------------------------------------------
+    def seed(self, areas=None, colleges=None):
+        """Load the gazetteer into memory and add its places to the cache table.
+
+        `areas` maps area name -> (lat, lon) (default: AREA_COORDINATES);
+        `colleges` are dicts with name, area, city, latitude and longitude
+        (default: services.gazetteer.load_colleges()). Existing cache rows
+        are left alone.
+        """
+        areas = AREA_COORDINATES if areas is None else areas
+        colleges = load_colleges() if colleges is None else colleges
+        places = {}
+        for name, (lat, lon) in areas.items():
+            places[normalize_address(name)] = GeocodeResult(lat, lon, f"{name}, Mumbai", "gazetteer")
+        for college in colleges:
+            lat, lon = college.get("latitude"), college.get("longitude")
+            if lat is None or lon is None:
+                lat, lon = areas.get(college.get("area"), (None, None))
+            if lat is None or lon is None:
+                continue
+            result = GeocodeResult(lat, lon, college["name"], "college")
+            places[normalize_address(college["name"])] = result
+            # The query form used by fetch_real_data.get_coordinates().
+            if college.get("area") and college.get("city"):
+                places[normalize_address(f"{college['name']}, {college['area']}, {college['city']}")] = result
+
+        self._places = sorted(((f" {key} ", result) for key, result in places.items()), key=lambda item: -len(item[0]))
+        try:
+            return self._insert_places(places)
+        except IntegrityError:
+            # Another process seeded (some of) the same keys since we read
+            # the table; add whatever it did not.
+            return self._insert_places(places)
+
+    def _insert_places(self, places):
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            existing = set(conn.execute(select(geocode_cache.c.address_key)).scalars())
+            rows = [
+                {
+                    "address_key": key, "latitude": result.latitude, "longitude": result.longitude,
+                    "display_address": result.address, "source": result.source, "updated_at": now,
+                }
+                for key, result in places.items()
+                if key not in existing
+            ]
+            if rows:
+                conn.execute(geocode_cache.insert(), rows)
+        return len(rows)
+
+    # -- lookups ------------------------------------------------------------
+    def lookup(self, address):
+        """Cached or gazetteer answer for address, never touching the network."""
+        result = self._cached(normalize_address(address))
+        return None if result is _MISS else result
+
+    def _cached(self, key):
+        """GeocodeResult, _MISS (known not found) or None (unknown) for a key."""
+        if not key:
+            return _MISS
+        result = self._memory.get(key)
+        if result is not None:
+            return result
+        with self.engine.connect() as conn:
+            row = conn.execute(select(geocode_cache).where(geocode_cache.c.address_key == key)).first()
+        if row is not None:
+            if row.latitude is not None:
+                result = GeocodeResult(row.latitude, row.longitude, row.display_address, row.source)
+            elif datetime.utcnow() - row.updated_at < self.miss_ttl:
+                result = _MISS
+        if result is None:
+            result = self._match_place(key)
+        if isinstance(result, GeocodeResult):
+            self._memory[key] = result
+        return result
+
+    def _match_place(self, key):
+        padded = f" {key} "
+        for place, result in self._places:
+            if place in padded:
+                return result
+        return None
+
+    def geocode(self, address, timeout=0):
+        """Coordinates for address, or None.
+
+        Unknown addresses are queued for the geocoder; waits up to `timeout`
+        seconds for the answer (None waits as long as it takes, 0 not at all).
+        """
+        key = normalize_address(address)
+        result = self._cached(key)
+        if result is not None:
+            return None if result is _MISS else result
+        event = self._enqueue(key, address)
+        if timeout != 0:
+            event.wait(timeout)
+        return self._memory.get(key)
+
+    def geocode_many(self, addresses, timeout=None):
+        """{address: result or None} for a batch, queued together and waited on."""
+        events = []
+        for address in addresses:
+            key = normalize_address(address)
+            if self._cached(key) is None:
+                events.append(self._enqueue(key, address))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for event in events:
+            event.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return {address: self.lookup(address) for address in addresses}
+
+    # -- background worker ----------------------------------------------------
+    def _enqueue(self, key, address):
+        with self._lock:
+            event = self._pending.get(key)
+            if event is None:
+                event = self._pending[key] = threading.Event()
+                self._queue.put((key, address))
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="geocoding-worker", daemon=True)
+                self._worker.start()
+        return event
+
+    def _run(self):
+        while True:
+            key, address = self._queue.get()
+            try:
+                self._resolve(key, address)
+            except Exception:
+                logger.exception("Geocoding %r failed", address)
+            finally:
+                with self._lock:
+                    event = self._pending.pop(key, None)
+                if event is not None:
+                    event.set()
+
+    def _resolve(self, key, address):
+        wait = self._last_call + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            location = self.geocoder.geocode(address)
+        finally:
+            self._last_call = time.monotonic()
+            self.geocoder_calls += 1
+        if location is None:
+            self._store(key, None)
+        else:
+            self._store(key, GeocodeResult(location.latitude, location.longitude, location.address, "geocoder"))
+
+    def _store(self, key, result: Optional[GeocodeResult]):
+        row = {
+            "address_key": key,
+            "latitude": result.latitude if result else None,
+            "longitude": result.longitude if result else None,
+            "display_address": result.address[:512] if result else None,
+            "source": result.source if result else "geocoder",
+            "updated_at": datetime.utcnow(),
+        }
+        with self.engine.begin() as conn:
+            conn.execute(geocode_cache.delete().where(geocode_cache.c.address_key == key))
+            conn.execute(geocode_cache.insert().values(**row))
+        if result is not None:
+            self._memory[key] = result
+
+
+_default_service = None
+
+
+def configure_geocoding_service(engine=None, **kwargs):
+    """Install the process-wide service (backed by `engine`) and seed it."""
+    global _default_service
+    _default_service = GeocodingService(engine, **kwargs)
+    _default_service.seed()
+    return _default_service
+
+
+def get_geocoding_service():
+    """The process-wide service; memory-only unless configured."""
+    global _default_service
+    if _default_service is None:
+        configure_geocoding_service()
+    return _default_service
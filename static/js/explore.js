@@ -65,6 +65,14 @@
             // Load real data
             fetchRoomsAndPlot();
 
+            // Markers come from /api/rooms/map for whatever is in view
+            let markerTimer;
+            map.on('moveend', () => {
+                clearTimeout(markerTimer);
+                markerTimer = setTimeout(loadMapMarkers, 150);
+            });
+            loadMapMarkers();
+
             // Handle window resize
             window.addEventListener('resize', () => {
                 map.invalidateSize();
@@ -216,7 +224,9 @@
             const params = new URLSearchParams({
                 limit: 50,
                 property_type: propertyType,
-                sort: sort
+                sort: sort,
+                // Only what the cards and popups show
+                fields: 'title,price,location,property_type,image_url,available_slots,latitude,longitude'
             });
             
             if (maxRent) {
@@ -231,39 +241,106 @@
             
             console.log(`[Explore Map] Found ${rooms.length} rooms`);
             plotRooms(rooms);
+            updatePropertyTypeCounts(maxRent);
 
         } catch (error) {
             console.error('[Explore Map] Error fetching rooms:', error);
         }
     }
 
-    function plotRooms(rooms) {
+    // Show how many rooms each property type has under the current budget,
+    // e.g. "PG (42)". Counts ignore the type filter itself so every option
+    // keeps its number.
+    async function updatePropertyTypeCounts(maxRent) {
+        const select = document.getElementById('propertyTypeFilter');
+        if (!select) return;
+
+        try {
+            const params = new URLSearchParams();
+            if (maxRent) params.append('max_rent', maxRent);
+
+            const response = await fetch(`/api/rooms/facets?${params.toString()}`);
+            if (!response.ok) throw new Error('Failed to fetch facets');
+
+            const data = await response.json();
+            const counts = {};
+            (data.facets?.property_type || []).forEach(facet => {
+                counts[facet.value] = facet.count;
+            });
+
+            Array.from(select.options).forEach(option => {
+                if (!option.dataset.label) option.dataset.label = option.textContent;
+                const count = option.value ? (counts[option.value] || 0) : data.total;
+                option.textContent = `${option.dataset.label} (${count})`;
+            });
+        } catch (error) {
+            console.error('[Explore Map] Error fetching facet counts:', error);
+        }
+    }
+
+    function roomPopup(room) {
+        return `
+            <div style="min-width: 200px;">
+                ${room.title ? `<h4 style="margin: 0 0 5px 0; color: #dc2626;">${room.title}</h4>` : ''}
+                <p style="margin: 0; font-weight: bold;">₹${room.price}/mo</p>
+                ${room.location ? `<p style="margin: 5px 0 0 0; font-size: 0.9em; color: #666;">${room.location}</p>` : ''}
+                <a href="/room/${room.id}" style="display: block; margin-top: 8px; color: #2563eb; text-decoration: none; font-weight: 600;">View Details &rarr;</a>
+            </div>
+        `;
+    }
+
+    // Pins for the visible area: server-side clusters when zoomed out,
+    // individual rooms when zoomed in.
+    async function loadMapMarkers() {
         if (!map || !markersLayer) return;
 
-        markersLayer.clearLayers();
+        try {
+            const zoom = map.getZoom();
+            const params = new URLSearchParams({
+                bbox: map.getBounds().pad(0.2).toBBoxString(),
+                zoom: zoom
+            });
+            const response = await fetch(`/api/rooms/map?${params.toString()}`);
+            if (!response.ok) throw new Error('Failed to fetch map markers');
+
+            const data = await response.json();
+            markersLayer.clearLayers();
+
+            (data.clusters || []).forEach(cluster => {
+                const size = cluster.count < 10 ? 32 : cluster.count < 100 ? 40 : 48;
+                const icon = L.divIcon({
+                    className: 'room-cluster-marker',
+                    html: `<div style="width: ${size}px; height: ${size}px; line-height: ${size}px; border-radius: 50%; background: rgba(220, 38, 38, 0.85); color: white; font-weight: 700; text-align: center; box-shadow: 0 0 0 4px rgba(220, 38, 38, 0.25);">${cluster.count}</div>`,
+                    iconSize: [size, size]
+                });
+                L.marker([cluster.lat, cluster.lon], { icon })
+                    .bindTooltip(`${cluster.count} rooms from ₹${cluster.min_price.toLocaleString()}/mo`)
+                    .on('click', () => map.setView([cluster.lat, cluster.lon], Math.min(zoom + 2, 19)))
+                    .addTo(markersLayer);
+            });
+
+            (data.rooms || []).forEach(room => {
+                L.marker([room.lat, room.lon])
+                    .bindPopup(roomPopup(room))
+                    .addTo(markersLayer);
+            });
+        } catch (error) {
+            console.error('[Explore Map] Error fetching map markers:', error);
+        }
+    }
+
+    function plotRooms(rooms) {
+        if (!map) return;
+
         const bounds = [];
         const listContainer = document.getElementById('roomsList');
         if (listContainer) listContainer.innerHTML = '';
 
         rooms.forEach(room => {
             if (room.latitude && room.longitude) {
-                // 1. Create Marker
-                const marker = L.marker([room.latitude, room.longitude]);
-                
-                const popupContent = `
-                    <div style="min-width: 200px;">
-                        <h4 style="margin: 0 0 5px 0; color: #dc2626;">${room.title}</h4>
-                        <p style="margin: 0; font-weight: bold;">₹${room.price}/mo</p>
-                        <p style="margin: 5px 0 0 0; font-size: 0.9em; color: #666;">${room.location}</p>
-                        <a href="/room/${room.id}" style="display: block; margin-top: 8px; color: #2563eb; text-decoration: none; font-weight: 600;">View Details &rarr;</a>
-                    </div>
-                `;
-                
-                marker.bindPopup(popupContent);
-                markersLayer.addLayer(marker);
                 bounds.push([room.latitude, room.longitude]);
 
-                // 2. Create Sidebar Card
+                // Sidebar Card (pins are loaded by loadMapMarkers)
                 if (listContainer) {
                     const card = document.createElement('div');
                     card.className = 'room-card-sidebar';
@@ -287,12 +364,15 @@
                         document.querySelectorAll('.room-card-sidebar').forEach(c => c.classList.remove('active'));
                         card.classList.add('active');
 
-                        // Fly map
-                        map.flyTo([room.latitude, room.longitude], 16, {
+                        // Fly map, close enough that the room gets its own pin
+                        map.flyTo([room.latitude, room.longitude], 17, {
                             animate: true,
                             duration: 1.5
                         });
-                        marker.openPopup();
+                        L.popup()
+                            .setLatLng([room.latitude, room.longitude])
+                            .setContent(roomPopup(room))
+                            .openOn(map);
                     });
 
                     listContainer.appendChild(card);
@@ -669,37 +669,32 @@ function loadFlashDeals() {
 function displayFlashDealsOnMap(deals) {
     if (!mapInstance || !deals.length) return;
 
+    // Each deal already carries its room's title, coordinates and thumbnail.
     deals.forEach((deal) => {
-        // Find room data
-        fetch(`/api/rooms?room_id=${deal.room_id}`)
-            .then((res) => res.json())
-            .then((data) => {
-                if (data.rooms && data.rooms.length > 0) {
-                    const room = data.rooms[0];
-                    if (room.latitude && room.longitude) {
-                        // Create pulsing marker
-                        const pulsingIcon = L.divIcon({
-                            className: "flash-deal-marker",
-                            html: `<div class="pulse"></div><i class="fas fa-bolt"></i>`,
-                            iconSize: [40, 40],
-                        });
-
-                        const marker = L.marker([room.latitude, room.longitude], {
-                            icon: pulsingIcon,
-                        }).addTo(mapInstance);
-
-                        marker.bindPopup(`
-                            <div class="flash-deal-popup">
-                                <h4>⚡ FLASH DEAL ⚡</h4>
-                                <p><strong>${room.title}</strong></p>
-                                <p><del>₹${deal.original_price}</del> <span class="deal-price">₹${deal.deal_price}</span></p>
-                                <p class="deal-discount">${deal.discount_percent}% OFF</p>
-                                <p class="deal-timer">⏰ ${Math.floor(deal.time_remaining_hours)}h remaining</p>
-                            </div>
-                        `);
-                    }
-                }
-            });
+        const room = deal.room;
+        if (!room || !room.latitude || !room.longitude) return;
+
+        // Create pulsing marker
+        const pulsingIcon = L.divIcon({
+            className: "flash-deal-marker",
+            html: `<div class="pulse"></div><i class="fas fa-bolt"></i>`,
+            iconSize: [40, 40],
+        });
+
+        const marker = L.marker([room.latitude, room.longitude], {
+            icon: pulsingIcon,
+        }).addTo(mapInstance);
+
+        marker.bindPopup(`
+            <div class="flash-deal-popup">
+                <h4>⚡ FLASH DEAL ⚡</h4>
+                <img src="${room.image_url}" alt="${room.title}" style="width: 100%; max-height: 100px; object-fit: cover; border-radius: 6px;">
+                <p><strong><a href="/room/${room.id}">${room.title}</a></strong></p>
+                <p><del>₹${deal.original_price}</del> <span class="deal-price">₹${deal.deal_price}</span></p>
+                <p class="deal-discount">${deal.discount_percent}% OFF</p>
+                <p class="deal-timer">⏰ ${Math.floor(deal.time_remaining_hours)}h remaining</p>
+            </div>
+        `);
     });
 }
 
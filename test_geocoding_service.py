@@ -0,0 +1,117 @@
+"""
+Test Geocoding Service
+======================
+Runs the cached geocoding service against a local stand-in geocoder (no
+network): gazetteer answers, cache hits across address spellings and
+service instances, cached misses, and the worker's rate limit.
+
+    python test_geocoding_service.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+
+from services.geocoding_service import GeocodingService, normalize_address
+
+
+class StandInGeocoder:
+    """Answers a fixed set of addresses and records every call."""
+
+    def __init__(self, known, delay=0.0):
+        self.known = {normalize_address(address): coords for address, coords in known.items()}
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def geocode(self, query):
+        with self.lock:
+            self.calls.append((time.monotonic(), query))
+        time.sleep(self.delay)
+        coords = self.known.get(normalize_address(query))
+        if coords is None:
+            return None
+        return SimpleNamespace(latitude=coords[0], longitude=coords[1], address=f"{query} (stand-in)")
+
+
+def make_service(engine, geocoder, min_interval=0.0):
+    service = GeocodingService(engine, geocoder=geocoder, min_interval=min_interval)
+    service.seed(areas={"Powai": (19.1176, 72.9060), "Andheri West": (19.1363, 72.8277), "Andheri": (19.1136, 72.8697)}, colleges=[
+        {"name": "Veermata Jijabai Technological Institute (VJTI)", "area": "Matunga", "city": "Mumbai",
+         "latitude": 19.0225, "longitude": 72.8561},
+    ])
+    return service
+
+
+def test_gazetteer_answers_offline():
+    geocoder = StandInGeocoder({})
+    service = make_service(None, geocoder)
+
+    start = time.perf_counter()
+    hit = service.geocode("Flat 12, Hiranandani Gardens, Powai, Mumbai 400076")
+    elapsed_us = (time.perf_counter() - start) * 1e6
+    assert hit and hit.source == "gazetteer" and round(hit.latitude, 4) == 19.1176, hit
+    # Longest area name wins.
+    assert service.geocode("Lokhandwala, Andheri West").latitude == 19.1363
+    assert service.geocode("Veermata Jijabai Technological Institute (VJTI), Matunga, Mumbai").source == "college"
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        service.geocode("Flat 12, Hiranandani Gardens, Powai, Mumbai 400076")
+    repeat_us = (time.perf_counter() - start) * 1e3
+    print(f"\ngazetteer: first lookup {elapsed_us:.0f} us, cached {repeat_us:.1f} us")
+    assert not geocoder.calls
+
+
+def test_lookups_are_cached_and_shared():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'cache.db')}")
+        geocoder = StandInGeocoder({"221B Baker Street, London": (51.5237, -0.1585)})
+        service = make_service(engine, geocoder)
+
+        # Not waiting: queued, answered later.
+        assert service.geocode("221B Baker Street, London") is None or geocoder.calls
+        hit = service.geocode("221B  baker street, LONDON, India", timeout=5)
+        assert hit and hit.source == "geocoder", hit
+        assert len(geocoder.calls) == 1, geocoder.calls
+
+        # Misses are cached too.
+        assert service.geocode("Nowhere Lane, Atlantis", timeout=5) is None
+        assert service.geocode("Nowhere Lane, Atlantis", timeout=5) is None
+        assert len(geocoder.calls) == 2, geocoder.calls
+
+        # A second process sharing the database never calls the geocoder.
+        other_geocoder = StandInGeocoder({})
+        other = make_service(engine, other_geocoder)
+        assert other.lookup("221b baker street london").latitude == 51.5237
+        assert other.geocode("Nowhere Lane, Atlantis", timeout=5) is None
+        assert not other_geocoder.calls
+        engine.dispose()
+
+
+def test_batch_is_rate_limited():
+    addresses = [f"{n} Example Road, Springfield" for n in range(5)]
+    geocoder = StandInGeocoder({address: (1.0, float(n)) for n, address in enumerate(addresses)})
+    service = make_service(None, geocoder, min_interval=0.05)
+
+    results = service.geocode_many(addresses + addresses[:2] + ["Powai"], timeout=10)
+    assert all(results[address] for address in addresses), results
+    assert results["Powai"].source == "gazetteer"
+    assert len(geocoder.calls) == len(addresses), geocoder.calls
+    gaps = [later - earlier for (earlier, _), (later, _) in zip(geocoder.calls, geocoder.calls[1:])]
+    assert min(gaps) >= 0.045, gaps
+    print(f"\nbatch: {len(addresses)} geocoder calls, min gap {min(gaps) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    test_gazetteer_answers_offline()
+    test_lookups_are_cached_and_shared()
+    test_batch_is_rate_limited()
+    print("\n✅ Geocoding service checks passed")
@@ -0,0 +1,128 @@
+"""
+Test Shared Search Snapshots
+============================
+Publishes search index snapshots from a stand-in room change feed (no
+database): the feed position survives a reopen, and incremental publishes,
+including after a gap in the feed IDs, match a full build of the same
+rooms, and a debounced publish covers writes made while it was pending.
+
+    python test_search_snapshot.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from search_snapshot import HEADER, SharedSearchIndex, SnapshotIndex, write_snapshot
+
+WORDS = ["powai", "andheri", "parle", "patel", "vjti", "chembur", "studio", "shared", "hostel", "pg", "sea", "view"]
+
+
+class StandInFeed:
+    """Rooms plus a room_changes-like feed; load_rows mirrors app._search_index_rows."""
+
+    def __init__(self, seed=7):
+        self.random = random.Random(seed)
+        self.rooms = {}
+        self.changes = []  # (feed id, room_id)
+        self.next_id = 1
+
+    def write(self, room_id, delete=False, gap=0):
+        self.next_id += gap
+        if delete:
+            self.rooms.pop(room_id, None)
+        else:
+            title = " ".join(self.random.sample(WORDS, 3))
+            self.rooms[room_id] = ((title, self.random.choice(WORDS)), float(self.random.randint(0, 40)))
+        self.changes.append((self.next_id, room_id))
+        self.next_id += 1
+
+    @property
+    def position(self):
+        return self.changes[-1][0] if self.changes else 0
+
+    def load_rows(self, since=None):
+        if since is None:
+            room_ids = set(self.rooms)
+        else:
+            room_ids = {room_id for change_id, room_id in self.changes if change_id > since}
+        rows = [(room_id, *self.rooms[room_id]) for room_id in sorted(room_ids) if room_id in self.rooms]
+        return self.position, rows, room_ids.difference(self.rooms)
+
+
+def assert_matches_full_build(index, feed, directory):
+    """The published snapshot equals a from-scratch build of the feed's rooms."""
+    snapshot = index.snapshot
+    path = os.path.join(directory, "full.bin")
+    _, rows, _ = feed.load_rows()
+    write_snapshot(path, rows, top_k=index.top_k, built_at=snapshot.built_at, position=feed.position)
+    with open(snapshot.path, "rb") as fh:
+        published = fh.read()
+    with open(path, "rb") as fh:
+        full = fh.read()
+    assert published[HEADER.size:] == full[HEADER.size:]
+    assert snapshot.position == SnapshotIndex(path).position == feed.position
+
+
+def test_position_survives_reopen():
+    feed = StandInFeed()
+    for room_id in range(1, 8):
+        feed.write(room_id)
+    with tempfile.TemporaryDirectory() as directory:
+        SharedSearchIndex(directory).publish(feed.load_rows)
+        reopened = SharedSearchIndex(directory)
+        assert reopened.position == feed.position == 7, reopened.position
+
+
+def test_incremental_publish_after_feed_gap():
+    feed = StandInFeed()
+    for room_id in range(1, 201):
+        feed.write(room_id)
+    with tempfile.TemporaryDirectory() as directory:
+        index = SharedSearchIndex(directory)
+        index.publish(feed.load_rows)
+        full_built_at = index.snapshot.rebuilt_at
+
+        # Rolled-back transactions leave holes in the feed IDs; edits after
+        # one must still be picked up by the next incremental publish.
+        feed.write(3)
+        feed.write(17, gap=40)
+        feed.write(150, delete=True)
+        feed.write(201)
+        assert index.publish(feed.load_rows, incremental=True)
+        assert index.snapshot.rebuilt_at == full_built_at  # not a full build
+        assert_matches_full_build(index, feed, directory)
+
+        for room_id in feed.random.sample(sorted(feed.rooms), 25):
+            feed.write(room_id, delete=room_id % 5 == 0, gap=feed.random.randint(0, 3))
+        assert index.publish(feed.load_rows, incremental=True)
+        assert_matches_full_build(index, feed, directory)
+        assert 150 not in index.snapshot.room_scores and 201 in index.snapshot.room_scores
+
+
+def test_pending_publish_covers_later_writes():
+    feed = StandInFeed()
+    for room_id in range(1, 51):
+        feed.write(room_id)
+    with tempfile.TemporaryDirectory() as directory:
+        index = SharedSearchIndex(directory)
+        index.schedule_publish(feed.load_rows, delay=0.3)
+        index.publish(feed.load_rows)  # e.g. another worker, after the first request
+        feed.write(7)
+        index.schedule_publish(feed.load_rows, delay=0.3)  # joins the pending timer
+        deadline = time.monotonic() + 5
+        while index.position != feed.position and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert index.position == feed.position, (index.position, feed.position)
+        assert_matches_full_build(index, feed, directory)
+
+
+if __name__ == "__main__":
+    test_position_survives_reopen()
+    test_incremental_publish_after_feed_gap()
+    test_pending_publish_covers_later_writes()
+    print("\n✅ Search snapshot checks passed")
@@ -0,0 +1,334 @@
+"""
+Pluggable full-text search over the ``rooms`` table.
+
+``ILIKE '%q%'`` cannot use any index, so every text search used to scan the
+whole table. Backends here answer the same ``q`` parameter from an index:
+
+    fts5      SQLite: external-content FTS5 table ``rooms_fts``
+    tsvector  Postgres: ``rooms.search_vector`` column with a GIN index
+    like      the original ILIKE scan, used when neither is available
+
+Both indexed backends are kept in sync by database triggers, so rows written
+by scripts or migrations outside the app are indexed too. Queries match every
+word of ``q`` as a word prefix ("pow hos" finds "Powai Hostel") rather than
+as an arbitrary substring.
+
+The ``college`` / ``city`` / ``location`` filters keep true substring
+semantics and use trigram indexes instead (see SubstringFilter), installed by
+``migrations/add_trigram_indexes.py``:
+
+    Postgres  pg_trgm GIN indexes; the planner uses them for ILIKE directly
+    SQLite    FTS5 ``trigram`` table ``rooms_trgm`` that prunes candidates
+"""
+
+import logging
+import re
+
+from sqlalchemy import Integer, bindparam, column, or_, text
+
+logger = logging.getLogger(__name__)
+
+# Indexed columns, most important first. Postgres weights them A..D.
+SEARCH_COLUMNS = ("title", "college_nearby", "location", "amenities")
+TEXT_SEARCH_BACKENDS = {"auto", "fts5", "tsvector", "like"}
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def query_words(query):
+    """Lowercased words of a user query; punctuation is dropped."""
+    return _WORD_RE.findall((query or "").lower())
+
+
+def _table_exists(connection, name):
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": name}
+    ).first() is not None
+
+
+def _install_fts5(connection, fts, rooms, columns, options):
+    """External-content FTS5 table over rooms(columns) plus sync triggers.
+
+    Idempotent; the table is filled from existing rows only when it is new.
+    """
+    exists = _table_exists(connection, fts)
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{name}" for name in columns)
+    old_cols = ", ".join(f"old.{name}" for name in columns)
+    statements = [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content='{rooms}', content_rowid='id', {options}
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {rooms} BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {rooms} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {rooms} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+        """,
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+    if exists:
+        return False
+    # Index the rows that were there before the triggers.
+    connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+    return True
+
+
+class LikeTextSearch:
+    """Substring match with ILIKE on each column (full table scan)."""
+
+    name = "like"
+
+    def __init__(self, table):
+        self.table = table
+
+    def install(self, connection):
+        return False
+
+    def condition(self, query, columns):
+        like = f"%{query}%"
+        return or_(*(self.table.c[name].ilike(like) for name in columns))
+
+
+class SQLiteFTS5Search(LikeTextSearch):
+    """SQLite FTS5 external-content index over the room text columns."""
+
+    name = "fts5"
+    fts_table = "rooms_fts"
+
+    def install(self, connection):
+        """Create the FTS table and triggers; returns True if newly created."""
+        return _install_fts5(connection, self.fts_table, self.table.name, SEARCH_COLUMNS, "prefix='2 3'")
+
+    def match_expression(self, query, columns):
+        words = query_words(query)
+        if not words:
+            return None
+        scope = "{" + " ".join(columns) + "}"
+        return f"{scope} : (" + " ".join(f'"{word}"*' for word in words) + ")"
+
+    def condition(self, query, columns):
+        expression = self.match_expression(query, columns)
+        if expression is None:
+            return super().condition(query, columns)
+        matches = (
+            text(f"SELECT rowid FROM {self.fts_table} WHERE {self.fts_table} MATCH :fts_query")
+            .bindparams(bindparam("fts_query", expression, unique=True))
+            .columns(column("rowid", Integer))
+        )
+        return self.table.c.id.in_(matches)
+
+
+class PostgresTextSearch(LikeTextSearch):
+    """Postgres tsvector column with a GIN index, maintained by a trigger."""
+
+    name = "tsvector"
+    # Unstemmed: listings are mostly proper nouns (areas, colleges).
+    config = "simple"
+    weights = dict(zip(SEARCH_COLUMNS, "ABCD"))
+
+    def _vector_sql(self, row):
+        return " || ".join(
+            f"setweight(to_tsvector('{self.config}', coalesce({row}.{name}, '')), '{weight}')"
+            for name, weight in self.weights.items()
+        )
+
+    def install(self, connection):
+        rooms = self.table.name
+        exists = connection.execute(
+            text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = :table AND column_name = 'search_vector'"
+            ),
+            {"table": rooms},
+        ).first()
+        statements = [
+            f"ALTER TABLE {rooms} ADD COLUMN IF NOT EXISTS search_vector tsvector",
+            f"""
+            CREATE OR REPLACE FUNCTION {rooms}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {self._vector_sql("NEW")};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """,
+            f"DROP TRIGGER IF EXISTS {rooms}_search_vector_trigger ON {rooms}",
+            f"""
+            CREATE TRIGGER {rooms}_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {", ".join(SEARCH_COLUMNS)} ON {rooms}
+            FOR EACH ROW EXECUTE FUNCTION {rooms}_search_vector_update()
+            """,
+            f"CREATE INDEX IF NOT EXISTS ix_{rooms}_search_vector ON {rooms} USING GIN (search_vector)",
+        ]
+        for statement in statements:
+            connection.execute(text(statement))
+        if exists:
+            return False
+        connection.execute(text(f"UPDATE {rooms} SET search_vector = {self._vector_sql(rooms)}"))
+        return True
+
+    def tsquery(self, query, columns):
+        words = query_words(query)
+        if not words:
+            return None
+        labels = "".join(self.weights[name] for name in columns)
+        return " & ".join(f"{word}:*{labels}" for word in words)
+
+    def condition(self, query, columns):
+        tsquery = self.tsquery(query, columns)
+        if tsquery is None:
+            return super().condition(query, columns)
+        return text(
+            f"{self.table.name}.search_vector @@ to_tsquery('{self.config}', :ts_query)"
+        ).bindparams(bindparam("ts_query", tsquery, unique=True))
+
+
+_DIALECT_BACKENDS = {"sqlite": SQLiteFTS5Search, "postgresql": PostgresTextSearch}
+
+
+def create_text_search(table, dialect_name, backend="auto"):
+    """Text search backend for `table` on the given SQLAlchemy dialect."""
+    if backend not in TEXT_SEARCH_BACKENDS:
+        raise ValueError(f"Unknown text search backend: {backend!r}")
+    if backend == "like":
+        return LikeTextSearch(table)
+    cls = _DIALECT_BACKENDS.get(dialect_name)
+    if cls is None or (backend != "auto" and cls.name != backend):
+        if backend != "auto":
+            logger.warning("Text search backend %s is not available on %s", backend, dialect_name)
+        return LikeTextSearch(table)
+    return cls(table)
+
+
+def install_text_search(engine, table, backend="auto"):
+    """Create the index and triggers for `table` and return the backend to query.
+
+    Falls back to LikeTextSearch if the database cannot build the index
+    (e.g. an SQLite build without FTS5).
+    """
+    search = create_text_search(table, engine.dialect.name, backend)
+    try:
+        with engine.begin() as connection:
+            if search.install(connection):
+                logger.info("Built %s text search index for %s", search.name, table.name)
+    except Exception as exc:
+        logger.warning("Text search index unavailable (%s), using ILIKE: %s", search.name, exc)
+        return LikeTextSearch(table)
+    return search
+
+
+# Columns that get substring (ILIKE '%value%') filters.
+TRIGRAM_COLUMNS = ("title", "location", "college_nearby")
+
+
+class SubstringFilter:
+    """ILIKE '%value%' filter on one column.
+
+    On Postgres this is all that is needed: with the pg_trgm GIN indexes in
+    place the planner answers ILIKE from them.
+    """
+
+    name = "ilike"
+
+    def __init__(self, table):
+        self.table = table
+
+    def install(self, connection):
+        return False
+
+    def is_installed(self, connection):
+        return False
+
+    def condition(self, name, value):
+        return self.table.c[name].ilike(f"%{value}%")
+
+
+class SQLiteTrigramFilter(SubstringFilter):
+    """Substring filters answered from an FTS5 trigram side table.
+
+    FTS5's trigram tokenizer serves ``LIKE '%value%'`` from its index when
+    the value has at least 3 characters; shorter values scan as before.
+    """
+
+    name = "trigram"
+    fts_table = "rooms_trgm"
+
+    def install(self, connection):
+        return _install_fts5(
+            connection, self.fts_table, self.table.name, TRIGRAM_COLUMNS, "tokenize='trigram'"
+        )
+
+    def is_installed(self, connection):
+        return _table_exists(connection, self.fts_table)
+
+    def condition(self, name, value):
+        if name not in TRIGRAM_COLUMNS or len(value) < 3:
+            return super().condition(name, value)
+        candidates = (
+            text(f"SELECT rowid FROM {self.fts_table} WHERE {name} LIKE :trigram_pattern")
+            .bindparams(bindparam("trigram_pattern", f"%{value}%", unique=True))
+            .columns(column("rowid", Integer))
+        )
+        return self.table.c.id.in_(candidates)
+
+
+class PostgresTrigramFilter(SubstringFilter):
+    """pg_trgm GIN indexes on the substring-filtered columns."""
+
+    name = "pg_trgm"
+
+    def install(self, connection):
+        rooms = self.table.name
+        created = not self.is_installed(connection)
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for name in TRIGRAM_COLUMNS:
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{rooms}_{name}_trgm ON {rooms} USING GIN ({name} gin_trgm_ops)"
+            ))
+        return created
+
+    def is_installed(self, connection):
+        return connection.execute(
+            text("SELECT 1 FROM pg_indexes WHERE tablename = :table AND indexname = :index"),
+            {"table": self.table.name, "index": f"ix_{self.table.name}_{TRIGRAM_COLUMNS[0]}_trgm"},
+        ).first() is not None
+
+
+_DIALECT_SUBSTRING_FILTERS = {"sqlite": SQLiteTrigramFilter, "postgresql": PostgresTrigramFilter}
+
+
+def install_substring_index(engine, table):
+    """Create the trigram index for `table`; returns the filter to query with."""
+    cls = _DIALECT_SUBSTRING_FILTERS.get(engine.dialect.name, SubstringFilter)
+    substring_filter = cls(table)
+    with engine.begin() as connection:
+        substring_filter.install(connection)
+    return substring_filter
+
+
+def detect_substring_filter(engine, table):
+    """Trigram filter if its index has been installed, else plain ILIKE."""
+    cls = _DIALECT_SUBSTRING_FILTERS.get(engine.dialect.name)
+    if cls is None:
+        return SubstringFilter(table)
+    substring_filter = cls(table)
+    try:
+        with engine.connect() as connection:
+            if substring_filter.is_installed(connection):
+                return substring_filter
+    except Exception as exc:
+        logger.warning("Could not check for trigram indexes: %s", exc)
+    return SubstringFilter(table)
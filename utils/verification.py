@@ -1,5 +1,5 @@
 import numpy as np
-from geopy.geocoders import Nominatim
+from services.geocoding_service import get_geocoding_service
 from thefuzz import fuzz
 import os
 import json
@@ -18,8 +18,11 @@ except ImportError as e:
     easyocr = None
     reader = None
 
-# Initialize Geolocator
-geolocator = Nominatim(user_agent="roomies_verification_system")
+# Seconds an upload may wait for an address the geocoding cache and gazetteer
+# cannot answer (the geocoder's own timeout, as the inline lookup used to
+# block for). Nothing re-runs the check later, so 0 would fail every student
+# whose address is unknown and whose college does not fuzzy-match.
+GEOCODE_WAIT_SECONDS = float(os.environ.get("GEOCODE_WAIT_SECONDS", "10"))
 
 def extract_text_from_image(image_path):
     """
@@ -177,19 +180,20 @@ def parse_id_details_regex(text):
 
 def verify_location_on_map(address):
     """
-    Verifies if the address exists using Geopy.
-    Returns (latitude, longitude, full_address) or None.
+    Verifies if the address exists using the cached geocoding service.
+    Returns {"lat", "lon", "address", "source"} or None.
     """
     if not address:
         return None
         
     try:
-        location = geolocator.geocode(address)
+        location = get_geocoding_service().geocode(address, timeout=GEOCODE_WAIT_SECONDS)
         if location:
             return {
                 "lat": location.latitude,
                 "lon": location.longitude,
-                "address": location.address
+                "address": location.address,
+                "source": location.source
             }
     except Exception as e:
         print(f"Geocoding Error: {e}")